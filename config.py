@@ -23,3 +23,15 @@ DEFAULT_CATEGORIES = {
     # 📦 Magical Containers (Archive files)
     "archives": [".zip", ".rar", ".7z"]
 }
+
+# 🗃️ Where the Columnar Ledger of the last scan is preserved (a memory-mapped snapshot; .npz paths also work)
+DEFAULT_CATALOG_PATH = "reports/scan_catalog.wzcat"
+
+# 🔖 Where an interrupted scan keeps its bookmark for --resume-scan
+DEFAULT_CHECKPOINT_DIR = "reports/scan_checkpoint"
+
+# 🗼 Where the resident wizard of `main.py serve` listens
+DEFAULT_SOCKET_PATH = "reports/organizer.sock"
+
+# 🌳 Where the Merkle manifest of directory digests from the last scan is kept
+DEFAULT_MANIFEST_PATH = "reports/merkle_manifest.json.gz"
@@ -1,7 +1,19 @@
+import errno
+import hashlib
+import os
+import re
 import shutil
 import logging
+from contextlib import nullcontext
 from pathlib import Path
 
+from core.file_packer import FilePacker
+from core.file_scanner import FileScanner
+from core.plan_io import export_plan, iter_plan
+
+
+_FINGERPRINT = re.compile(r'^[0-9a-f]{32}$')
+
 
 class ActionEngine:
     """
@@ -12,75 +24,505 @@ class ActionEngine:
     files with its magic wand and teleport them to new locations!
 
     Attributes:
-        actions (list): A scroll of planned file movements
+        actions (list): A scroll of planned ('move', source, destination, record) journeys,
+            and ('pack', [sources], satchel, [records]) foldings of small files
+        already_in_place (int): Files found resting in their rightful home during the last planning
+        governor (IOGovernor): Optional floodgate keeper throttling moves
+        pack_threshold (int): Files smaller than this many bytes are folded into satchels; None packs nothing
+        pack_max_members (int): The most files folded into one satchel
+        budget (ScanBudget): Optional hourglass; once it runs out the remaining journeys are deferred
+        known_directories (set): Destination directories already known to exist
+        fingerprinter (Callable): Optional on-demand fingerprint spell for moves across devices,
+            such as ``FileScanner.fingerprint_records``
         logger (Logger): A magical quill that records our adventures
     """
 
-    def __init__(self):
+    def __init__(self, governor=None, pack_threshold=None, pack_max_members=10000, budget=None,
+                 fingerprinter=None):
         """
         🎭 Summon the ActionEngine into existence!
 
         When you create an ActionEngine, it's like summoning a helpful spirit
         that's ready to organize your files with magical precision.
+
+        Args:
+            governor (IOGovernor, optional): Floodgate keeper every move must pass
+            pack_threshold (int, optional): Fold files smaller than this many bytes into satchels
+            pack_max_members (int): The most files folded into one satchel
+            budget (ScanBudget, optional): Hourglass of the quest, asked before every journey
+            fingerprinter (Callable, optional): Takes scanner records and yields them fingerprinted,
+                like ``FileScanner.fingerprint_records``; used when a file must cross devices and
+                its fingerprint is not known yet. Without one, the file is simply read for it.
+
+        Raises:
+            ValueError: If a satchel could hold fewer than two files
         """
+        if pack_max_members < 2:
+            raise ValueError("🎒 A satchel must be allowed at least 2 files")
         self.actions = []  # Our empty scroll, waiting to be filled with plans
+        self.already_in_place = 0  # Files that need no journey at all
+        self.governor = governor  # Our floodgate keeper, if the disks need protecting
+        self.pack_threshold = pack_threshold  # Files smaller than this travel in satchels
+        self.pack_max_members = pack_max_members
+        self.budget = budget  # The hourglass of a quest with a maintenance window
+        self.known_directories = set()  # Homes we've already seen standing
+        self.fingerprinter = fingerprinter  # Who to ask for fingerprints the scan didn't take
         self.logger = logging.getLogger(__name__)  # Our magical quill, ready to write
 
-    def plan_actions(self, organization_plan, target_directory):
+    def plan_actions(self, organization_plan, target_directory, layout=None):
         """
         📜 Plan the Great File Migration
 
         This is where we decide which files will embark on magical journeys
         to their new homes. It's like planning a grand adventure for each file!
 
+        Files already resting at ``<target>/<category>/<file type>/<name>`` get
+        no journey at all, so planning a realm twice yields only what changed.
+
         Args:
             organization_plan (dict): A map of the file kingdom
             target_directory (str): The promised land where files will settle
+            layout (LayoutRules, optional): Rules choosing each file's directory instead of
+                ``<category>/<file type>``
         """
         self.actions.clear()  # Erase our previous plans, time for a new adventure!
+        self.actions.extend(self.iter_actions(self.plan_groups(organization_plan), target_directory, layout))
 
+    @staticmethod
+    def plan_groups(organization_plan):
+        """
+        🗂️ Unfold the Nested Blueprint Into (Category, File Type, Files) Groups
+
+        Args:
+            organization_plan (dict): A map of the file kingdom
+
+        Yields:
+            tuple: The category, the file type and its files
+        """
         for category, file_types in organization_plan.items():
             for file_type, files in file_types.items():
+                yield category, file_type, files
+
+    def iter_actions(self, groups, target_directory, layout=None):
+        """
+        🌊 Plan Journeys Lazily, One at a Time
+
+        Unlike ``plan_actions`` nothing is kept on the scroll, so groups
+        streamed from an ExternalPlanner can be turned into journeys without
+        ever holding them all in memory.
+
+        With a ``pack_threshold`` set, the small files bound for one home
+        (including those already living there) are folded into satchels of at
+        most ``pack_max_members`` files; a lone small file just moves. Satchels
+        from earlier runs are never touched.
+
+        Args:
+            groups (Iterable[tuple]): (category, file type, files) groups
+            target_directory (str): The promised land where files will settle
+            layout (LayoutRules, optional): Rules choosing each file's directory instead of
+                ``<category>/<file type>``
+
+        Yields:
+            tuple: ('move', source, destination, record) journeys and
+            ('pack', [sources], satchel, [records]) foldings
+        """
+        self.already_in_place = 0
+        promised = set()  # Satchel names handed out during this planning
+
+        for category, file_type, files in groups:
+
+            # Create a cozy new home for each type of file
+            type_path = Path(target_directory) / category / file_type
+            small = {}  # home -> [(source, destination, record)] waiting for a satchel
+
+            for file in files:
+                source = Path(file['path'])
+                if FilePacker.is_artifact(source):
+                    self.already_in_place += 1
+                    continue
+                home = type_path if layout is None else Path(target_directory) / layout(file, category)
+                destination = home / source.name
+                if self.pack_threshold is not None and file['size'] < self.pack_threshold:
+                    batch = small.setdefault(home, [])
+                    batch.append((source, destination, file))
+                    if len(batch) == self.pack_max_members:
+                        yield from self._fold(home, small.pop(home), promised)
+                    continue
+                if self._is_same_place(source, destination):
+                    self.already_in_place += 1
+                    continue
+                self.logger.info(f"✨ Planned magical journey: {source} -> {destination}")
+                yield 'move', str(source), str(destination), file
+
+            for home, batch in small.items():
+                yield from self._fold(home, batch, promised)
+
+    def _fold(self, home, batch, promised):
+        """
+        🎒 Turn a Batch of Small Files Bound for One Home Into a Satchel
+
+        Args:
+            home (Path): The directory the satchel will live in
+            batch (List[tuple]): (source, destination, record) of each small file
+            promised (set): Satchel paths already handed out in this planning
+
+        Yields:
+            tuple: One ('pack', [sources], satchel, [records]) folding, or a plain
+            journey when the batch holds a single file
+        """
+        if len(batch) == 1:
+            source, destination, file = batch[0]
+            if self._is_same_place(source, destination):
+                self.already_in_place += 1
+                return
+            self.logger.info(f"✨ Planned magical journey: {source} -> {destination}")
+            yield 'move', str(source), str(destination), file
+            return
+        container = FilePacker.next_container(home, promised)
+        self.logger.info(f"🎒 Planned satchel: {len(batch)} small files -> {container}")
+        yield 'pack', [str(source) for source, _, _ in batch], container, [file for _, _, file in batch]
+
+    @staticmethod
+    def _is_same_place(source, destination):
+        """
+        🏠 Check Whether a File Already Lives in Its Rightful Home
+
+        Args:
+            source (Path): Where the file lives now
+            destination (Path): Where the plan wants it to live
+
+        Returns:
+            bool: True if both paths name the same place
+        """
+        return os.path.normcase(os.path.abspath(source)) == os.path.normcase(os.path.abspath(destination))
+
+    @staticmethod
+    def organized_directory_filter(target_directory, categorizer):
+        """
+        🧭 Recognize Lands That Were Already Organized by an Earlier Run
+
+        The returned judge answers True only for ``<target>/<category>/<file type>``
+        directories the IntelligentOrganizer could have made: the file type is a
+        lowercase ending and the categorizer sorts files with that ending into
+        that very category. A user's own ``documents/taxes`` is still explored.
 
-                # Create a cozy new home for each type of file
-                type_path = Path(target_directory) / category / file_type
+        Args:
+            target_directory (str): The promised land of the organization
+            categorizer (FileCategorizer): The sorter whose categories the organization used
+
+        Returns:
+            Callable[[Path], bool]: The judge of already organized directories
+        """
+        target = Path(os.path.abspath(target_directory))
+        categories_of_type = {}
 
-                for file in files:
-                    source = Path(file['path'])
-                    destination = type_path / source.name
-                    self.actions.append(('move', str(source), str(destination)))
-                    self.logger.info(f"✨ Planned magical journey: {source} -> {destination}")
+        def is_organized(directory):
+            try:
+                relative = Path(os.path.abspath(directory)).relative_to(target)
+            except ValueError:
+                return False
+            if len(relative.parts) != 2:
+                return False
+            category, file_type = relative.parts
+            if not file_type or '.' in file_type or file_type != file_type.lower():
+                return False
+            if file_type not in categories_of_type:
+                categories_of_type[file_type] = categorizer.categories_for_extension(file_type)
+            return category in categories_of_type[file_type]
 
-    def execute_actions(self):
+        return is_organized
+
+    def execute_actions(self, actions=None):
         """
         🚀 Launch the Great File Migration!
 
         This method waves the magic wand and makes all the planned file
         movements happen. It's like watching a swarm of friendly file fairies
         carry each file to its new home!
+
+        Once the budget has run out, the remaining journeys are not started;
+        each journey is whole, so the files stay either here or there.
+
+        Args:
+            actions (Iterable[tuple], optional): Journeys to perform instead of our scroll,
+                e.g. streamed from ``iter_actions``
+
+        Returns:
+            dict: How many files were moved, folded into satchels, failed, or deferred for lack of time
         """
-        for action in self.actions:
-            if action[0] == 'move':
+        outcome = {"moved": 0, "packed": 0, "failed": 0, "deferred": 0}
+        for action in (self.actions if actions is None else actions):
+            if self.budget is not None:
+                if self.budget.exhausted:
+                    outcome["deferred"] += len(action[1]) if action[0] == 'pack' else 1
+                    continue
+                self.budget.charge(len(action[1]) if action[0] == 'pack' else 1)
+            if action[0] == 'pack':
+                self._pack_files(action[1], action[2], outcome)
+            elif action[0] == 'move':
                 try:
-                    self._move_file(action[1], action[2])
+                    self._move_file(action[1], action[2], action[3].get('fingerprint'))
                     self.logger.info(f"🎉 File teleported successfully: {action[1]} -> {action[2]}")
+                    outcome["moved"] += 1
                 except Exception as e:
                     self.logger.error(f"🔥 Oh no! File lost in transit {action[1]} to {action[2]}: {str(e)}")
+                    outcome["failed"] += 1
+        return outcome
+
+    def export_plan(self, path, actions=None):
+        """
+        📜 Write the Planned Journeys to a Scroll for Later
+
+        Args:
+            path (str): Where to write the plan (gzip-compressed if it ends in .gz)
+            actions (Iterable[tuple], optional): Journeys to write instead of our scroll
+
+        Returns:
+            int: The number of journeys written
+        """
+        return export_plan(self.actions if actions is None else actions, path)
+
+    def apply_plan(self, path):
+        """
+        🚀 Perform the Journeys of an Exported Plan, Without Rescanning
+
+        The plan is read one journey at a time. Before each move the source is
+        checked with a single ``stat``: if it vanished or its size or
+        modification time changed since planning, the journey is skipped.
+        A satchel folds only those of its files that are still unchanged.
+
+        Args:
+            path (str): A plan written by ``export_plan``
+
+        Returns:
+            dict: How many files were moved, folded into satchels, skipped as stale, or failed
+        """
+        outcome = {"moved": 0, "packed": 0, "stale": 0, "failed": 0}
+        for action in iter_plan(path):
+            source, destination = action["src"], action["dst"]
+            if action["op"] == 'pack':
+                unchanged = [member for member, size, mtime in zip(source, action["size"], action["mtime"])
+                             if self._is_unchanged(member, {"size": size, "mtime": mtime})]
+                if len(unchanged) < len(source):
+                    self.logger.warning(f"⚠️ {len(source) - len(unchanged)} files bound for {destination} "
+                                        f"changed since planning, leaving them be")
+                    outcome["stale"] += len(source) - len(unchanged)
+                if unchanged:
+                    self._pack_files(unchanged, destination, outcome)
+                continue
+            if action["op"] != 'move':
+                self.logger.error(f"🔥 Unknown spell '{action['op']}' in plan for {source}")
+                outcome["failed"] += 1
+                continue
+            if not self._is_unchanged(source, action):
+                self.logger.warning(f"⚠️ {source} changed since planning, leaving it be")
+                outcome["stale"] += 1
+                continue
+            try:
+                self._move_file(source, destination, action.get("fingerprint"))
+                self.logger.info(f"🎉 File teleported successfully: {source} -> {destination}")
+                outcome["moved"] += 1
+            except Exception as e:
+                self.logger.error(f"🔥 Oh no! File lost in transit {source} to {destination}: {str(e)}")
+                outcome["failed"] += 1
+        return outcome
+
+    def _pack_files(self, sources, container, outcome):
+        """
+        🎒 Fold Small Files Into a New Satchel and Tally the Result
+
+        Args:
+            sources (List[str]): The files to fold in
+            container (str): The satchel to create
+            outcome (dict): The tally to update with 'packed' and 'failed' counts
+        """
+        try:
+            index = FilePacker(self.governor).pack(sources, container)
+        except Exception as e:
+            self.logger.error(f"🔥 Oh no! Satchel {container} could not be packed: {str(e)}")
+            outcome["failed"] += len(sources)
+            return
+        self.logger.info(f"🎒 Folded {len(index['members'])} small files into {container}")
+        outcome["packed"] += len(index["members"])
+        outcome["failed"] += len(sources) - len(index["members"])
 
     @staticmethod
-    def _move_file(source, destination):
+    def _is_unchanged(source, action):
+        """
+        🔍 Check That a File Still Looks the Way It Did When Planned
+
+        Args:
+            source (str): The file to check
+            action (dict): The planned journey with its recorded 'size' and 'mtime'
+
+        Returns:
+            bool: True if the file exists with the recorded size and modification time
+        """
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return False
+        if action.get("size") is not None and stat.st_size != action["size"]:
+            return False
+        if action.get("mtime") is not None and stat.st_mtime != action["mtime"]:
+            return False
+        return True
+
+    def _move_file(self, source, destination, fingerprint=None):
         """
         🧚 The File Fairy's Secret Teleportation Spell
 
         This hidden method is the actual magic that moves a file from one
         place to another. It's like a secret teleportation spell!
 
+        With a governor on duty, every move costs one operation token, and a
+        move to another device (which copies the bytes) pays for every chunk.
+
+        Args:
+            source (str): Where the file begins its journey
+            destination (str): Where the file wants to go
+            fingerprint (str, optional): The scanner's fingerprint of the file, checked
+                against the copied bytes when the journey crosses devices
+        """
+        home = Path(destination).parent
+        self._ensure_directory(home)
+        try:
+            self._teleport(source, destination, fingerprint)
+        except FileNotFoundError:
+            if not os.path.exists(source):
+                raise
+            # The home we remembered was torn down since; build it again
+            self._ensure_directory(home, rebuild=True)
+            self._teleport(source, destination, fingerprint)
+
+    def _teleport(self, source, destination, fingerprint=None):
+        """
+        ✨ Move One File Into an Existing Home, Through the Floodgates If Any
+
+        A rename never touches the bytes and costs one operation token. When
+        the home lies on another device the file is copied instead, paying for
+        its bytes chunk by chunk (see ``_copy_across_devices``).
+
         Args:
             source (str): Where the file begins its journey
             destination (str): Where the file wants to go
+            fingerprint (str, optional): The fingerprint a copy across devices must match
+        """
+        try:
+            if self.governor is None:
+                os.rename(source, destination)
+            else:
+                with self.governor.operation():
+                    os.rename(source, destination)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        self._copy_across_devices(source, destination, fingerprint)
+
+    def _copy_across_devices(self, source, destination, fingerprint=None):
+        """
+        🌉 Copy a File to Another Device While Fingerprinting, Then Let the Source Go
+
+        The bytes are copied once, and the fingerprint is computed from the
+        very same reads, so checking it against the scanner's costs nothing
+        extra. Scans no longer fingerprint by default, so a file without one is
+        fingerprinted on demand before it is copied. The copy is written under
+        a temporary name and only takes the destination's name, and the source
+        is only removed, once it is safely on disk and matches the fingerprint.
+        With a governor on duty, every chunk passes the floodgates and is timed
+        on its own, as the fingerprint reads are, so a large move is neither
+        one burst nor one very slow operation.
+
+        Args:
+            source (str): Where the file begins its journey
+            destination (str): Where the file wants to go, on another device
+            fingerprint (str, optional): The scanner's fingerprint of the file
+
+        Raises:
+            OSError: If the file can't be fingerprinted or the copied bytes don't match; the source stays put
+        """
+        if not (fingerprint and _FINGERPRINT.match(fingerprint)):
+            fingerprint = self._fingerprint_on_demand(source)
+            if not _FINGERPRINT.match(fingerprint):
+                raise OSError(errno.EIO, f"File couldn't be fingerprinted before crossing devices ({fingerprint})",
+                              source)
+        partial = str(Path(destination).parent / f".{Path(destination).name}.wizard-partial")
+        try:
+            digest = self._copy_with_digest(source, partial, governor=self.governor)
+            if digest != fingerprint:
+                raise OSError(errno.EIO, f"Copy doesn't match the scanned fingerprint ({digest} != {fingerprint}), "
+                                         f"the file changed or was damaged in transit", source)
+            shutil.copystat(source, partial)
+            os.replace(partial, destination)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        os.remove(source)
+
+    @staticmethod
+    def _copy_with_digest(source, destination, chunk_size=1024 * 1024, governor=None):
+        """
+        🖐️ Copy a File and Fingerprint It From the Same Reads
+
+        Args:
+            source (str): The file to copy
+            destination (str): The new file to write
+            chunk_size (int): How many bytes to carry at once
+            governor (IOGovernor, optional): Floodgate keeper every chunk must pass
+
+        Returns:
+            str: The fingerprint of the copied bytes, as the scanner computes it
+        """
+        hasher = hashlib.md5()
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        with open(source, 'rb') as reader, open(destination, 'wb') as writer:
+            while True:
+                with governor.operation(chunk_size) if governor is not None else nullcontext():
+                    count = reader.readinto(buffer)
+                    writer.write(view[:count])
+                if not count:
+                    break
+                hasher.update(view[:count])
+            writer.flush()
+            if governor is not None:
+                governor.acquire()  # The flush to disk is one more operation, not timed like a chunk
+            os.fsync(writer.fileno())
+        return hasher.hexdigest()
+
+    def _fingerprint_on_demand(self, source):
+        """
+        🖐️ Fingerprint a File the Scan Left Unread, Through the Fingerprinter If There Is One
+
+        Args:
+            source (str): The file about to cross devices
+
+        Returns:
+            str: Its fingerprint, or the word of failure the fingerprint spell returns
+        """
+        if self.fingerprinter is None:
+            return FileScanner._generate_file_fingerprint(Path(source), governor=self.governor)
+        stat = os.stat(source)
+        record = {'path': source, 'size': stat.st_size, 'modified': stat.st_mtime, 'fingerprint': None}
+        return next(iter(self.fingerprinter([record])))['fingerprint']
+
+    def _ensure_directory(self, directory, rebuild=False):
+        """
+        🏗️ Make Sure a Destination Directory Stands, Building It Only Once
+
+        Homes are remembered, so moving many files into one directory costs a
+        single ``mkdir``; a long-lived engine keeps this memory between plans.
+
+        Args:
+            directory (Path): The directory that must exist
+            rebuild (bool): Build it even if we remember it standing
         """
-        Path(destination).parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(source, destination)
+        key = str(directory)
+        if rebuild or key not in self.known_directories:
+            directory.mkdir(parents=True, exist_ok=True)
+            self.known_directories.add(key)
 
     def get_planned_actions(self):
         """
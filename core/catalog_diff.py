@@ -0,0 +1,210 @@
+import os
+from typing import Callable, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from core.scan_catalog import ScanCatalog
+
+
+class CatalogDiff:
+    """
+    🔄 The CatalogDiff: What Changed in the Kingdom Since the Last Census 📈
+
+    Two catalogs are compared without ever comparing files pairwise:
+
+    1. 🧵 Both path columns are sorted and merged once: paths in both catalogs
+       are the same file (``modified`` if its size, modification time or known
+       fingerprint changed), paths in only one are removal or addition candidates.
+    2. 🪪 Candidates are matched by (device, inode, size, modification time):
+       a rename keeps all four, while a new file that merely reuses a freed
+       inode almost never matches the rest.
+    3. 🖐️ What is still unmatched is matched by (fingerprint, size), which
+       catches moves across devices (copy and delete) when fingerprints are known.
+
+    Each of these matches is a merge of two key-sorted lists, so the whole
+    diff costs a few sorts rather than a comparison of every pair. A match
+    within the same directory is a rename, anything else a move.
+
+    Attributes:
+        previous (ScanCatalog): The earlier catalog
+        current (ScanCatalog): The catalog of the scan just made
+        stats (Dict): Counters of the last ``changes`` run
+    """
+
+    KINDS = ("added", "removed", "modified", "moved", "renamed")
+
+    def __init__(self, previous: ScanCatalog, current: ScanCatalog):
+        """
+        🎭 Summon the CatalogDiff into existence!
+
+        Args:
+            previous (ScanCatalog): The earlier catalog
+            current (ScanCatalog): The catalog of the scan just made
+        """
+        self.previous = previous
+        self.current = current
+        self.stats: Dict[str, int] = {}
+
+    def incomparable_reason(self) -> Optional[str]:
+        """
+        🧭 Tell Why the Two Censuses Cannot Be Compared, if They Cannot
+
+        Catalogs of different roots, or of the same root scanned with
+        different filters, would report every file outside their overlap as
+        added or removed.
+
+        Returns:
+            str: Why the catalogs are not comparable, None when they are
+        """
+        previous, current = self.previous.scope, self.current.scope
+        if previous is None or current is None:
+            return "one of the catalogs does not record which root it was scanned from"
+        if previous.get("root") != current.get("root"):
+            return f"the previous catalog is of {previous.get('root')}, not {current.get('root')}"
+        if previous.get("filters") != current.get("filters"):
+            return f"the previous scan used the filters {previous.get('filters')}, not {current.get('filters')}"
+        return None
+
+    def changes(self) -> Generator[Dict, None, None]:
+        """
+        📜 Stream Every Change, Kind by Kind
+
+        Yields:
+            Dict: A change: 'change' (one of KINDS), 'path', 'previous_path' (for moves
+            and renames), 'size', 'size_change' and 'category'
+        """
+        self.stats = {kind: 0 for kind in self.KINDS}
+        self.stats.update(bytes_added=0, bytes_removed=0)
+        previous, current = self.previous, self.current
+
+        old_paths = np.array(list(previous.paths), dtype=object)
+        new_paths = np.array(list(current.paths), dtype=object)
+        _, old_same, new_same = np.intersect1d(old_paths, new_paths, assume_unique=True, return_indices=True)
+        old_left = np.ones(len(previous), dtype=bool)
+        old_left[old_same] = False
+        new_left = np.ones(len(current), dtype=bool)
+        new_left[new_same] = False
+
+        # 🧵 Same path: modified if anything about it changed
+        old_fingerprints, new_fingerprints = previous.fingerprints[old_same], current.fingerprints[new_same]
+        differs = ((previous.sizes[old_same] != current.sizes[new_same])
+                   | (previous.modified[old_same] != current.modified[new_same])
+                   | ((old_fingerprints != b'') & (new_fingerprints != b'') & (old_fingerprints != new_fingerprints)))
+        for old, new in zip(old_same[differs].tolist(), new_same[differs].tolist()):
+            yield self._change("modified", old, new)
+
+        # 🪪 then 🖐️: pair what is left by identity, then by content
+        removed, added = np.flatnonzero(old_left).tolist(), np.flatnonzero(new_left).tolist()
+        for old_key, new_key in ((self._identity(previous), self._identity(current)),
+                                 (self._content(previous), self._content(current))):
+            pairs = self._merge(removed, added, old_key, new_key)
+            for old, new in pairs:
+                same_directory = os.path.dirname(previous.paths[old]) == os.path.dirname(current.paths[new])
+                yield self._change("renamed" if same_directory else "moved", old, new)
+            paired_old, paired_new = {old for old, _ in pairs}, {new for _, new in pairs}
+            removed = [row for row in removed if row not in paired_old]
+            added = [row for row in added if row not in paired_new]
+
+        for new in added:
+            yield self._change("added", None, new)
+        for old in removed:
+            yield self._change("removed", old, None)
+
+    def _change(self, kind: str, old: Optional[int], new: Optional[int]) -> Dict:
+        """
+        🏷️ Describe One Change and Count It
+
+        Args:
+            kind (str): One of KINDS
+            old (int, optional): Row in the previous catalog
+            new (int, optional): Row in the current catalog
+
+        Returns:
+            Dict: The change
+        """
+        old_size = int(self.previous.sizes[old]) if old is not None else 0
+        new_size = int(self.current.sizes[new]) if new is not None else 0
+        catalog, row = (self.current, new) if new is not None else (self.previous, old)
+        self.stats[kind] += 1
+        self.stats["bytes_added"] += max(new_size - old_size, 0)
+        self.stats["bytes_removed"] += max(old_size - new_size, 0)
+        return {
+            "change": kind,
+            "path": self.current.paths[new] if new is not None else self.previous.paths[old],
+            "previous_path": self.previous.paths[old] if kind in ("moved", "renamed") else None,
+            "size": new_size if new is not None else old_size,
+            "size_change": new_size - old_size,
+            "category": catalog.category_names[catalog.category_codes[row]],
+        }
+
+    @staticmethod
+    def _identity(catalog: ScanCatalog) -> Callable[[int], Optional[tuple]]:
+        def key(row):
+            if not catalog.inodes[row]:
+                return None  # Catalogs from before inodes were kept
+            return (int(catalog.devices[row]), int(catalog.inodes[row]), int(catalog.sizes[row]),
+                    float(catalog.modified[row]))
+        return key
+
+    @staticmethod
+    def _content(catalog: ScanCatalog) -> Callable[[int], Optional[tuple]]:
+        def key(row):
+            fingerprint = catalog.fingerprints[row]
+            if len(fingerprint) != 32:
+                return None  # Never fingerprinted, or unreadable
+            return fingerprint, int(catalog.sizes[row])
+        return key
+
+    @staticmethod
+    def _merge(removed: List[int], added: List[int], old_key, new_key) -> List[Tuple[int, int]]:
+        """
+        🔀 Pair Rows With Equal Keys by Merging Two Key-Sorted Lists
+
+        Rows sharing a key (identical copies moved together) are paired one
+        to one, in row order.
+
+        Args:
+            removed (List[int]): Unmatched rows of the previous catalog
+            added (List[int]): Unmatched rows of the current catalog
+            old_key (Callable): Key of a previous row, None if it has none
+            new_key (Callable): Key of a current row, None if it has none
+
+        Returns:
+            List[Tuple[int, int]]: (previous row, current row) pairs
+        """
+        old = sorted((key, row) for key, row in ((old_key(row), row) for row in removed) if key is not None)
+        new = sorted((key, row) for key, row in ((new_key(row), row) for row in added) if key is not None)
+        pairs, i, j = [], 0, 0
+        while i < len(old) and j < len(new):
+            if old[i][0] < new[j][0]:
+                i += 1
+            elif old[i][0] > new[j][0]:
+                j += 1
+            else:
+                pairs.append((old[i][1], new[j][1]))
+                i += 1
+                j += 1
+        return pairs
+
+    def category_growth(self) -> Dict[str, Dict]:
+        """
+        📈 Files and Bytes Gained or Lost per Category
+
+        Returns:
+            Dict[str, Dict]: Category -> 'files_before', 'files_after', 'files_change',
+            'bytes_before', 'bytes_after' and 'bytes_change', fastest growing first
+        """
+        before, after = self.previous.by_category(), self.current.by_category()
+        empty = {"total_files": 0, "total_size": 0}
+        growth = {}
+        for category in sorted(set(before) | set(after)):
+            old, new = before.get(category, empty), after.get(category, empty)
+            growth[category] = {
+                "files_before": old["total_files"],
+                "files_after": new["total_files"],
+                "files_change": new["total_files"] - old["total_files"],
+                "bytes_before": old["total_size"],
+                "bytes_after": new["total_size"],
+                "bytes_change": new["total_size"] - old["total_size"],
+            }
+        return dict(sorted(growth.items(), key=lambda item: -item[1]["bytes_change"]))
@@ -0,0 +1,208 @@
+from typing import Dict, Generator, Optional, Tuple
+
+import numpy as np
+
+from core.scan_catalog import ScanCatalog
+
+
+class CatalogQuery:
+    """
+    🔎 The CatalogQuery: Librarian Who Answers Without Leaving the Desk 📚
+
+    Questions such as "the largest videos", "files untouched for two years" or
+    "everything with fingerprint X" are answered from a persisted ScanCatalog
+    and its secondary indexes, never from the scanned filesystem.
+
+    The librarian walks the index of the requested sort column in slices,
+    narrowed by binary search when a range on that same column is asked for,
+    and checks the other conditions on each slice with vectorized masks. It
+    stops as soon as the requested page is full, so the first answers arrive
+    in milliseconds even over tens of millions of rows. Equality lookups on a
+    fingerprint, category or extension start from their own index instead,
+    when that leaves fewer rows to look at.
+
+    Attributes:
+        catalog (ScanCatalog): The catalog being questioned
+    """
+
+    ORDER_COLUMNS = {'size': 'sizes', 'modified': 'modified'}
+
+    # 🍰 Rows checked per vectorized slice while walking an index
+    SLICE_SIZE = 65536
+
+    def __init__(self, catalog: ScanCatalog):
+        """
+        🎭 Summon the CatalogQuery into existence!
+
+        Args:
+            catalog (ScanCatalog): The catalog to question; missing indexes are built once
+        """
+        self.catalog = catalog
+        self.indexes = catalog.build_indexes()
+
+    def find(self, category: Optional[str] = None, extension: Optional[str] = None,
+             min_size: Optional[int] = None, max_size: Optional[int] = None,
+             modified_before: Optional[float] = None, modified_after: Optional[float] = None,
+             fingerprint: Optional[str] = None, order_by: str = 'size', descending: bool = True,
+             offset: int = 0, limit: Optional[int] = None) -> Generator[Dict, None, None]:
+        """
+        🔎 Stream the Rows Matching Every Given Condition
+
+        Args:
+            category (str, optional): Only files of this category
+            extension (str, optional): Only files with this extension (without the dot)
+            min_size (int, optional): Only files of at least this many bytes
+            max_size (int, optional): Only files of at most this many bytes
+            modified_before (float, optional): Only files last modified before this timestamp
+            modified_after (float, optional): Only files last modified at or after this timestamp
+            fingerprint (str, optional): Only files with exactly this fingerprint
+            order_by (str): 'size' or 'modified'
+            descending (bool): Largest / newest first when True
+            offset (int): Matching rows to skip, for pagination
+            limit (int, optional): Maximum rows to yield
+
+        Yields:
+            Dict: One record per matching row
+
+        Raises:
+            ValueError: If the sort column is unknown
+        """
+        if order_by not in self.ORDER_COLUMNS:
+            raise ValueError(f"🔎 Cannot sort by '{order_by}', expected one of {sorted(self.ORDER_COLUMNS)}")
+
+        codes = {}
+        if category is not None:
+            codes['category_codes'] = self._code(self.catalog.category_names, category)
+        if extension is not None:
+            codes['extension_codes'] = self._code(self.catalog.extension_names, extension.lstrip('.').lower())
+        if any(code is None for code in codes.values()):
+            return
+
+        wanted_fingerprint = fingerprint.encode('ascii') if fingerprint is not None else None
+        bounds = {
+            'sizes': (min_size, max_size, True),
+            'modified': (modified_after, modified_before, False),
+        }
+
+        def matches(rows: np.ndarray) -> np.ndarray:
+            mask = np.ones(rows.size, dtype=bool)
+            for column, code in codes.items():
+                mask &= getattr(self.catalog, column)[rows] == code
+            if wanted_fingerprint is not None:
+                mask &= self.catalog.fingerprints[rows] == wanted_fingerprint
+            for column, (low, high, high_inclusive) in bounds.items():
+                values = getattr(self.catalog, column)[rows]
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= (values <= high) if high_inclusive else (values < high)
+            return mask
+
+        rows = self._candidates(codes, wanted_fingerprint, order_by, descending, bounds)
+        remaining = limit
+        for start in range(0, rows.size, self.SLICE_SIZE):
+            piece = rows[start:start + self.SLICE_SIZE]
+            piece = piece[matches(piece)]
+            if offset:
+                skipped = min(offset, piece.size)
+                piece, offset = piece[skipped:], offset - skipped
+            if remaining is not None:
+                piece, remaining = piece[:remaining], remaining - min(remaining, piece.size)
+            for row in piece.tolist():
+                yield self.catalog.row(row)
+            if remaining == 0:
+                return
+
+    def _candidates(self, codes: Dict[str, int], fingerprint: Optional[bytes], order_by: str,
+                    descending: bool, bounds: Dict[str, Tuple]) -> np.ndarray:
+        """
+        🧭 Choose the Cheapest Index and Return Candidate Rows in Result Order
+
+        Args:
+            codes (Dict[str, int]): Equality conditions on coded columns
+            fingerprint (bytes, optional): Equality condition on the fingerprint
+            order_by (str): The requested sort column
+            descending (bool): The requested sort direction
+            bounds (Dict[str, Tuple]): Range conditions per column
+
+        Returns:
+            np.ndarray: Candidate row numbers, already in the requested order
+        """
+        order_column = self.ORDER_COLUMNS[order_by]
+        low, high, high_inclusive = bounds[order_column]
+        ordered = self._range(order_column, low, high, high_inclusive)
+
+        # An equality index beats the order index when it leaves fewer rows to sort
+        best = None
+        if fingerprint is not None:
+            best = self._range('fingerprints', fingerprint, fingerprint, True)
+        for column, code in codes.items():
+            rows = self._range(column, code, code, True)
+            if best is None or rows.size < best.size:
+                best = rows
+
+        if best is not None and best.size < ordered.size // 8:
+            keys = getattr(self.catalog, order_column)[best]
+            best = best[np.lexsort((best, keys))]
+            return best[::-1] if descending else best
+        return ordered[::-1] if descending else ordered
+
+    def _range(self, column: str, low, high, high_inclusive: bool) -> np.ndarray:
+        """
+        ✂️ Slice an Index Down to a Value Range by Binary Search
+
+        Args:
+            column (str): The indexed column
+            low: Smallest wanted value, or None
+            high: Largest wanted value, or None
+            high_inclusive (bool): Whether ``high`` itself is wanted
+
+        Returns:
+            np.ndarray: The index slice holding exactly the rows in range
+        """
+        index = self.indexes[column]
+        values = getattr(self.catalog, column)
+        start = 0 if low is None else self._bisect(index, values, low, right=False)
+        end = index.size if high is None else self._bisect(index, values, high, right=high_inclusive)
+        return index[start:max(start, end)]
+
+    @staticmethod
+    def _bisect(index: np.ndarray, values: np.ndarray, target, right: bool) -> int:
+        """
+        🎯 Binary Search Through an Index Without Materializing Sorted Values
+
+        Args:
+            index (np.ndarray): Row numbers in ascending value order
+            values (np.ndarray): The column the index sorts
+            target: The value to locate
+            right (bool): Return the position after equal values instead of before
+
+        Returns:
+            int: The insertion position of ``target`` in the index
+        """
+        low, high = 0, index.size
+        while low < high:
+            middle = (low + high) // 2
+            value = values[index[middle]]
+            if value < target or (right and value == target):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    @staticmethod
+    def _code(names, name: str) -> Optional[int]:
+        """
+        🔢 Look Up the Interned Code of a Category or Extension
+
+        Args:
+            names (List[str]): The interned names
+            name (str): The name to look up
+
+        Returns:
+            int: Its code, or None if no file carries it
+        """
+        try:
+            return names.index(name)
+        except ValueError:
+            return None
@@ -0,0 +1,243 @@
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Generator, Optional, Sequence
+
+from core.file_scanner import FileScanner
+
+
+class BloomFilter:
+    """
+    🌸 The BloomFilter: A Sieve That Remembers Keys in a Few Bits Each 🧠
+
+    It answers "have I seen this key?" with "certainly not" or "maybe". A
+    "maybe" is wrong with at most the chosen false-positive rate when no
+    more than ``capacity`` keys were added, and each key costs about
+    ``-ln(rate) / ln(2)²`` bits: under 10 bits (1.2 bytes) at 1%.
+
+    Attributes:
+        capacity (int): How many keys the filter is sized for
+        false_positive_rate (float): The "maybe" error rate at capacity
+        size (int): The number of bits
+        hashes (int): The number of bits set per key
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        """
+        🎭 Summon the BloomFilter into existence!
+
+        Args:
+            capacity (int): How many keys the filter is sized for
+            false_positive_rate (float): The acceptable "maybe" error rate, between 0 and 1
+
+        Raises:
+            ValueError: If the rate is not strictly between 0 and 1
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("🌸 The false-positive rate must lie strictly between 0 and 1")
+        self.capacity = max(1, capacity)
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first, second = struct.unpack('<QQ', digest)
+        second |= 1  # Odd steps visit distinct bits
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key: bytes) -> bool:
+        """
+        ➕ Remember a Key
+
+        Args:
+            key (bytes): The key
+
+        Returns:
+            bool: True if the key may have been added before
+        """
+        seen = True
+        bits = self.bits
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                seen = False
+                bits[byte] |= mask
+        return seen
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class DuplicateFinder:
+    """
+    👯 The DuplicateFinder: Exact Twins Among Billions, in a Few Bytes per File 🔍
+
+    An exact dictionary of every file's fingerprint outgrows memory on the
+    largest estates, and fingerprinting every file costs a full read of the
+    estate. The finder narrows the field in stages, each exact in its
+    results:
+
+    1. 🌸 A Bloom filter over file sizes (free, from the scan's metadata)
+       notes which sizes may occur more than once; only a "maybe" writes the
+       size to an on-disk SQLite table. Memory: a little over a byte per file.
+    2. 🥄 Files of a repeated size are read for a partial hash of their first
+       ``partial_bytes``, stored with their path in the same database.
+    3. 🖐️ Only (size, partial hash) groups with several members are
+       fingerprinted in full (reusing fingerprints the scan already has), and
+       files sharing size and fingerprint are reported as duplicates.
+
+    Bloom false positives only cost a few extra partial reads; they never
+    change the result.
+
+    Attributes:
+        false_positive_rate (float): Error rate of the size sieve
+        partial_bytes (int): How much of a file the partial hash reads
+        min_size (int): Files smaller than this are ignored (empty files are all alike)
+        governor (IOGovernor): Optional floodgate keeper for the reads
+        stats (Dict): Counters of the last search
+    """
+
+    def __init__(self, false_positive_rate: float = 0.01, partial_bytes: int = 4096, min_size: int = 1,
+                 workspace: Optional[str] = None, governor=None):
+        """
+        🎭 Summon the DuplicateFinder into existence!
+
+        Args:
+            false_positive_rate (float): Error rate of the size sieve
+            partial_bytes (int): How much of a file the partial hash reads
+            min_size (int): Ignore files smaller than this
+            workspace (str, optional): Where the confirmation database lives; a temporary
+                directory by default
+            governor (IOGovernor, optional): Floodgate keeper for the reads
+
+        Raises:
+            ValueError: If the partial hash would read nothing
+        """
+        if partial_bytes < 1:
+            raise ValueError("🥄 The partial hash must read at least one byte")
+        self.false_positive_rate = false_positive_rate
+        self.partial_bytes = partial_bytes
+        self.min_size = min_size
+        self.workspace = workspace
+        self.governor = governor
+        self.stats: Dict[str, int] = {}
+
+    def find(self, records: Sequence[Dict]) -> Generator[Dict, None, None]:
+        """
+        🔍 Find Every Set of Identical Files Among the Records
+
+        The records are walked twice, so pass a list (or anything that can
+        be iterated again), not a one-shot generator.
+
+        Args:
+            records (Sequence[Dict]): Scanner records
+
+        Yields:
+            Dict: A duplicate set: 'size', 'fingerprint' and the member 'paths'
+        """
+        sieve = BloomFilter(len(records), self.false_positive_rate)
+        self.stats = {"files": 0, "filter_bytes": sieve.nbytes, "repeated_sizes": 0, "partially_hashed": 0,
+                      "fully_hashed": 0, "duplicate_sets": 0, "duplicate_files": 0, "wasted_bytes": 0}
+
+        with tempfile.TemporaryDirectory(dir=self.workspace, prefix="duplicates-") as cellar:
+            database = sqlite3.connect(os.path.join(cellar, "duplicates.sqlite"))
+            try:
+                database.execute("PRAGMA journal_mode = OFF")
+                database.execute("PRAGMA synchronous = OFF")
+                database.execute("CREATE TABLE repeated_sizes (size INTEGER PRIMARY KEY)")
+                database.execute("CREATE TABLE candidates (size INTEGER, partial BLOB, path TEXT, fingerprint TEXT)")
+
+                # 🌸 Stage 1: which sizes may repeat
+                for record in records:
+                    if record['size'] < self.min_size:
+                        continue
+                    self.stats["files"] += 1
+                    if sieve.add(struct.pack('>Q', record['size'])):
+                        database.execute("INSERT OR IGNORE INTO repeated_sizes VALUES (?)", (record['size'],))
+                self.stats["repeated_sizes"] = database.execute("SELECT COUNT(*) FROM repeated_sizes").fetchone()[0]
+
+                # 🥄 Stage 2: partial hashes of files whose size repeats
+                for record in records:
+                    if record['size'] < self.min_size or not database.execute(
+                            "SELECT 1 FROM repeated_sizes WHERE size = ?", (record['size'],)).fetchone():
+                        continue
+                    partial = self._partial_hash(record)
+                    if partial is not None:
+                        database.execute("INSERT INTO candidates VALUES (?, ?, ?, ?)",
+                                         (record['size'], partial, record['path'], record.get('fingerprint')))
+                database.execute("CREATE INDEX candidates_by_key ON candidates (size, partial)")
+
+                # 🖐️ Stage 3: full fingerprints where size and partial hash agree
+                groups = database.execute("SELECT size, partial FROM candidates GROUP BY size, partial "
+                                          "HAVING COUNT(*) > 1 ORDER BY size DESC")
+                for size, partial in groups:
+                    members = database.execute("SELECT path, fingerprint FROM candidates "
+                                               "WHERE size = ? AND partial = ?", (size, partial)).fetchall()
+                    yield from self._confirm(size, partial, members)
+            finally:
+                database.close()
+
+    def _partial_hash(self, record: Dict) -> Optional[bytes]:
+        """
+        🥄 Hash the Beginning of a File
+
+        A file no larger than ``partial_bytes`` is hashed whole, so a
+        fingerprint the scan already has is that hash and nothing is read.
+
+        Args:
+            record (Dict): The scanner record
+
+        Returns:
+            bytes: The digest, or None if the file could not be read
+        """
+        fingerprint = record.get('fingerprint')
+        if record['size'] <= self.partial_bytes and fingerprint and len(fingerprint) == 32:
+            return bytes.fromhex(fingerprint)
+        try:
+            with open(record['path'], 'rb') as handle:
+                head = FileScanner._read_chunk(handle, self.partial_bytes, self.governor)
+        except OSError as e:
+            print(f"🚫 Could not peek into {record['path']}: {e}")
+            return None
+        self.stats["partially_hashed"] += 1
+        return hashlib.md5(head).digest()
+
+    def _confirm(self, size: int, partial: bytes, members) -> Generator[Dict, None, None]:
+        """
+        🖐️ Split a (Size, Partial Hash) Group by Full Fingerprint
+
+        Args:
+            size (int): The members' size
+            partial (bytes): Their partial hash
+            members (List[Tuple[str, str]]): (path, known fingerprint or None)
+
+        Yields:
+            Dict: Every set of at least two members with the same fingerprint
+        """
+        by_fingerprint: Dict[str, list] = {}
+        for path, fingerprint in members:
+            if size <= self.partial_bytes:
+                fingerprint = partial.hex()  # The partial hash covered the whole file
+            elif not fingerprint or len(fingerprint) != 32:
+                fingerprint = FileScanner._generate_file_fingerprint(Path(path), governor=self.governor)
+                self.stats["fully_hashed"] += 1
+                if len(fingerprint) != 32:
+                    continue  # Unreadable
+            by_fingerprint.setdefault(fingerprint, []).append(path)
+        for fingerprint, paths in by_fingerprint.items():
+            if len(paths) > 1:
+                self.stats["duplicate_sets"] += 1
+                self.stats["duplicate_files"] += len(paths)
+                self.stats["wasted_bytes"] += size * (len(paths) - 1)
+                yield {"size": size, "fingerprint": fingerprint, "paths": sorted(paths)}
@@ -0,0 +1,151 @@
+import heapq
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+from core.intelligent_organizer import IntelligentOrganizer
+
+
+class ExternalPlanner:
+    """
+    🗄️ The ExternalPlanner: Architect Who Drafts on the Cellar Floor 🏚️
+
+    The IntelligentOrganizer keeps its whole blueprint in a nested dict, which
+    is fine until the realm holds more files than the castle has room for.
+    This architect keeps at most ``max_records_in_memory`` records at hand.
+    Whenever its desk is full it sorts them by (category, file type, path) and
+    carries them down to the cellar as a run file. When the plan is read, the
+    runs and whatever is still on the desk are merged lazily, so the groups come
+    back in order while only one record per run is held at a time.
+
+    Reading the plan can be repeated (e.g. once for logging, once for export,
+    once for execution); the cellar is cleared by ``close``.
+
+    Attributes:
+        max_records_in_memory (int): How many records may wait on the desk before spilling
+        runs (List[str]): Paths of the run files written so far
+        total_records (int): Records added to the plan
+    """
+
+    def __init__(self, max_records_in_memory: int = 100000, spill_directory: Optional[str] = None):
+        """
+        🎭 Summon the ExternalPlanner into existence!
+
+        Args:
+            max_records_in_memory (int): The memory ceiling, counted in records
+            spill_directory (str, optional): Where to dig the cellar; the system temp folder by default
+
+        Raises:
+            ValueError: If the ceiling isn't a positive number of records
+        """
+        if max_records_in_memory < 1:
+            raise ValueError("🗄️ The desk must hold at least one record")
+        self.max_records_in_memory = max_records_in_memory
+        self.runs: List[str] = []
+        self.total_records = 0
+        self._cellar = tempfile.mkdtemp(prefix='chaos-plan-', dir=spill_directory)
+        self._desk: List[Tuple[str, str, Dict]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _sort_key(entry: Tuple[str, str, Dict]) -> Tuple[str, str, str]:
+        return entry[0], entry[1], entry[2]['path']
+
+    def add(self, category: str, record: Dict):
+        """
+        ✍️ Place One Categorized Record on the Desk
+
+        Args:
+            category (str): The record's category
+            record (Dict): The scanner record
+        """
+        self._desk.append((category, IntelligentOrganizer._get_file_type(record['path']), record))
+        self.total_records += 1
+        if len(self._desk) >= self.max_records_in_memory:
+            self._spill()
+
+    def add_categorized(self, categorized_files: Dict[str, List[Dict]]) -> "ExternalPlanner":
+        """
+        📚 Place Every Record of a Categorized Realm on the Desk
+
+        Args:
+            categorized_files (Dict[str, List[Dict]]): Category -> scanner records
+
+        Returns:
+            ExternalPlanner: Ourselves, for chaining
+        """
+        return self.add_stream((category, file) for category, files in categorized_files.items() for file in files)
+
+    def add_stream(self, categorized: Iterable[Tuple[str, Dict]]) -> "ExternalPlanner":
+        """
+        🌊 Place (Category, Record) Pairs on the Desk as They Flow By
+
+        Only the desk's records are held at a time, so a realm can be planned
+        straight from the scanner without ever being held whole.
+
+        Args:
+            categorized (Iterable[Tuple[str, Dict]]): (category, scanner record) pairs
+
+        Returns:
+            ExternalPlanner: Ourselves, for chaining
+        """
+        for category, file in categorized:
+            self.add(category, file)
+        return self
+
+    def _spill(self):
+        """
+        🏚️ Sort the Desk and Carry It Down to the Cellar as a Run File
+        """
+        self._desk.sort(key=self._sort_key)
+        run_path = os.path.join(self._cellar, f"run-{len(self.runs):05d}.jsonl")
+        with open(run_path, 'w', encoding='utf-8') as run:
+            for entry in self._desk:
+                run.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.runs.append(run_path)
+        self._desk.clear()
+
+    @staticmethod
+    def _read_run(run_path: str) -> Generator[Tuple[str, str, Dict], None, None]:
+        with open(run_path, encoding='utf-8') as run:
+            for line in run:
+                category, file_type, record = json.loads(line)
+                yield category, file_type, record
+
+    def entries(self) -> Iterator[Tuple[str, str, Dict]]:
+        """
+        🔀 Merge the Runs and the Desk Into One Sorted Stream
+
+        Returns:
+            Iterator[Tuple[str, str, Dict]]: (category, file type, record) in plan order
+        """
+        self._desk.sort(key=self._sort_key)
+        streams = [self._read_run(run_path) for run_path in self.runs] + [iter(self._desk)]
+        return heapq.merge(*streams, key=self._sort_key)
+
+    def groups(self) -> Generator[Tuple[str, str, Iterator[Dict]], None, None]:
+        """
+        🗂️ Stream the Plan One (Category, File Type) Group at a Time
+
+        Yields:
+            Tuple[str, str, Iterator[Dict]]: The category, the file type and its records;
+                each group's records must be consumed before asking for the next group
+        """
+        for (category, file_type), entries in itertools.groupby(self.entries(), key=lambda entry: entry[:2]):
+            yield category, file_type, (record for _, _, record in entries)
+
+    def close(self):
+        """
+        🧹 Clear the Cellar of Every Run File
+        """
+        shutil.rmtree(self._cellar, ignore_errors=True)
+        self.runs.clear()
+        self._desk.clear()
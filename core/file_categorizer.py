@@ -1,4 +1,5 @@
 import mimetypes
+import os
 from collections import defaultdict
 
 from config import DEFAULT_CATEGORIES
@@ -15,9 +16,13 @@ class FileCategorizer:
     Attributes:
         categories (defaultdict): A magical bag that sorts files by category
         category_map (dict): A scroll of ancient knowledge about file types
+        category_cache (dict): Divinations remembered per file ending, so each is done once
     """
 
-    def __init__(self, categories=None):
+    # 🧠 Endings remembered at most; real realms have far fewer
+    MAX_CACHED_ENDINGS = 65536
+
+    def __init__(self, categories=None, category_cache=None):
         """
         🎭 Summon the FileCategorizer into existence!
 
@@ -26,9 +31,11 @@ class FileCategorizer:
 
         Args:
             categories (dict, optional): A custom scroll of file categories
+            category_cache (dict, optional): A memory shared with other sorters using the same scroll
         """
         self.categories = defaultdict(list)  # Our magical sorting bag
         self.category_map = categories or DEFAULT_CATEGORIES  # Our knowledge scroll
+        self.category_cache = {} if category_cache is None else category_cache  # Our memory
 
     def categorize(self, files):
         """
@@ -49,6 +56,19 @@ class FileCategorizer:
             self.categories[category].append(file)
         return dict(self.categories)
 
+    def categorize_stream(self, files):
+        """
+        🌊 Sort Files as They Flow By, Keeping None of Them
+
+        Args:
+            files (Iterable[dict]): Files, e.g. straight from the FileScanner
+
+        Yields:
+            tuple: (category, file) for every file
+        """
+        for file in files:
+            yield self._determine_category(file), file
+
     def _determine_category(self, file):
         """
         🔮 The Mystical File Type Divination
@@ -62,19 +82,70 @@ class FileCategorizer:
         Returns:
             str: The discovered category of the file
         """
-        extension = file['path'].split('.')[-1].lower()
+        # Extension lists and mime scrolls only look at the last two endings of the name
+        # (and at whether it starts with a dot); names without any ending are divined directly
+        name = os.path.basename(file['path'])
+        bare = name.lstrip('.')
+        parts = bare.rsplit('.', 2)
+        if len(parts) == 1:
+            return self._divine_category(file['path'])
+        ending = (name != bare, len(parts), '.'.join(parts[1:]))
+        category = self.category_cache.get(ending)
+        if category is None:
+            category = self._divine_category(file['path'])
+            if len(self.category_cache) < self.MAX_CACHED_ENDINGS:
+                self.category_cache[ending] = category
+        return category
+
+    def _divine_category(self, path):
+        """
+        🔮 Divine a Category the Long Way, Through Extension Lists and Mime Scrolls
+
+        Args:
+            path (str): The file's path
+
+        Returns:
+            str: The discovered category of the file
+        """
+        extension = path.split('.')[-1].lower()
         for category, extensions in self.category_map.items():
             if f".{extension}" in extensions:
                 return category
 
         # If extension not found, we consult the ancient mime-type scrolls
-        mime_type, _ = mimetypes.guess_type(file['path'])
+        mime_type, _ = mimetypes.guess_type(path)
         if mime_type:
             main_type, _ = mime_type.split('/')
             return main_type
 
         return 'unknown'
 
+    def categories_for_extension(self, extension):
+        """
+        🧭 Name Every Category a File With This Ending Could Be Sorted Into
+
+        Usually that is a single category, but a compression ending such as
+        ``gz`` hides the true nature one ending further in (``.tar.gz`` is an
+        application, a lone ``.gz`` a mystery), so all the inner endings the
+        mime scrolls know are consulted too.
+
+        Args:
+            extension (str): The ending without its dot, or 'unknown' for files without one
+
+        Returns:
+            set: The categories files with this ending may receive
+        """
+        if extension == 'unknown':
+            return {self._determine_category({'path': 'x'})}
+        categories = {self._determine_category({'path': f'x.{extension}'})}
+        if not mimetypes.inited:
+            mimetypes.init()
+        for encoding in mimetypes.encodings_map:
+            if encoding.lower() == f'.{extension}':
+                categories.update(self._determine_category({'path': f'x{inner}{encoding}'})
+                                  for inner in mimetypes.types_map)
+        return categories
+
     def get_categories(self) -> dict:
         """
         📚 Reveal the Sorted File Library
@@ -0,0 +1,245 @@
+import json
+import os
+import re
+import tarfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+class FilePacker:
+    """
+    🎒 The FilePacker: Folds Swarms of Tiny Scrolls Into One Satchel 📦
+
+    Millions of tiny files each cost an inode and a metadata operation, on
+    every scan and every backup, long after they have been organized. The
+    packer folds the tiny files of one bucket into a plain (uncompressed) tar
+    satchel, ``.wizard-pack-0001.tar``, and writes a sidecar index next to
+    it, ``.wizard-pack-0001.tar.index.json``, naming each member's byte
+    offset and size inside the satchel. A member can therefore be read with
+    one seek, without walking the tar headers, and the satchel stays a tar
+    that any tool can open.
+
+    Attributes:
+        governor (IOGovernor): Optional floodgate keeper charged for every byte packed
+    """
+
+    INDEX_FORMAT = "data-chaos-wizard-pack"
+    INDEX_VERSION = 1
+    INDEX_SUFFIX = ".index.json"
+    _ARTIFACT = re.compile(r'^\.wizard-pack-\d+\.tar(\.index\.json)?$')
+
+    def __init__(self, governor=None):
+        """
+        🎭 Summon the FilePacker into existence!
+
+        Args:
+            governor (IOGovernor, optional): Floodgate keeper charged for every byte packed
+        """
+        self.governor = governor
+
+    @classmethod
+    def is_artifact(cls, path) -> bool:
+        """
+        🔍 Recognize a Satchel or Its Index, Which Must Never Be Organized Again
+
+        Args:
+            path (str or Path): Any file path
+
+        Returns:
+            bool: True for satchels and their sidecar indexes
+        """
+        return bool(cls._ARTIFACT.match(os.path.basename(str(path))))
+
+    @classmethod
+    def index_path(cls, container) -> str:
+        return str(container) + cls.INDEX_SUFFIX
+
+    @staticmethod
+    def container_name(number: int) -> str:
+        return f".wizard-pack-{number:04d}.tar"
+
+    @classmethod
+    def next_container(cls, directory, taken: Optional[set] = None) -> str:
+        """
+        🏷️ Choose the First Satchel Name Neither on Disk Nor Already Promised
+
+        Args:
+            directory (str or Path): The bucket the satchel will live in
+            taken (set, optional): Satchel paths already promised in this plan; updated
+
+        Returns:
+            str: The satchel's path
+        """
+        taken = set() if taken is None else taken
+        number = 1
+        while True:
+            container = str(Path(directory) / cls.container_name(number))
+            if container not in taken and not os.path.exists(container):
+                taken.add(container)
+                return container
+            number += 1
+
+    def pack(self, sources: Iterable[str], container: str) -> Dict:
+        """
+        🎒 Fold Files Into a New Satchel, Then Remove the Originals
+
+        Members keep their file names; a clashing name gets a ``~n`` suffix.
+        Files that can't be read are left where they are. The originals are
+        removed only after the satchel and its index are safely on disk.
+
+        Args:
+            sources (Iterable[str]): The files to fold in
+            container (str): The satchel to create; an existing one is never overwritten
+
+        Returns:
+            Dict: The index that was written
+
+        Raises:
+            FileExistsError: If the satchel already exists
+        """
+        Path(container).parent.mkdir(parents=True, exist_ok=True)
+        members: Dict[str, Dict] = {}
+        packed: List[str] = []
+        with open(container, 'xb') as raw:
+            try:
+                with tarfile.open(fileobj=raw, mode='w', format=tarfile.PAX_FORMAT) as tar:
+                    for source in sources:
+                        name = self._unique_name(os.path.basename(source), members)
+                        try:
+                            info = tar.gettarinfo(source, arcname=name)
+                            handle = open(source, 'rb')
+                        except OSError as e:
+                            print(f"🚫 Could not fold {source} into the satchel: {e}")
+                            continue
+                        with handle:
+                            if self.governor is not None:
+                                self.governor.acquire(info.size)
+                            tar.addfile(info, handle)
+                        padded = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+                        members[name] = {
+                            "offset": tar.offset - padded,
+                            "size": info.size,
+                            "mtime": info.mtime,
+                            "mode": info.mode,
+                            "source": source,
+                        }
+                        packed.append(source)
+                raw.flush()
+                os.fsync(raw.fileno())
+            except BaseException:
+                # A file that changed mid-read leaves a torn satchel; nothing was removed yet
+                os.remove(container)
+                raise
+
+        index = {"format": self.INDEX_FORMAT, "version": self.INDEX_VERSION, "members": members}
+        temporary = self.index_path(container) + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            json.dump(index, handle, ensure_ascii=False)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.index_path(container))
+
+        for source in packed:
+            os.remove(source)
+        return index
+
+    @staticmethod
+    def _unique_name(name: str, members: Dict) -> str:
+        candidate, number = name, 1
+        while candidate in members:
+            candidate, number = f"{name}~{number}", number + 1
+        return candidate
+
+    def load_index(self, container: str) -> Dict:
+        """
+        📖 Read a Satchel's Sidecar Index
+
+        Args:
+            container (str): The satchel
+
+        Returns:
+            Dict: The index, with 'members' keyed by name
+
+        Raises:
+            ValueError: If the index is not one this version understands
+        """
+        with open(self.index_path(container), encoding='utf-8') as handle:
+            index = json.load(handle)
+        if index.get("format") != self.INDEX_FORMAT or index.get("version") != self.INDEX_VERSION:
+            raise ValueError(f"🎒 Not a satchel index this wizard understands: {self.index_path(container)}")
+        return index
+
+    def read(self, container: str, name: str, index: Optional[Dict] = None) -> bytes:
+        """
+        🔑 Read One Member Straight From Its Offset
+
+        Args:
+            container (str): The satchel
+            name (str): The member's name
+            index (Dict, optional): The satchel's index, if already loaded
+
+        Returns:
+            bytes: The member's contents
+
+        Raises:
+            KeyError: If the satchel has no such member
+        """
+        member = (index or self.load_index(container))["members"][name]
+        with open(container, 'rb') as handle:
+            handle.seek(member["offset"])
+            return handle.read(member["size"])
+
+    def unpack(self, container: str, destination: Optional[str] = None, remove: bool = True) -> int:
+        """
+        📤 Restore Every Member of a Satchel as a File Again
+
+        Existing files are never overwritten; the satchel is kept whenever a
+        member could not be restored.
+
+        Args:
+            container (str): The satchel
+            destination (str, optional): Where to restore; the satchel's own directory by default
+            remove (bool): Remove the satchel and its index once everything is restored
+
+        Returns:
+            int: The number of files restored
+        """
+        index = self.load_index(container)
+        destination = Path(destination or os.path.dirname(os.path.abspath(container)))
+        destination.mkdir(parents=True, exist_ok=True)
+        restored, complete = 0, True
+        with open(container, 'rb') as handle:
+            for name, member in index["members"].items():
+                target = destination / name
+                try:
+                    with open(target, 'xb') as out:
+                        handle.seek(member["offset"])
+                        out.write(handle.read(member["size"]))
+                except OSError as e:
+                    print(f"🚫 Could not restore {target}: {e}")
+                    complete = False
+                    continue
+                os.chmod(target, member["mode"])
+                os.utime(target, (member["mtime"], member["mtime"]))
+                restored += 1
+        if remove and complete:
+            os.remove(container)
+            os.remove(self.index_path(container))
+        return restored
+
+    @classmethod
+    def find_containers(cls, directory: str) -> List[str]:
+        """
+        🧭 Find Every Satchel Under a Directory
+
+        Args:
+            directory (str): Where to look
+
+        Returns:
+            List[str]: The satchels' paths, sorted
+        """
+        found = []
+        for parent, _, names in os.walk(directory):
+            found.extend(os.path.join(parent, name) for name in names
+                         if cls.is_artifact(name) and not name.endswith(cls.INDEX_SUFFIX))
+        return sorted(found)
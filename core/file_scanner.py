@@ -1,6 +1,10 @@
+import os
 from pathlib import Path
 import hashlib
-from typing import List, Dict, Generator
+from typing import List, Dict, Generator, Iterable, Callable, Optional
+
+from core.merkle_tree import MerkleTree
+from core.scan_frontier import ScanFrontier
 
 
 class FileScanner:
@@ -13,10 +17,31 @@ class FileScanner:
 
     Attributes:
         root_directory (Path): The starting point of our grand expedition
-        scanned_files (List[Dict]): A treasure chest of file information
+        scanned_files (List[Dict]): A treasure chest of file information, empty unless ``keep_records``
+        scanned_count (int): How many files the scan has yielded
+        keep_records (bool): Whether every yielded record is kept in ``scanned_files``
+        hash_scheduler (HashScheduler): Optional lanes that fingerprint files for us
+        io_orderer (IOOrderer): Optional sorter that puts files into on-disk order before reading
+        cache_policy (PageCachePolicy): Optional page-cache hints for the fingerprint spell
+        skip_directory (Callable): Optional judge of which subtrees to leave unexplored
+        governor (IOGovernor): Optional floodgate keeper for fingerprint reads
+        checkpoint (ScanCheckpoint): Optional bookmark that lets an interrupted walk resume
+        known_fingerprints (Dict): Optional path -> (size, modified, fingerprint) memory of earlier scans
+        fingerprint (bool): Whether the scan reads every file for its fingerprint
+        merkle (bool): Whether the walk notes directory modification times for ``merkle_tree``
+        previous_tree (MerkleTree): Optional manifest of an earlier scan whose unchanged directories are reused
+        directory_mtimes (Dict[str, float]): Modification time of every directory the walk listed
+        reused_directories (int): Directories taken from ``previous_tree`` instead of being listed
+        budget (ScanBudget): Optional hourglass; once it runs out the walk stops between directories
+        priority (str): Which waiting subtrees the walk explores first: 'walk', 'recent' or 'largest'
+        pending_directories (List[str]): Subtrees left unexplored when the budget ran out, next one first
     """
 
-    def __init__(self, root_directory: str):
+    def __init__(self, root_directory: str, hash_scheduler=None, io_orderer=None, cache_policy=None,
+                 skip_directory: Optional[Callable[[Path], bool]] = None, governor=None, checkpoint=None,
+                 resume: bool = False, known_fingerprints: Optional[Dict[str, tuple]] = None,
+                 fingerprint: bool = False, merkle: bool = False, previous_tree: Optional[MerkleTree] = None,
+                 budget=None, priority: str = "walk", keep_records: bool = True):
         """
         🎭 Summon the FileScanner into existence!
 
@@ -25,9 +50,35 @@ class FileScanner:
 
         Args:
             root_directory (str): The realm you want to explore
+            hash_scheduler (HashScheduler, optional): Lanes that fingerprint files out of walk order
+            io_orderer (IOOrderer, optional): Sorts files into on-disk order before fingerprinting
+            cache_policy (PageCachePolicy, optional): Page-cache hints used while fingerprinting
+            skip_directory (Callable, optional): Returns True for directories that must not be entered
+            governor (IOGovernor, optional): Throttles the reads of the fingerprint spell
+            checkpoint (ScanCheckpoint, optional): Saves the walk's progress every few seconds
+            resume (bool): Continue from the checkpoint's last saved position instead of starting over
+            known_fingerprints (Dict, optional): Fingerprints from earlier scans, reused for files whose
+                size and modification time are unchanged
+            fingerprint (bool): Read every file for its fingerprint during the scan. Off by default:
+                records then carry ``fingerprint=None`` and are found at walk speed, and consumers
+                needing contents call ``fingerprint_records``. Hiring a HashScheduler or an
+                IOOrderer turns it on, as they exist only to fingerprint.
+            merkle (bool): Walk directory by directory, noting what ``merkle_tree`` needs
+            previous_tree (MerkleTree, optional): An earlier scan's manifest of this realm. Directories
+                whose modification time is unchanged are not listed again: their files are taken
+                from the manifest (subdirectories are still visited). Edits that leave a
+                directory's modification time alone, such as rewriting a file in place, go unseen.
+            budget (ScanBudget, optional): Hourglass of the quest. It is asked before each directory,
+                so every directory is either scanned whole or left pending with its subtree.
+            priority (str): 'walk' explores depth first in name order; 'recent' and 'largest'
+                explore the newest or the biggest waiting directories first (see ScanFrontier)
+            keep_records (bool): Keep every yielded record in ``scanned_files``. Streaming consumers
+                turn it off so the scanner holds no records at all; ``merkle_tree`` then grows its
+                tree from the records as they pass instead.
 
         Raises:
-            ValueError: If the chosen realm doesn't exist or isn't a proper kingdom (directory)
+            ValueError: If the chosen realm doesn't exist or isn't a proper kingdom (directory),
+                or the priority is unknown
         """
         self.root_directory = Path(root_directory)
         if not self.root_directory.exists():
@@ -35,6 +86,28 @@ class FileScanner:
         if not self.root_directory.is_dir():
             raise ValueError(f"📜 This is but a scroll, not a grand kingdom: {root_directory}")
         self.scanned_files: List[Dict] = []
+        self.scanned_count = 0
+        self.keep_records = keep_records
+        self.hash_scheduler = hash_scheduler
+        self.io_orderer = io_orderer
+        self.cache_policy = cache_policy
+        self.skip_directory = skip_directory
+        self.governor = governor
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.known_fingerprints = known_fingerprints
+        self.fingerprint = fingerprint or hash_scheduler is not None or io_orderer is not None
+        self.merkle = merkle or previous_tree is not None
+        if previous_tree is not None and previous_tree.root != os.path.abspath(root_directory):
+            raise ValueError(f"🌳 This manifest describes another realm: {previous_tree.root}")
+        self.previous_tree = previous_tree
+        self.directory_mtimes: Dict[str, float] = {}
+        self.reused_directories = 0
+        ScanFrontier(priority)  # Refuse an unknown priority before the expedition starts
+        self.budget = budget
+        self.priority = priority
+        self.pending_directories: List[str] = []
+        self._growing_tree = MerkleTree(root_directory) if self.merkle and not keep_records else None
 
     def scan(self) -> Generator[Dict, None, None]:
         """
@@ -44,18 +117,61 @@ class FileScanner:
         uncovering the secrets of each file it finds. It's like a magical
         creature that can sniff out files!
 
+        Unless fingerprinting was asked for, no file is ever opened: only the
+        directory listings and one ``stat`` per file are read.
+
+        When a HashScheduler has been hired, files are first discovered without
+        being read and then handed to the scheduler's lanes for fingerprinting,
+        so they may come back in a different order than they were found. An
+        IOOrderer likewise holds files back until it can release them in the
+        order their data lies on disk.
+
         Yields:
             Dict: Mystical knowledge about each discovered file
         """
         print(f"🚀 Launching expedition into: {self.root_directory}")  # Expedition log
+        deferred = self.hash_scheduler is not None or self.io_orderer is not None
+        discovered = self._discover_files(fingerprint=self.fingerprint and not deferred)
+        if self.io_orderer is not None:
+            discovered = self.io_orderer.order(discovered)
+        if self.hash_scheduler is not None:
+            discovered = self.hash_scheduler.fingerprint_records(discovered, ordered=self.io_orderer is not None,
+                                                                 seal=self._seal)
+        elif deferred:
+            discovered = self.fingerprint_records(discovered)
+        try:
+            for metadata in discovered:
+                self.scanned_count += 1
+                if self.keep_records:
+                    self.scanned_files.append(metadata)
+                elif self._growing_tree is not None:
+                    self._growing_tree.add_records([metadata])
+                yield metadata
+        finally:
+            # Abandoning the expedition lets the walk save its checkpoint right away
+            discovered.close()
+        print(f"📊 Treasure count: {self.scanned_count}")  # Expedition summary
+
+    def _discover_files(self, fingerprint: bool = True) -> Generator[Dict, None, None]:
+        """
+        🧭 Walk the Realm and Note Down Every File
+
+        Args:
+            fingerprint (bool): Whether to read each file and seal it with a fingerprint
+
+        Yields:
+            Dict: Mystical knowledge about each discovered file
+        """
+        if (self.skip_directory is not None or self.checkpoint is not None or self.merkle
+                or self.budget is not None or self.priority != "walk"):
+            yield from self._walk_directories(fingerprint)
+            return
         try:
             for item in self.root_directory.rglob('*'):
                 print(f"👀 Spotted: {item}")  # Expedition log
                 if item.is_file():
                     try:
-                        metadata = self._get_file_metadata(item)
-                        self.scanned_files.append(metadata)
-                        yield metadata
+                        yield self._get_file_metadata(item, fingerprint)
                     except PermissionError:
                         print(f"🚫 The guards won't let us near: {item}")
                     except Exception as e:
@@ -64,9 +180,200 @@ class FileScanner:
             print(f"🚫 We've been banished from: {self.root_directory}")
         except Exception as e:
             print(f"🌪️ A magical storm has interrupted our expedition: {str(e)}")
-        print(f"📊 Treasure count: {len(self.scanned_files)}")  # Expedition summary
 
-    def _get_file_metadata(self, file_path: Path) -> Dict:
+    def _walk_directories(self, fingerprint: bool) -> Generator[Dict, None, None]:
+        """
+        🪓 Walk the Realm Directory by Directory, Pruning Forbidden Subtrees
+
+        Unlike ``rglob``, this walk decides at every directory whether to enter
+        it at all, so whole subtrees can be left out without listing them.
+
+        With a checkpoint, each finished directory's records are noted down
+        before they are handed on, and the frontier is saved every few
+        seconds. A resumed walk first replays the saved records, then carries
+        on from the saved frontier. If the walk is abandoned midway (a crash
+        in the caller, a Ctrl-C), a last save is made on the way out.
+
+        With an earlier manifest, a directory whose modification time is
+        unchanged is not listed: its files come from the manifest.
+
+        With a budget, the walk stops before the next directory once the
+        budget has run out; the directories still waiting are kept in
+        ``pending_directories`` (and in the checkpoint, for ``resume``).
+
+        Args:
+            fingerprint (bool): Whether to read each file and seal it with a fingerprint
+
+        Yields:
+            Dict: Mystical knowledge about each discovered file
+        """
+        frontier = ScanFrontier(self.priority)
+        frontier.add([str(self.root_directory)])
+        completed, state = 0, None
+        if self.checkpoint is not None:
+            state = self.checkpoint.load(str(self.root_directory)) if self.resume else None
+            if state is not None:
+                print(f"🔖 Resuming after {state['completed_directories']} explored directories, "
+                      f"{len(state['frontier'])} still waiting")
+                frontier.restore(state['frontier'])
+                completed = state['completed_directories']
+            self.checkpoint.start(state)
+        if self.budget is not None:
+            self.budget.start()
+        self.pending_directories = []
+
+        try:
+            if state is not None:
+                yield from self.checkpoint.restored_records(state)
+            while frontier:
+                if self.budget is not None and self.budget.exhausted:
+                    self.pending_directories = frontier.pending()
+                    print(f"⌛ Out of time: {len(self.pending_directories)} subtrees left for the next run")
+                    break
+                directory = frontier.peek()
+                remembered = self._remembered_directory(directory) if self.merkle else None
+                entries = []
+                if remembered is None:
+                    try:
+                        with os.scandir(directory) as listing:
+                            entries = sorted(listing, key=lambda entry: entry.name)
+                    except PermissionError:
+                        print(f"🚫 We've been banished from: {directory}")
+                    except OSError as e:
+                        print(f"🌪️ A magical storm has interrupted our expedition at {directory}: {str(e)}")
+
+                records, subdirectories = [], []
+                if remembered is not None:
+                    records = self.previous_tree.records_in(directory, remembered)
+                    if fingerprint:
+                        for record in records:
+                            if record['fingerprint'] is None:
+                                record['fingerprint'] = self._seal(record['path'], record['size'],
+                                                                   record['modified'])
+                    for name in remembered['dirs']:
+                        path = os.path.join(directory, name)
+                        if self.skip_directory is not None and self.skip_directory(Path(path)):
+                            print(f"⏭️ Leaving this tidy land alone: {path}")
+                        else:
+                            subdirectories.append(path)
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.skip_directory is not None and self.skip_directory(Path(entry.path)):
+                                print(f"⏭️ Leaving this tidy land alone: {entry.path}")
+                            else:
+                                subdirectories.append(entry.path)
+                        elif entry.is_file():
+                            records.append(self._get_file_metadata(Path(entry.path), fingerprint))
+                    except PermissionError:
+                        print(f"🚫 The guards won't let us near: {entry.path}")
+                    except Exception as e:
+                        print(f"🌋 Encountered a magical barrier at {entry.path}: {str(e)}")
+
+                # The directory leaves the frontier only once it is fully listed
+                frontier.pop()
+                frontier.add(subdirectories)
+                completed += 1
+                if self.budget is not None:
+                    self.budget.charge(1 + len(records))
+                if self.checkpoint is not None:
+                    self.checkpoint.append(records)
+                    self.checkpoint.maybe_save(str(self.root_directory), frontier.snapshot(), completed)
+                yield from records
+        finally:
+            if self.checkpoint is not None and not frontier:
+                # Nothing is left to resume
+                self.checkpoint.clear()
+            elif self.checkpoint is not None:
+                self.checkpoint.maybe_save(str(self.root_directory), frontier.snapshot(), completed, force=True)
+                self.checkpoint.close()
+            if self.reused_directories:
+                print(f"🌳 {self.reused_directories} unchanged directories taken from the manifest")
+
+    def _remembered_directory(self, directory: str) -> Optional[Dict]:
+        """
+        🕰️ Note a Directory's Modification Time and Find It in the Earlier Manifest
+
+        Args:
+            directory (str): The directory about to be listed
+
+        Returns:
+            Dict: The manifest's entry if the directory is unchanged since, otherwise None
+        """
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return None
+        self.directory_mtimes[directory] = mtime
+        remembered = self.previous_tree.unchanged(directory, mtime) if self.previous_tree is not None else None
+        if remembered is not None:
+            self.reused_directories += 1
+        return remembered
+
+    def merkle_tree(self) -> MerkleTree:
+        """
+        🌳 Seal the Scanned Realm Into a Tree of Directory Digests
+
+        Call it once, after the scan; directories the walk did not list
+        (restored from a checkpoint, say) are asked for their modification time.
+
+        Returns:
+            MerkleTree: The tree of everything scanned
+
+        Raises:
+            ValueError: If the scanner kept no records and was not asked to note them for a tree
+        """
+        if self._growing_tree is not None:
+            self._growing_tree.finish(self.directory_mtimes)
+            return self._growing_tree
+        if not self.keep_records:
+            raise ValueError("🌳 This scanner kept no records to grow a tree from; ask it for merkle=True")
+        return MerkleTree.build(str(self.root_directory), self.scanned_files, self.directory_mtimes)
+
+    def fingerprint_records(self, records: Iterable[Dict]) -> Generator[Dict, None, None]:
+        """
+        🖐️ Fingerprint Records on Demand, for Consumers That Need Contents
+
+        Records that already carry a fingerprint are passed through untouched,
+        and remembered fingerprints are reused for unchanged files, so asking
+        twice never reads a file twice.
+
+        Args:
+            records (Iterable[Dict]): Scanner records, with or without a fingerprint
+
+        Yields:
+            Dict: The same records, each carrying a 'fingerprint'
+        """
+        for record in records:
+            if record.get('fingerprint') is None:
+                record['fingerprint'] = self._seal(record['path'], record['size'], record['modified'])
+            yield record
+
+    def _seal(self, path, size: int, modified: float, chunk_size: int = 65536,
+              fingerprint: Optional[Callable] = None) -> str:
+        """
+        🔏 Fingerprint One File, Unless an Earlier Scan Already Did and It Is Unchanged
+
+        Args:
+            path (str or Path): The file
+            size (int): Its current size
+            modified (float): Its current modification time
+            chunk_size (int): How many bytes to read in each gulp
+            fingerprint (Callable, optional): Another spell taking (path, chunk_size), such as a
+                HashScheduler lane's
+
+        Returns:
+            str: The file's fingerprint
+        """
+        known = self.known_fingerprints.get(str(path)) if self.known_fingerprints else None
+        if known is not None and known[0] == size and known[1] == modified:
+            return known[2]  # Unchanged since an earlier scan, no need to read it again
+        if fingerprint is not None:
+            return fingerprint(Path(path), chunk_size)
+        return self._generate_file_fingerprint(path, chunk_size, cache_policy=self.cache_policy,
+                                               governor=self.governor)
+
+    def _get_file_metadata(self, file_path: Path, fingerprint: bool = True) -> Dict:
         """
         🔮 Uncover the Secrets of a Single File
 
@@ -75,22 +382,28 @@ class FileScanner:
 
         Args:
             file_path (Path): The location of the file to examine
+            fingerprint (bool): Whether to read the file for its fingerprint now
 
         Returns:
             Dict: A scroll containing all the file's secrets
         """
+        stat = file_path.stat()
+        seal = self._seal(file_path, stat.st_size, stat.st_mtime) if fingerprint else None
         return {
             'path': str(file_path),
             'name': file_path.name,
             'extension': file_path.suffix,
-            'size': file_path.stat().st_size,
-            'created': file_path.stat().st_ctime,
-            'modified': file_path.stat().st_mtime,
-            'fingerprint': self._generate_file_fingerprint(file_path)
+            'size': stat.st_size,
+            'created': stat.st_ctime,
+            'modified': stat.st_mtime,
+            'inode': stat.st_ino,
+            'device': stat.st_dev,
+            'fingerprint': seal
         }
 
     @staticmethod
-    def _generate_file_fingerprint(file_path: Path) -> str:
+    def _generate_file_fingerprint(file_path: Path, chunk_size: int = 65536, cache_policy=None,
+                                   governor=None) -> str:
         """
         🖐️ Create a Unique Magical Signature for Each File
 
@@ -99,6 +412,9 @@ class FileScanner:
 
         Args:
             file_path (Path): The file to fingerprint
+            chunk_size (int): How many bytes to read in each gulp
+            cache_policy (PageCachePolicy, optional): Hints for the kernel's page cache while reading
+            governor (IOGovernor, optional): Floodgate keeper every read must pass
 
         Returns:
             str: A hex string representing the file's unique magical signature
@@ -106,10 +422,20 @@ class FileScanner:
         hasher = hashlib.md5()
         try:
             with open(file_path, 'rb') as file:
-                buf = file.read(65536)
-                while len(buf) > 0:
-                    hasher.update(buf)
-                    buf = file.read(65536)
+                fd = file.fileno() if cache_policy is not None else None
+                next_hint = cache_policy.begin(fd) if cache_policy is not None else 0
+                position = 0
+                try:
+                    buf = FileScanner._read_chunk(file, chunk_size, governor)
+                    while len(buf) > 0:
+                        hasher.update(buf)
+                        if cache_policy is not None:
+                            position += len(buf)
+                            next_hint = cache_policy.advance(fd, position, next_hint)
+                        buf = FileScanner._read_chunk(file, chunk_size, governor)
+                finally:
+                    if cache_policy is not None:
+                        cache_policy.end(fd)
             return hasher.hexdigest()
         except PermissionError:
             print(f"🚫 This file is protected by powerful wards: {file_path}")
@@ -117,3 +443,21 @@ class FileScanner:
         except Exception as e:
             print(f"💥 Magic backfired while fingerprinting {file_path}: {str(e)}")
             return "Error"
+
+    @staticmethod
+    def _read_chunk(file, chunk_size: int, governor=None) -> bytes:
+        """
+        🥄 Read One Gulp, Asking the Floodgate Keeper First If There Is One
+
+        Args:
+            file: The open file
+            chunk_size (int): How many bytes to read
+            governor (IOGovernor, optional): Floodgate keeper of the disks
+
+        Returns:
+            bytes: The gulp, empty at the end of the file
+        """
+        if governor is None:
+            return file.read(chunk_size)
+        with governor.operation(chunk_size):
+            return file.read(chunk_size)
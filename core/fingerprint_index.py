@@ -0,0 +1,227 @@
+import heapq
+import itertools
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Generator, List, Tuple
+
+import numpy as np
+
+
+class FingerprintIndex:
+    """
+    🗝️ The FingerprintIndex: A Compact, Sorted Ledger of Fingerprints to Share 📇
+
+    Each host exports the fingerprints of its scan into one small binary
+    file; any number of these files can then be merged to find files that
+    exist more than once, across roots and hosts, with no service running.
+
+    The file holds, in this order:
+
+    - 🏷️ a header: magic, version, entry count, where the path table
+      starts, and a label naming the host and root it came from
+    - 📇 fixed 32-byte entries sorted by (digest, size): the 16-byte binary
+      digest, the size and the offset of the path in the path table
+    - 📜 the path table, length-prefixed UTF-8 paths in entry order
+
+    Because paths follow entry order, reading an index front to back needs
+    just two sequential streams, and a merge of many indexes holds only one
+    buffer per index plus the duplicate set it is looking at, however many
+    billions of entries flow through.
+
+    Attributes:
+        path (str): The index file
+        label (str): The host and root the index was exported from
+        count (int): How many entries it holds
+    """
+
+    MAGIC = b"WZFPIDX\0"
+    VERSION = 1
+    HEADER = struct.Struct('>8sHHQQI')  # magic, version, reserved, entries, path table offset, label length
+    ENTRY = struct.Struct('>16sQQ')  # digest, size, path offset
+    PATH_LENGTH = struct.Struct('>I')
+    ENTRIES_PER_READ = 4096
+
+    def __init__(self, path: str):
+        """
+        🎭 Summon a FingerprintIndex by Opening an Exported File
+
+        Args:
+            path (str): The index file
+
+        Raises:
+            ValueError: If the file is not an index this version understands
+        """
+        self.path = path
+        with open(path, 'rb') as handle:
+            header = handle.read(self.HEADER.size)
+            if len(header) < self.HEADER.size:
+                raise ValueError(f"🗝️ Not a fingerprint index: {path}")
+            magic, version, _, self.count, self.path_table_offset, label_length = self.HEADER.unpack(header)
+            if magic != self.MAGIC:
+                raise ValueError(f"🗝️ Not a fingerprint index: {path}")
+            if version != self.VERSION:
+                raise ValueError(f"🗝️ Fingerprint index version {version} is not understood: {path}")
+            self.label = handle.read(label_length).decode('utf-8', 'surrogateescape')
+        self.entries_offset = self.HEADER.size + label_length
+
+    @classmethod
+    def write(cls, path: str, entries: List[Tuple[bytes, int, str]], label: str) -> int:
+        """
+        ✍️ Write Sorted Entries as an Index File, Replacing Any Earlier One Atomically
+
+        Args:
+            path (str): Where to write the index
+            entries (List[Tuple[bytes, int, str]]): (16-byte digest, size, path), already
+                sorted by digest and size
+            label (str): The host and root the entries come from
+
+        Returns:
+            int: The number of entries written
+        """
+        encoded_label = label.encode('utf-8', 'surrogateescape')
+        count = len(entries)
+        entries_offset = cls.HEADER.size + len(encoded_label)
+        path_table_offset = entries_offset + count * cls.ENTRY.size
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as handle:
+            handle.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, count, path_table_offset, len(encoded_label)))
+            handle.write(encoded_label)
+            offset = 0
+            for digest, size, file_path in entries:
+                handle.write(cls.ENTRY.pack(digest, size, offset))
+                offset += cls.PATH_LENGTH.size + len(file_path.encode('utf-8', 'surrogateescape'))
+            for _, _, file_path in entries:
+                encoded = file_path.encode('utf-8', 'surrogateescape')
+                handle.write(cls.PATH_LENGTH.pack(len(encoded)))
+                handle.write(encoded)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
+        return count
+
+    @classmethod
+    def from_catalog(cls, catalog, path: str, label: str, fingerprinter=None) -> int:
+        """
+        📇 Export Every Fingerprinted Row of a ScanCatalog as an Index
+
+        Rows the scan left without a fingerprint are fingerprinted on demand
+        by the ``fingerprinter``, if there is one and the file is unchanged
+        since the scan. Rows still without a proper fingerprint (no
+        fingerprinter, changed since, or unreadable) are left out.
+
+        Args:
+            catalog (ScanCatalog): The catalog of a scan
+            path (str): Where to write the index
+            label (str): The host and root the catalog describes
+            fingerprinter (Callable, optional): Takes scanner records and yields them fingerprinted,
+                like ``FileScanner.fingerprint_records``
+
+        Returns:
+            int: The number of entries written
+        """
+        fingerprints = catalog.fingerprints
+        hexadecimal = np.char.str_len(fingerprints) == 32
+        rows = np.flatnonzero(hexadecimal)
+        # Lower-case hex sorts exactly like the binary digests it spells
+        rows = rows[np.lexsort((catalog.sizes[rows], fingerprints[rows]))]
+        entries = []
+        for row in rows:
+            try:
+                digest = bytes.fromhex(fingerprints[row].decode('ascii'))
+            except ValueError:
+                continue
+            entries.append((digest, int(catalog.sizes[row]), catalog.paths[row]))
+        if fingerprinter is not None:
+            unread = cls._unchanged_records(catalog, np.flatnonzero(fingerprints == b''))
+            for record in fingerprinter(unread):
+                try:
+                    entries.append((bytes.fromhex(record['fingerprint']), record['size'], record['path']))
+                except ValueError:
+                    continue  # Unreadable files answer with a word, not a digest
+            entries.sort(key=lambda entry: entry[:2])
+        return cls.write(path, entries, label)
+
+    @staticmethod
+    def _unchanged_records(catalog, rows) -> Generator[Dict, None, None]:
+        """
+        🔍 Turn Catalog Rows Back Into Records, Skipping Files Changed Since the Scan
+
+        Args:
+            catalog (ScanCatalog): The catalog of a scan
+            rows (np.ndarray): The rows to turn back
+
+        Yields:
+            Dict: A record with 'path', 'size', 'modified' and no 'fingerprint'
+        """
+        for row in rows:
+            record = {'path': catalog.paths[row], 'size': int(catalog.sizes[row]),
+                      'modified': float(catalog.modified[row]), 'fingerprint': None}
+            try:
+                stat = os.stat(record['path'])
+            except OSError:
+                continue
+            if stat.st_size == record['size'] and stat.st_mtime == record['modified']:
+                yield record
+
+    def __len__(self) -> int:
+        return self.count
+
+    def entries(self) -> Generator[Tuple[bytes, int, str], None, None]:
+        """
+        📖 Stream the Entries in Order, With Their Paths
+
+        Yields:
+            Tuple[bytes, int, str]: (16-byte digest, size, path)
+        """
+        with open(self.path, 'rb') as table, open(self.path, 'rb', buffering=1 << 20) as paths:
+            table.seek(self.entries_offset)
+            paths.seek(self.path_table_offset)
+            remaining = self.count
+            while remaining:
+                batch = min(remaining, self.ENTRIES_PER_READ)
+                chunk = table.read(batch * self.ENTRY.size)
+                if len(chunk) < batch * self.ENTRY.size:
+                    raise ValueError(f"🗝️ Fingerprint index is cut short: {self.path}")
+                for digest, size, _ in self.ENTRY.iter_unpack(chunk):
+                    length, = self.PATH_LENGTH.unpack(paths.read(self.PATH_LENGTH.size))
+                    yield digest, size, paths.read(length).decode('utf-8', 'surrogateescape')
+                remaining -= batch
+
+    @staticmethod
+    def _tagged(index: 'FingerprintIndex', source: int) -> Generator[Tuple[bytes, int, int, str], None, None]:
+        for digest, size, file_path in index.entries():
+            yield digest, size, source, file_path
+
+    @classmethod
+    def merge(cls, index_paths: List[str], min_size: int = 1,
+              cross_root_only: bool = False) -> Generator[Dict, None, None]:
+        """
+        🔀 K-Way Merge Many Indexes Into Sets of Duplicate Files, in One Streaming Pass
+
+        Args:
+            index_paths (List[str]): The index files to merge
+            min_size (int): Ignore files smaller than this (empty files are all alike)
+            cross_root_only (bool): Only report sets spanning more than one index
+
+        Yields:
+            Dict: A duplicate set: 'fingerprint', 'size' and its 'members', each with the
+            'index' label and 'path'
+        """
+        indexes = [cls(path) for path in index_paths]
+        merged = heapq.merge(*(cls._tagged(index, source) for source, index in enumerate(indexes)))
+        for (digest, size), group in itertools.groupby(merged, key=lambda entry: (entry[0], entry[1])):
+            if size < min_size:
+                continue
+            members = [(source, file_path) for _, _, source, file_path in group]
+            if len(members) < 2:
+                continue
+            if cross_root_only and len({source for source, _ in members}) < 2:
+                continue
+            yield {
+                "fingerprint": digest.hex(),
+                "size": size,
+                "members": [{"index": indexes[source].label, "path": file_path} for source, file_path in members],
+            }
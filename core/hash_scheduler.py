@@ -0,0 +1,144 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Callable, Dict, Generator, Iterable, List, Optional
+
+from core.file_scanner import FileScanner
+
+
+class HashScheduler:
+    """
+    🚦 The HashScheduler: Traffic Warden of the Fingerprint Highway 🛣️
+
+    Handing files to the fingerprint spell in the order they were found means a
+    single giant scroll can block thousands of tiny ones waiting behind it.
+    This warden splits the traffic into two lanes:
+
+    - 🐇 The small-file lane bundles many little files into one batch per
+      worker, so the cost of opening and closing files is shared out.
+    - 🐘 The large-file lane reads giants with a bigger buffer and only a few
+      at a time, so the disk's read head isn't torn between many streams.
+
+    Files sorted into on-disk order (by an IOOrderer) can be fingerprinted
+    ``ordered``: each lane then reads its own files strictly in the order
+    given, one at a time, so the sweep across the platter survives within
+    each lane. The two lanes remain two sweeps, one over the little files
+    and one over the giants, running side by side.
+
+    Attributes:
+        large_file_threshold (int): Files at least this many bytes take the large lane
+        small_workers (int): Workers serving the small-file lane
+        large_workers (int): Workers (concurrent streams) serving the large-file lane
+        small_batch_size (int): Maximum files in one small-file batch
+        small_batch_bytes (int): Maximum total bytes in one small-file batch
+        small_buffer_size (int): Read size for small files
+        large_buffer_size (int): Read size for large files
+    """
+
+    def __init__(self, large_file_threshold: int = 64 * 1024 * 1024, small_workers: int = 4,
+                 large_workers: int = 1, small_batch_size: int = 64, small_batch_bytes: int = 16 * 1024 * 1024,
+                 small_buffer_size: int = 65536, large_buffer_size: int = 4 * 1024 * 1024,
+                 cache_policy=None, governor=None, fingerprint: Optional[Callable] = None):
+        """
+        🎭 Summon the HashScheduler into existence!
+
+        Args:
+            large_file_threshold (int): Size in bytes from which a file takes the large lane
+            small_workers (int): Workers serving the small-file lane
+            large_workers (int): Concurrent streams allowed in the large-file lane
+            small_batch_size (int): Maximum files bundled into one small-file batch
+            small_batch_bytes (int): Maximum bytes bundled into one small-file batch
+            small_buffer_size (int): Read size used for small files
+            large_buffer_size (int): Read size used for large files
+            cache_policy (PageCachePolicy, optional): Page-cache hints used by the default fingerprint spell
+            governor (IOGovernor, optional): Floodgate keeper shared by all lanes
+            fingerprint (Callable, optional): Spell taking (path, chunk_size) and returning a fingerprint
+
+        Raises:
+            ValueError: If a lane is given no workers or a batch can hold no files
+        """
+        if small_workers < 1 or large_workers < 1:
+            raise ValueError("🚧 Every lane needs at least one worker")
+        if small_batch_size < 1:
+            raise ValueError("🚧 A small-file batch must hold at least one file")
+        self.large_file_threshold = large_file_threshold
+        self.small_workers = small_workers
+        self.large_workers = large_workers
+        self.small_batch_size = small_batch_size
+        self.small_batch_bytes = small_batch_bytes
+        self.small_buffer_size = small_buffer_size
+        self.large_buffer_size = large_buffer_size
+        self.fingerprint = fingerprint or functools.partial(FileScanner._generate_file_fingerprint,
+                                                            cache_policy=cache_policy, governor=governor)
+
+    def fingerprint_records(self, records: Iterable[Dict], ordered: bool = False,
+                            seal: Optional[Callable] = None) -> Generator[Dict, None, None]:
+        """
+        🛣️ Route Every File Into Its Lane and Fingerprint It
+
+        Records are consumed lazily and only a bounded number of batches are in
+        flight at once, so even an endless stream of files needs little memory.
+        Records are yielded as soon as their lane finishes them. Records that
+        already carry a fingerprint (reused from a manifest, say) are not read.
+
+        Args:
+            records (Iterable[Dict]): Scanner records whose 'fingerprint' is still missing
+            ordered (bool): Read each lane's files in the given order, with a single worker per lane
+            seal (Callable, optional): The scanner's ``_seal``, taking (path, size, modified, chunk size,
+                fingerprint spell), so fingerprints it remembers for unchanged files are reused
+
+        Yields:
+            Dict: The same records, now carrying a 'fingerprint'
+        """
+        # Concurrent workers would interleave their reads and undo the order given
+        small_workers, large_workers = (1, 1) if ordered else (self.small_workers, self.large_workers)
+        max_in_flight = 2 * (small_workers + large_workers)
+        with ThreadPoolExecutor(max_workers=small_workers, thread_name_prefix="small-lane") as small_lane, \
+                ThreadPoolExecutor(max_workers=large_workers, thread_name_prefix="large-lane") as large_lane:
+            in_flight = set()
+            batch: List[Dict] = []
+            batch_bytes = 0
+
+            for record in records:
+                if record['size'] >= self.large_file_threshold:
+                    in_flight.add(large_lane.submit(self._hash_batch, [record], self.large_buffer_size, seal))
+                else:
+                    batch.append(record)
+                    batch_bytes += record['size']
+                    if len(batch) >= self.small_batch_size or batch_bytes >= self.small_batch_bytes:
+                        in_flight.add(small_lane.submit(self._hash_batch, batch, self.small_buffer_size, seal))
+                        batch, batch_bytes = [], 0
+
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+
+            if batch:
+                in_flight.add(small_lane.submit(self._hash_batch, batch, self.small_buffer_size, seal))
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+    def _hash_batch(self, batch: List[Dict], chunk_size: int, seal: Optional[Callable] = None) -> List[Dict]:
+        """
+        🖐️ Fingerprint One Batch of Files Inside a Lane Worker
+
+        Args:
+            batch (List[Dict]): The records to fingerprint
+            chunk_size (int): The read size for this lane
+            seal (Callable, optional): The scanner's ``_seal``, reusing fingerprints it remembers
+
+        Returns:
+            List[Dict]: The records, each with its 'fingerprint' filled in
+        """
+        for record in batch:
+            if record.get('fingerprint') is not None:
+                continue
+            if seal is None:
+                record['fingerprint'] = self.fingerprint(Path(record['path']), chunk_size)
+            else:
+                record['fingerprint'] = seal(record['path'], record['size'], record['modified'], chunk_size,
+                                             self.fingerprint)
+        return batch
@@ -0,0 +1,186 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+
+class IOGovernor:
+    """
+    🚰 The IOGovernor: Keeper of the Disk's Floodgates 🌊
+
+    Left alone, the fingerprint spell and the file fairies read and move as
+    fast as the disks allow, drowning every other workload on the volume. The
+    governor hands out two kinds of tokens from leaky buckets, bytes and
+    operations, refilled at a configurable rate. Whoever wants to read or move
+    must first take enough tokens, and waits when the bucket runs dry.
+
+    Three refinements make the flow predictable rather than just slow:
+
+    - 🕰️ Time-of-day schedules swap in different ceilings, e.g. gentle during
+      business hours and unlimited at night.
+    - 🐢 Observed latency is tracked as a moving average; when it climbs past
+      the target the ceilings are lowered, and they recover slowly once the
+      disks breathe again. Backoff only tightens ceilings that exist.
+    - 🤝 One governor may be shared by the scanner, the hash lanes and the
+      action engine; it is thread-safe and sleeps outside its lock.
+
+    Attributes:
+        max_bytes_per_second (float): Default byte ceiling, None for unlimited
+        max_ops_per_second (float): Default operation ceiling, None for unlimited
+        schedule (List[Tuple]): (start minute, end minute, bytes/s, ops/s) windows
+        latency_target (float): Seconds per operation above which we back off, None to disable
+        backoff_factor (float): Current multiplier applied to the ceilings (0 < f <= 1)
+    """
+
+    MIN_BACKOFF = 0.05
+    _SMOOTHING = 0.2
+
+    def __init__(self, max_bytes_per_second: Optional[float] = None, max_ops_per_second: Optional[float] = None,
+                 schedule: Optional[List[Tuple[int, int, Optional[float], Optional[float]]]] = None,
+                 latency_target: Optional[float] = None, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep, wall_clock: Callable[[], datetime] = datetime.now):
+        """
+        🎭 Summon the IOGovernor into existence!
+
+        Args:
+            max_bytes_per_second (float, optional): Byte ceiling outside scheduled windows
+            max_ops_per_second (float, optional): Operation ceiling outside scheduled windows
+            schedule (List[Tuple], optional): Windows as (start minute, end minute, bytes/s, ops/s),
+                minutes counted from midnight; a window may wrap past midnight
+            latency_target (float, optional): Seconds per operation that triggers backoff
+            clock (Callable): Monotonic clock, replaceable for tests
+            sleep (Callable): Sleeping spell, replaceable for tests
+            wall_clock (Callable): Source of the time of day, replaceable for tests
+        """
+        self.max_bytes_per_second = max_bytes_per_second
+        self.max_ops_per_second = max_ops_per_second
+        self.schedule = list(schedule or [])
+        self.latency_target = latency_target
+        self.backoff_factor = 1.0
+        self._clock = clock
+        self._sleep = sleep
+        self._wall_clock = wall_clock
+        self._lock = threading.Lock()
+        # Buckets start full; min() against the ceiling trims them on first use
+        self._byte_tokens = float('inf')
+        self._op_tokens = float('inf')
+        self._last_refill = clock()
+        self._latency_average = None
+
+    @classmethod
+    def parse_schedule(cls, text: str) -> List[Tuple[int, int, Optional[float], Optional[float]]]:
+        """
+        🕰️ Read a Schedule Like ``08:00-18:00=20/200,18:00-08:00=-/-``
+
+        Each window gives MB/s and operations/s ceilings; ``-`` means unlimited.
+
+        Args:
+            text (str): The schedule incantation
+
+        Returns:
+            List[Tuple]: (start minute, end minute, bytes/s, ops/s) windows
+
+        Raises:
+            ValueError: If the incantation is malformed
+        """
+        windows = []
+        for part in filter(None, (piece.strip() for piece in text.split(','))):
+            try:
+                span, limits = part.split('=')
+                start, end = (cls._minutes(moment) for moment in span.split('-'))
+                megabytes, operations = limits.split('/')
+            except ValueError:
+                raise ValueError(f"🕰️ Cannot read schedule window '{part}', expected HH:MM-HH:MM=MBPS/IOPS")
+            windows.append((start, end,
+                            None if megabytes.strip() == '-' else float(megabytes) * 1024 * 1024,
+                            None if operations.strip() == '-' else float(operations)))
+        return windows
+
+    @staticmethod
+    def _minutes(moment: str) -> int:
+        hours, minutes = moment.strip().split(':')
+        return int(hours) * 60 + int(minutes)
+
+    def current_limits(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        📏 Work Out the Ceilings in Force Right Now, Backoff Included
+
+        Returns:
+            Tuple: (bytes/s, ops/s), None meaning unlimited
+        """
+        byte_limit, op_limit = self.max_bytes_per_second, self.max_ops_per_second
+        if self.schedule:
+            now = self._wall_clock()
+            minute = now.hour * 60 + now.minute
+            for start, end, window_bytes, window_ops in self.schedule:
+                inside = start <= minute < end if start <= end else (minute >= start or minute < end)
+                if inside:
+                    byte_limit, op_limit = window_bytes, window_ops
+                    break
+        scale = self.backoff_factor
+        return (None if byte_limit is None else byte_limit * scale,
+                None if op_limit is None else op_limit * scale)
+
+    def acquire(self, nbytes: int = 0, ops: int = 1):
+        """
+        🪙 Take Tokens for an I/O, Waiting Until the Buckets Allow It
+
+        A request bigger than a full bucket is granted on credit: the bucket
+        goes negative and later callers wait for it to refill.
+
+        Args:
+            nbytes (int): Bytes about to be read or written
+            ops (int): Operations about to be issued
+        """
+        with self._lock:
+            byte_limit, op_limit = self.current_limits()
+            now = self._clock()
+            elapsed = now - self._last_refill
+            self._last_refill = now
+            wait = 0.0
+            if byte_limit is not None:
+                self._byte_tokens = min(byte_limit, self._byte_tokens + elapsed * byte_limit) - nbytes
+                if self._byte_tokens < 0:
+                    wait = -self._byte_tokens / byte_limit
+            if op_limit is not None:
+                self._op_tokens = min(op_limit, self._op_tokens + elapsed * op_limit) - ops
+                if self._op_tokens < 0:
+                    wait = max(wait, -self._op_tokens / op_limit)
+        if wait > 0:
+            self._sleep(wait)
+
+    def observe_latency(self, seconds: float):
+        """
+        🐢 Feel the Disk's Pulse and Back Off When It Races
+
+        Args:
+            seconds (float): How long one operation took
+        """
+        if self.latency_target is None:
+            return
+        with self._lock:
+            if self._latency_average is None:
+                self._latency_average = seconds
+            else:
+                self._latency_average += self._SMOOTHING * (seconds - self._latency_average)
+            if self._latency_average > self.latency_target:
+                self.backoff_factor = max(self.MIN_BACKOFF, self.backoff_factor * 0.7)
+            elif self._latency_average < self.latency_target / 2:
+                self.backoff_factor = min(1.0, self.backoff_factor * 1.05)
+
+    @contextmanager
+    def operation(self, nbytes: int = 0, ops: int = 1):
+        """
+        ⏱️ Govern One I/O: Take Tokens Before, Measure Latency After
+
+        Args:
+            nbytes (int): Bytes the operation will transfer
+            ops (int): Operations it counts as
+        """
+        self.acquire(nbytes, ops)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.observe_latency((self._clock() - started) / max(ops, 1))
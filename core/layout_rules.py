@@ -0,0 +1,453 @@
+import os
+import re
+import string
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.intelligent_organizer import IntelligentOrganizer
+
+
+class LayoutRules:
+    """
+    📐 The LayoutRules: Scrolls That Decide Where Every File Settles 🗺️
+
+    Without rules, every file goes to ``<category>/<file type>``. Rules written
+    one per line replace that layout, and the first rule that matches wins:
+
+    .. code-block:: text
+
+        # condition(s)                          => destination directory
+        size > 1G                               => bulk
+        category == images                      => photos/{year}/{month}
+        path ~ /projects/(?P<project>[^/]+)/    => projects/{project}/{type}
+        type in doc,docx,odt and age > 365d     => archive/{year}
+        *                                       => {category}/{type}
+
+    Conditions are joined with ``and``. ``category``, ``type``, ``name``,
+    ``parent`` and ``path`` support ``==``, ``!=``, ``in`` (comma separated)
+    and ``~`` (a regular expression, whose named groups become template
+    fields). ``size`` takes K/M/G/T units and ``age`` takes h/d/w/y units,
+    both with ``<``, ``<=``, ``>``, ``>=`` and ``==``. Templates may use
+    ``{category}``, ``{type}``, ``{name}``, ``{parent}``, ``{year}``,
+    ``{month}`` and ``{day}`` (from the modification time). Files no rule
+    matches keep the ``<category>/<file type>`` layout.
+
+    The rules are not interpreted per file. They are compiled once into a
+    single Python function: ages are folded into timestamps, sizes into
+    byte counts, and runs of rules that only test ``category`` or ``type``
+    for equality become a dictionary lookup. A file is routed with a handful
+    of comparisons, at millions of files per second.
+
+    Attributes:
+        rules (List[Dict]): The parsed rules, in order
+        source (str): The generated Python source, for the curious
+        route (Callable): ``route(record, category) -> relative directory``
+    """
+
+    STRING_FIELDS = ('category', 'type', 'name', 'parent', 'path')
+    NUMBER_FIELDS = ('size', 'age')
+    TEMPLATE_FIELDS = ('category', 'type', 'name', 'parent', 'year', 'month', 'day')
+
+    SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    AGE_UNITS = {'h': 3600, 'd': 86400, 'w': 7 * 86400, 'y': 365 * 86400}
+
+    # 🔁 age > X means modified < now - X, so comparisons flip direction
+    _AGE_FLIP = {'>': '<', '>=': '<=', '<': '>', '<=': '>=', '==': '=='}
+
+    # 🔤 How each field is computed from a record, when not already at hand
+    _FIELD_EXPRESSIONS = {
+        'category': 'category',
+        'path': 'path',
+        'type': '_file_type(path)',
+        'name': '_basename(path)',
+        'parent': '_basename(_dirname(path))',
+        'size': "record['size']",
+        'modified': "record['modified']",
+    }
+    _DATE_FORMATS = {'year': '{0}', 'month': '{1}', 'day': '{2}'}
+
+    _CONDITION = re.compile(r'^(\w+)\s*(==|!=|>=|<=|>|<|~)\s*(.+)$')
+    _MEMBERSHIP = re.compile(r'^(\w+)\s+in\s+(.+)$')
+    _QUANTITY = re.compile(r'^(\d+(?:\.\d+)?)\s*([A-Za-z]?)B?$')
+
+    def __init__(self, text: str, now: Optional[float] = None):
+        """
+        🎭 Summon the LayoutRules into existence!
+
+        Args:
+            text (str): The rules, one per line; blank lines and ``#`` comments are ignored
+            now (float, optional): The moment ages are measured from; the present by default
+
+        Raises:
+            ValueError: If a rule cannot be understood
+        """
+        self.now = time.time() if now is None else now
+        self.rules = [self._parse_rule(line, number)
+                      for number, line in enumerate(text.splitlines(), start=1)
+                      if line.strip() and not line.strip().startswith('#')]
+        self.source, self.route = self._compile()
+
+    @classmethod
+    def from_file(cls, path, now: Optional[float] = None) -> "LayoutRules":
+        """
+        📜 Read the Rules From a Scroll on Disk
+
+        Args:
+            path (str): The rules file
+            now (float, optional): The moment ages are measured from
+
+        Returns:
+            LayoutRules: The compiled rules
+        """
+        with open(path, encoding='utf-8') as scroll:
+            return cls(scroll.read(), now=now)
+
+    def __call__(self, record: Dict, category: str) -> str:
+        return self.route(record, category)
+
+    # 🔍 Parsing
+
+    def _parse_rule(self, line: str, number: int) -> Dict:
+        """
+        🔍 Understand One Line of the Rules
+
+        Args:
+            line (str): The rule text
+            number (int): Its line number, for error messages
+
+        Returns:
+            Dict: 'conditions' as (field, operator, value) triples and the 'template'
+
+        Raises:
+            ValueError: If the rule cannot be understood
+        """
+        if '=>' not in line:
+            raise ValueError(f"📐 Rule on line {number} has no '=>': {line.strip()}")
+        condition_text, template = (part.strip() for part in line.rsplit('=>', 1))
+        conditions = []
+        if condition_text != '*':
+            for term in re.split(r'\s+and\s+', condition_text):
+                conditions.append(self._parse_condition(term.strip(), number))
+        fields = self._template_fields(template, conditions, number)
+        return {'line': number, 'conditions': conditions, 'template': template, 'fields': fields}
+
+    def _parse_condition(self, term: str, number: int) -> Tuple[str, str, object]:
+        """
+        🧩 Understand One Condition
+
+        Args:
+            term (str): e.g. ``size > 1G`` or ``type in jpg,png``
+            number (int): The rule's line number, for error messages
+
+        Returns:
+            Tuple: (field, operator, value) with units and ages already resolved
+
+        Raises:
+            ValueError: If the condition cannot be understood
+        """
+        membership = self._MEMBERSHIP.match(term)
+        if membership:
+            field, operator, value = membership.group(1), 'in', membership.group(2)
+        else:
+            match = self._CONDITION.match(term)
+            if not match:
+                raise ValueError(f"📐 Cannot understand condition '{term}' on line {number}")
+            field, operator, value = match.groups()
+        value = value.strip().strip('"\'')
+
+        if field in self.STRING_FIELDS:
+            if operator == '~':
+                return field, operator, re.compile(value)
+            if operator not in ('==', '!=', 'in'):
+                raise ValueError(f"📐 '{field}' cannot be compared with '{operator}' on line {number}")
+            values = [item.strip() for item in value.split(',')] if operator == 'in' else [value]
+            if field == 'type':
+                values = [item.lstrip('.').lower() for item in values]
+            return field, operator, frozenset(values) if operator == 'in' else values[0]
+
+        if field in self.NUMBER_FIELDS:
+            if operator not in self._AGE_FLIP:
+                raise ValueError(f"📐 '{field}' cannot be compared with '{operator}' on line {number}")
+            if field == 'size':
+                return 'size', operator, self._quantity(value, self.SIZE_UNITS, number, upper=True)
+            seconds = self._quantity(value, self.AGE_UNITS, number, upper=False)
+            return 'modified', self._AGE_FLIP[operator], self.now - seconds
+
+        raise ValueError(f"📐 Unknown field '{field}' on line {number}")
+
+    def _quantity(self, value: str, units: Dict[str, int], number: int, upper: bool) -> float:
+        match = self._QUANTITY.match(value)
+        unit = match.group(2).upper() if match and upper else (match.group(2) if match else None)
+        if not match or unit not in units:
+            raise ValueError(f"📐 Cannot read quantity '{value}' on line {number}")
+        return float(match.group(1)) * units[unit]
+
+    def _template_fields(self, template: str, conditions: List[Tuple], number: int) -> List[str]:
+        """
+        🧾 Check That a Template Only Uses Fields the Rule Can Provide
+
+        Args:
+            template (str): The destination template
+            conditions (List[Tuple]): The rule's conditions, whose regex groups are fields too
+            number (int): The rule's line number, for error messages
+
+        Returns:
+            List[str]: The field names used by the template
+
+        Raises:
+            ValueError: If the template uses an unknown field or a format spec
+        """
+        groups = {group for _, operator, value in conditions if operator == '~' for group in value.groupindex}
+        clashes = groups & set(self.TEMPLATE_FIELDS)
+        if clashes:
+            raise ValueError(f"📐 Regex groups {sorted(clashes)} on line {number} shadow built-in fields")
+        fields = []
+        try:
+            parsed = list(string.Formatter().parse(template))
+        except ValueError as e:
+            raise ValueError(f"📐 Cannot read template '{template}' on line {number}: {e}")
+        for _, field, spec, conversion in parsed:
+            if field is None:
+                continue
+            if spec or conversion or (field not in self.TEMPLATE_FIELDS and field not in groups):
+                raise ValueError(f"📐 Unknown template field '{{{field}}}' on line {number}")
+            fields.append(field)
+        return fields
+
+    # ⚙️ Compilation
+
+    def _compile(self) -> Tuple[str, Callable[[Dict, str], str]]:
+        """
+        ⚙️ Forge the Rules Into One Python Function
+
+        Returns:
+            Tuple[str, Callable]: The generated source and the compiled route function
+        """
+        constants: Dict[str, object] = {
+            '_file_type': _file_type,
+            '_basename': os.path.basename,
+            '_dirname': os.path.dirname,
+            '_date': _date_lookup(),
+            '_safe': _safe_segment,
+        }
+        used = {field for rule in self.rules for field, _, _ in rule['conditions']}
+        preloaded = ['path'] + [field for field in ('size', 'modified', 'type', 'name', 'parent') if field in used]
+        body = ["    path = record['path']"]
+        body += [f"    {field if field != 'type' else 'type_'} = {self._FIELD_EXPRESSIONS[field]}"
+                 for field in preloaded[1:]]
+        local = {field: (field if field != 'type' else 'type_') for field in preloaded}
+        local['category'] = 'category'
+
+        for block in self._blocks():
+            if isinstance(block, tuple):
+                field, rules = block
+                table_name = f"_TABLE{len(constants)}"
+                table = {}
+                for rule in rules:
+                    rendered = self._render(rule, {}, constants)
+                    # Constant destinations go straight into the table, others as small renderers
+                    renderer = (rule['template'] if not rule['fields']
+                                else eval(f"lambda record, category, path: {rendered}", constants))
+                    _, _, value = rule['conditions'][0]
+                    for key in (value if isinstance(value, frozenset) else [value]):
+                        table.setdefault(key, renderer)
+                constants[table_name] = table
+                body.append(f"    _render = {table_name}.get({local[field]})")
+                body.append("    if _render is not None:")
+                body.append("        return _render if _render.__class__ is str else _render(record, category, path)")
+            else:
+                rule = block
+                tests = [self._test(rule, index, local, constants) for index in range(len(rule['conditions']))]
+                result = self._render(rule, local, constants)
+                if tests:
+                    body.append(f"    if {' and '.join(tests)}:  # line {rule['line']}")
+                    body.append(f"        return {result}")
+                else:
+                    body.append(f"    return {result}  # line {rule['line']}")
+                    break
+        else:
+            body.append(f"    return category + '/' + {local.get('type', self._FIELD_EXPRESSIONS['type'])}")
+
+        source = "def route(record, category):\n" + "\n".join(body) + "\n"
+        namespace = dict(constants)
+        exec(compile(source, '<layout rules>', 'exec'), namespace)
+        return source, namespace['route']
+
+    def _blocks(self) -> List:
+        """
+        🧱 Gather Runs of Pure Equality Rules on One Field Into Lookup Tables
+
+        Returns:
+            List: Each entry is either a single rule or a (field, rules) table
+        """
+        blocks = []
+        for rule in self.rules:
+            conditions = rule['conditions']
+            tabled = (len(conditions) == 1 and conditions[0][0] in ('category', 'type')
+                      and conditions[0][1] in ('==', 'in'))
+            if tabled and blocks and isinstance(blocks[-1], tuple) and blocks[-1][0] == conditions[0][0]:
+                blocks[-1][1].append(rule)
+            elif tabled:
+                blocks.append((conditions[0][0], [rule]))
+            else:
+                blocks.append(rule)
+        # A table of one rule is no faster than a plain test
+        return [block[1][0] if isinstance(block, tuple) and len(block[1]) == 1 else block for block in blocks]
+
+    def _test(self, rule: Dict, index: int, local: Dict[str, str], constants: Dict[str, object]) -> str:
+        """
+        🧪 Write One Condition as a Python Expression
+
+        Args:
+            rule (Dict): The rule holding the condition
+            index (int): Which of its conditions
+            local (Dict[str, str]): Fields already held in local variables
+            constants (Dict[str, object]): Namespace receiving sets and patterns
+
+        Returns:
+            str: The Python expression
+        """
+        field, operator, value = rule['conditions'][index]
+        subject = local.get(field, self._FIELD_EXPRESSIONS[field])
+        if operator == '~':
+            name = f"_PATTERN{len(constants)}"
+            constants[name] = value
+            return f"({self._match_name(rule, index)} := {name}.search({subject})) is not None"
+        if operator == 'in':
+            name = f"_SET{len(constants)}"
+            constants[name] = value
+            return f"{subject} in {name}"
+        return f"{subject} {operator} {value!r}"
+
+    @staticmethod
+    def _match_name(rule: Dict, index: int) -> str:
+        return f"_match{rule['line']}_{index}"
+
+    def _render(self, rule: Dict, local: Dict[str, str], constants: Dict[str, object]) -> str:
+        """
+        🖋️ Write a Rule's Template as a Python Expression
+
+        Args:
+            rule (Dict): The rule whose template to render
+            local (Dict[str, str]): Fields already held in local variables
+            constants (Dict[str, object]): Namespace receiving the format string
+
+        Returns:
+            str: The Python expression building the destination directory
+        """
+        if not rule['fields']:
+            return repr(rule['template'])
+        groups = {group: self._match_name(rule, index)
+                  for index, (_, operator, value) in enumerate(rule['conditions']) if operator == '~'
+                  for group in value.groupindex}
+        # Date fields share one lookup, unpacked into the first three arguments
+        dated = any(field in self._DATE_FORMATS for field in rule['fields'])
+        first = 3 if dated else 0
+        arguments, pattern = [], []
+        for literal, field, _, _ in string.Formatter().parse(rule['template']):
+            pattern.append(literal.replace('{', '{{').replace('}', '}}'))
+            if field is None:
+                continue
+            if field in self._DATE_FORMATS:
+                pattern.append(self._DATE_FORMATS[field])
+                continue
+            if field in groups:
+                arguments.append(f"_safe({groups[field]}[{field!r}])")
+            else:
+                arguments.append(local.get(field, self._FIELD_EXPRESSIONS[field]))
+            pattern.append(f"{{{first + len(arguments) - 1}}}")
+        if dated:
+            arguments.insert(0, "*_date(record['modified'])")
+        name = f"_FORMAT{len(constants)}"
+        constants[name] = ''.join(pattern)
+        return f"{name}.format({', '.join(arguments)})"
+
+
+def _file_type(path: str, _sep: str = os.sep) -> str:
+    """
+    🏷️ Name a File's Type Exactly Like the IntelligentOrganizer, Only Faster
+
+    Names that don't start with a dot take a fast path; the rest ask
+    ``IntelligentOrganizer._get_file_type`` itself.
+
+    Args:
+        path (str): The file's path
+
+    Returns:
+        str: The lowercase extension without its dot, or 'unknown'
+    """
+    start = path.rfind(_sep) + 1
+    dot = path.rfind('.')
+    if dot <= start:
+        return 'unknown' if dot < start else IntelligentOrganizer._get_file_type(path)
+    if path[start] == '.':
+        return IntelligentOrganizer._get_file_type(path)
+    return path[dot + 1:].lower()
+
+
+if os.altsep:
+    # Paths may mix separators here; leave them to the organizer
+    _file_type = IntelligentOrganizer._get_file_type  # noqa: F811
+
+
+def _date_lookup() -> Callable[[float], Tuple[str, str, str]]:
+    """
+    📅 Build a Cached Lookup From Modification Time to Local (Year, Month, Day)
+
+    Each UTC day is split once at the local midnight falling inside it, found
+    by binary search over quarter hours (time zones and daylight saving move
+    in quarter hours). Afterwards a date costs one dictionary lookup and one
+    comparison. The rare UTC day holding two local midnights is left to
+    ``time.localtime``.
+
+    Returns:
+        Callable: ``date(modified) -> ('2024', '03', '09')``
+    """
+    cache: Dict[int, Optional[Tuple[float, Tuple[str, str, str], Tuple[str, str, str]]]] = {}
+
+    def stamp(moment: float) -> Tuple[str, str, str]:
+        local = time.localtime(moment)
+        return f"{local.tm_year:04d}", f"{local.tm_mon:02d}", f"{local.tm_mday:02d}"
+
+    def split(day: int):
+        start = day * 86400
+        first, last = stamp(start), stamp(start + 86399)
+        if first == last:
+            return start + 86400, first, first
+        low, high = 1, 96
+        while low < high:
+            middle = (low + high) // 2
+            if stamp(start + middle * 900) == first:
+                low = middle + 1
+            else:
+                high = middle
+        boundary = start + low * 900
+        return (boundary, first, last) if stamp(boundary) == last else None
+
+    def date(modified: float) -> Tuple[str, str, str]:
+        day = int(modified // 86400)
+        try:
+            found = cache[day]
+        except KeyError:
+            found = cache[day] = split(day)
+        if found is None:
+            return stamp(modified)
+        return found[1] if modified < found[0] else found[2]
+
+    return date
+
+
+def _safe_segment(value: Optional[str]) -> str:
+    """
+    🛡️ Keep a Captured Value From Escaping Its Directory
+
+    Args:
+        value (str): A regex group captured from a path, possibly None
+
+    Returns:
+        str: The value with separators replaced, or '_' if nothing usable remains
+    """
+    if not value:
+        return '_'
+    value = value.replace('/', '_').replace('\\', '_')
+    return '_' if value in ('.', '..') else value
@@ -0,0 +1,266 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+class MerkleTree:
+    """
+    🌳 The MerkleTree: One Seal per Directory, Sealing Everything Beneath It 🔏
+
+    Every directory gets a digest computed from its files' names, sizes,
+    modification times and fingerprints, and from its subdirectories' names
+    and digests. Two trees (or one tree on two dates) whose root digests match
+    are identical; where they differ, only the subdirectories whose digests
+    differ need to be looked at, so a comparison touches just the changed
+    paths and their ancestors.
+
+    The manifest also keeps each directory's own modification time and its
+    files' metadata, so an incremental rescan can reuse a directory without
+    listing it again when its modification time is unchanged.
+
+    Directories are keyed by their path relative to the root ('' for the
+    root itself), so manifests of two different roots can be compared.
+
+    Attributes:
+        root (str): The absolute path of the tree's root
+        directories (Dict[str, Dict]): Per relative directory, its 'mtime', 'files'
+            (name -> FILE_FIELDS values), 'dirs' (sorted names) and 'digest'
+    """
+
+    FORMAT = "data-chaos-wizard-merkle"
+    VERSION = 1
+    FILE_FIELDS = ('size', 'modified', 'fingerprint', 'created', 'inode', 'device')
+
+    def __init__(self, root: str):
+        """
+        🎭 Summon the MerkleTree into existence!
+
+        Args:
+            root (str): The root directory the tree describes
+        """
+        self.root = os.path.abspath(root)
+        self.directories: Dict[str, Dict] = {}
+        self._relative_parents: Dict[str, str] = {}
+
+    @classmethod
+    def build(cls, root: str, records: Iterable[Dict], directory_mtimes: Optional[Dict[str, float]] = None):
+        """
+        🏗️ Grow a Tree From Scanner Records and Sealed Directory Digests
+
+        Args:
+            root (str): The scanned root
+            records (Iterable[Dict]): The scanner records
+            directory_mtimes (Dict[str, float], optional): Modification times of the directories
+                the walk listed, by path; directories left out are asked with a ``stat``
+
+        Returns:
+            MerkleTree: The sealed tree
+        """
+        tree = cls(root)
+        tree.add_records(records)
+        tree.finish(directory_mtimes)
+        return tree
+
+    def add_records(self, records: Iterable[Dict]):
+        """
+        🌱 Note Scanner Records in a Growing Tree, Keeping Only Their Metadata
+
+        Records can be added as the scan yields them, so the scanner itself
+        needn't keep them; ``finish`` seals the tree once the scan is done.
+
+        Args:
+            records (Iterable[Dict]): The scanner records
+        """
+        relative_parents = self._relative_parents
+        for record in records:
+            parent = os.path.dirname(record['path'])
+            relative = relative_parents.get(parent)
+            if relative is None:
+                relative = relative_parents[parent] = self.relative(parent)
+            self._entry(relative)['files'][record['name']] = [record.get(field) for field in self.FILE_FIELDS]
+
+    def finish(self, directory_mtimes: Optional[Dict[str, float]] = None):
+        """
+        🔏 Seal a Grown Tree Once Every Record Was Added
+
+        Args:
+            directory_mtimes (Dict[str, float], optional): Modification times of the directories
+                the walk listed, by path; directories left out are asked with a ``stat``
+        """
+        self._relative_parents = {}
+        for directory, mtime in (directory_mtimes or {}).items():
+            self._entry(self.relative(directory))['mtime'] = mtime
+
+        # Every directory is a child of its parent, all the way up to the root
+        for relative in list(self.directories):
+            while relative:
+                parent, name = os.path.split(relative)
+                self._entry(parent)['dirs'].add(name)
+                relative = parent
+        for relative, entry in self.directories.items():
+            if entry['mtime'] is None:
+                try:
+                    entry['mtime'] = os.stat(os.path.join(self.root, relative)).st_mtime
+                except OSError:
+                    pass
+        self.seal()
+
+    def relative(self, directory: str) -> str:
+        relative = os.path.relpath(os.path.abspath(directory), self.root)
+        return '' if relative == os.curdir else relative
+
+    def _entry(self, relative: str) -> Dict:
+        entry = self.directories.get(relative)
+        if entry is None:
+            entry = self.directories[relative] = {"mtime": None, "files": {}, "dirs": set(), "digest": None}
+        return entry
+
+    def seal(self):
+        """
+        🔏 Compute Every Directory's Digest, Deepest Directories First
+        """
+        depth_first = sorted(self.directories, key=lambda relative: relative.count(os.sep) + bool(relative),
+                             reverse=True)
+        for relative in depth_first:
+            entry = self.directories[relative]
+            entry['dirs'] = sorted(entry['dirs'])
+            hasher = hashlib.md5()
+            for name in sorted(entry['files']):
+                size, modified, fingerprint = entry['files'][name][:3]
+                hasher.update(f"f\0{name}\0{size}\0{modified!r}\0{fingerprint or ''}\n"
+                              .encode('utf-8', 'surrogateescape'))
+            for name in entry['dirs']:
+                child = self.directories[os.path.join(relative, name)]
+                hasher.update(f"d\0{name}\0{child['digest']}\n".encode('utf-8', 'surrogateescape'))
+            entry['digest'] = hasher.hexdigest()
+
+    @property
+    def digest(self) -> Optional[str]:
+        root = self.directories.get('')
+        return root['digest'] if root else None
+
+    def unchanged(self, directory: str, mtime: float) -> Optional[Dict]:
+        """
+        🕰️ Find a Directory's Entry If Its Modification Time Is Still the Same
+
+        Args:
+            directory (str): The directory, by its real path
+            mtime (float): Its current modification time
+
+        Returns:
+            Dict: The remembered entry, or None if it is unknown or changed
+        """
+        entry = self.directories.get(self.relative(directory))
+        if entry is not None and entry['mtime'] is not None and entry['mtime'] == mtime:
+            return entry
+        return None
+
+    def records_in(self, directory: str, entry: Dict) -> List[Dict]:
+        """
+        📜 Rebuild the Scanner Records of a Remembered Directory's Files
+
+        Args:
+            directory (str): The directory, by its path as the scanner sees it
+            entry (Dict): Its entry, from ``unchanged``
+
+        Returns:
+            List[Dict]: Scanner-shaped records, in name order
+        """
+        records = []
+        for name in sorted(entry['files']):
+            record = dict(zip(self.FILE_FIELDS, entry['files'][name]))
+            record.update(path=os.path.join(directory, name), name=name, extension=Path(name).suffix)
+            records.append(record)
+        return records
+
+    def compare(self, other: 'MerkleTree') -> Dict:
+        """
+        ⚖️ Find What Changed Between This Tree (Before) and Another (After)
+
+        Only directories whose digests differ are descended into; a directory
+        present on one side only is reported as a whole.
+
+        Args:
+            other (MerkleTree): The tree after the changes
+
+        Returns:
+            Dict: Sorted 'added', 'removed' and 'changed' relative paths (directories end
+            in a separator), 'identical', and how many directories were visited
+        """
+        added, removed, changed = [], [], []
+        visited = 0
+        pending = [''] if self.digest != other.digest else []
+        while pending:
+            relative = pending.pop()
+            visited += 1
+            before, after = self.directories[relative], other.directories[relative]
+            for name in set(before['files']) | set(after['files']):
+                path = os.path.join(relative, name)
+                if name not in before['files']:
+                    added.append(path)
+                elif name not in after['files']:
+                    removed.append(path)
+                elif before['files'][name][:3] != after['files'][name][:3]:
+                    changed.append(path)
+            for name in set(before['dirs']) | set(after['dirs']):
+                path = os.path.join(relative, name)
+                if name not in before['dirs']:
+                    added.append(path + os.sep)
+                elif name not in after['dirs']:
+                    removed.append(path + os.sep)
+                elif self.directories[path]['digest'] != other.directories[path]['digest']:
+                    pending.append(path)
+        return {
+            "identical": self.digest == other.digest,
+            "added": sorted(added),
+            "removed": sorted(removed),
+            "changed": sorted(changed),
+            "directories_visited": visited,
+            "directories_total": max(len(self.directories), len(other.directories)),
+        }
+
+    def save(self, path: str):
+        """
+        💾 Write the Manifest, gzip-Compressed, Replacing Any Earlier One Atomically
+
+        Args:
+            path (str): Where to write it
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "format": self.FORMAT,
+            "version": self.VERSION,
+            "created": time.time(),
+            "root": self.root,
+            "directories": self.directories,
+        }
+        temporary = f"{path}.tmp"
+        with gzip.open(temporary, 'wt', encoding='utf-8') as handle:
+            json.dump(manifest, handle)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'MerkleTree':
+        """
+        📖 Read a Manifest Written by ``save``
+
+        Args:
+            path (str): The manifest
+
+        Returns:
+            MerkleTree: The tree it describes
+
+        Raises:
+            ValueError: If the file is not a manifest this version understands
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as handle:
+            manifest = json.load(handle)
+        if manifest.get("format") != cls.FORMAT or manifest.get("version") != cls.VERSION:
+            raise ValueError(f"🌳 Not a Merkle manifest this wizard understands: {path}")
+        tree = cls(manifest["root"])
+        tree.directories = manifest["directories"]
+        return tree
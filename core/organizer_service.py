@@ -0,0 +1,314 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Generator, List, Optional
+
+from core.action_engine import ActionEngine
+from core.file_categorizer import FileCategorizer
+from core.file_scanner import FileScanner
+from core.intelligent_organizer import IntelligentOrganizer
+
+
+class OrganizerService:
+    """
+    🏰 The OrganizerService: A Wizard Who Never Leaves the Tower 🗼
+
+    Summoning a fresh wizard for every drop folder means waking the
+    interpreter, reading the mime scrolls and walking the realm cold each
+    time. The resident wizard stays awake behind a Unix domain socket and
+    answers JSON requests, one per line, keeping its memories warm:
+
+    - 🧠 the categorizer's memory of which file ending means which category
+    - 🖐️ per realm, when fingerprints are asked for, those of files seen
+      before, reused while a file's size and modification time are
+      unchanged (and carried along when the wizard itself moves a file)
+    - 🏗️ per realm, an ActionEngine remembering destination directories
+      that already stand
+
+    Requests on different realms are served concurrently; requests on the
+    same realm, including applying a plan file made for it, wait for each
+    other behind that realm's lock. Only the ``max_realms`` realms asked
+    about most recently are remembered, so a tower serving endless drop
+    folders does not grow without bound; a forgotten realm is simply
+    surveyed cold the next time.
+
+    Requests look like ``{"op": "plan", "root": "/drop/42"}``:
+
+    - ``ping``: are you awake?
+    - ``scan``: count files, bytes and categories under ``root``
+    - ``plan``: the journeys that would organize ``root``
+    - ``apply``: organize ``root`` now, or perform a ``plan`` file exported earlier for ``root``
+    - ``shutdown``: close the tower
+
+    Every answer carries ``ok`` and, on success, ``elapsed_ms``.
+
+    Attributes:
+        socket_path (str): Where the tower's door is
+        layout (LayoutRules): Optional rules choosing destination directories
+        governor (IOGovernor): Optional floodgate keeper for reads and moves
+        fingerprint (bool): Whether scans read files for their fingerprints
+        category_cache (Dict): The shared memory of the categorizers
+        max_realms (int): How many realms' memories are kept, least recently asked about forgotten first
+        fingerprints (OrderedDict[str, Dict]): Per realm, path -> (size, modified, fingerprint)
+        engines (OrderedDict[str, ActionEngine]): Per realm, the engine and its directory memory
+    """
+
+    OPERATIONS = ('ping', 'scan', 'plan', 'apply', 'shutdown')
+
+    def __init__(self, socket_path: str, layout=None, governor=None, categories=None, fingerprint=False,
+                 max_realms: int = 32):
+        """
+        🎭 Summon the OrganizerService into existence!
+
+        Args:
+            socket_path (str): Where to open the tower's door
+            layout (LayoutRules, optional): Rules choosing destination directories
+            governor (IOGovernor, optional): Floodgate keeper for reads and moves
+            categories (dict, optional): A custom scroll of file categories
+            fingerprint (bool): Read files for their fingerprints; planning and moving never need them
+            max_realms (int): How many realms' memories to keep
+
+        Raises:
+            ValueError: If max_realms is not positive
+        """
+        if max_realms < 1:
+            raise ValueError("🗼 The wizard must remember at least one realm")
+        self.socket_path = socket_path
+        self.layout = layout
+        self.governor = governor
+        self.categories = categories
+        self.fingerprint = fingerprint
+        self.category_cache: Dict = {}
+        self.max_realms = max_realms
+        self.fingerprints: "OrderedDict[str, Dict[str, tuple]]" = OrderedDict()
+        self.engines: "OrderedDict[str, ActionEngine]" = OrderedDict()
+        self.logger = logging.getLogger(__name__)
+        self._locks: Dict[str, list] = {}  # realm -> [lock, requests holding or awaiting it]
+        self._locks_guard = threading.Lock()
+        self._server = None
+
+    # 🚪 The door
+
+    def serve_forever(self):
+        """
+        🗼 Open the Door and Answer Requests Until Asked to Stop
+        """
+        os.makedirs(os.path.dirname(self.socket_path) or '.', exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except ValueError as e:
+                        answer = {"ok": False, "error": f"Unreadable request: {e}"}
+                    else:
+                        answer = service.handle(request)
+                    self.wfile.write(json.dumps(answer, ensure_ascii=False).encode('utf-8') + b"\n")
+                    self.wfile.flush()
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        self._server = Server(self.socket_path, Handler)
+        self.logger.info(f"🗼 Organizer service listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self):
+        """
+        🌙 Close the Door (from any thread but the one serving)
+        """
+        if self._server is not None:
+            self._server.shutdown()
+
+    @staticmethod
+    def request(socket_path: str, payload: Dict, timeout: Optional[float] = None) -> Dict:
+        """
+        📨 Knock on the Tower's Door With One Request
+
+        Args:
+            socket_path (str): Where the tower's door is
+            payload (Dict): The request
+            timeout (float, optional): Seconds to wait for the answer
+
+        Returns:
+            Dict: The answer
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(timeout)
+            connection.connect(socket_path)
+            connection.sendall(json.dumps(payload).encode('utf-8') + b"\n")
+            with connection.makefile('rb') as answers:
+                return json.loads(answers.readline())
+
+    # 📬 Requests
+
+    def handle(self, request: Dict) -> Dict:
+        """
+        📬 Answer One Request
+
+        Args:
+            request (Dict): The request, with at least an 'op'
+
+        Returns:
+            Dict: The answer; failures are reported, never raised
+        """
+        started = time.perf_counter()
+        operation = request.get('op')
+        try:
+            if operation not in self.OPERATIONS:
+                raise ValueError(f"Unknown operation '{operation}', expected one of {list(self.OPERATIONS)}")
+            if operation == 'ping':
+                answer = {}
+            elif operation == 'shutdown':
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                answer = {}
+            elif operation == 'apply' and request.get('plan'):
+                with self._lock_for(self._realm(request)):
+                    answer = ActionEngine(governor=self.governor).apply_plan(request['plan'])
+            else:
+                root = self._realm(request)
+                with self._lock_for(root):
+                    answer = getattr(self, f"_{operation}")(root, request)
+        except Exception as e:
+            self.logger.error(f"🔥 Request {operation} failed: {e}")
+            return {"ok": False, "error": str(e)}
+        answer.update(ok=True, elapsed_ms=round((time.perf_counter() - started) * 1000, 3))
+        return answer
+
+    @staticmethod
+    def _realm(request: Dict) -> str:
+        root = request.get('root')
+        if not root:
+            raise ValueError("This operation needs a 'root'")
+        return os.path.realpath(root)
+
+    @contextmanager
+    def _lock_for(self, root: str) -> Generator[None, None, None]:
+        """
+        🔐 Hold a Realm's Lock, Then Forget the Realms Asked About Longest Ago
+
+        A realm's lock lives only while requests hold or await it, and a realm
+        in use is never forgotten.
+
+        Args:
+            root (str): The realm
+        """
+        with self._locks_guard:
+            entry = self._locks.setdefault(root, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[root]
+                self._forget_old_realms()
+
+    def _forget_old_realms(self):
+        # Called with the guard held
+        for memories in (self.fingerprints, self.engines):
+            idle = [realm for realm in memories if realm not in self._locks]
+            for realm in idle[:max(len(memories) - self.max_realms, 0)]:
+                del memories[realm]
+
+    def _remember(self, memories: OrderedDict, root: str, conjure):
+        """
+        🧠 Fetch (or Conjure) a Realm's Memory, Marking It as Recently Asked About
+
+        Args:
+            memories (OrderedDict): ``fingerprints`` or ``engines``
+            root (str): The realm
+            conjure (Callable): Makes the memory when there is none yet
+
+        Returns:
+            The realm's memory
+        """
+        with self._locks_guard:
+            if root not in memories:
+                memories[root] = conjure()
+            memories.move_to_end(root)
+            return memories[root]
+
+    def _scan(self, root: str, request: Dict) -> Dict:
+        files, categorized = self._survey(root)
+        return {
+            "files": len(files),
+            "bytes": sum(file['size'] for file in files),
+            "categories": {category: len(members) for category, members in categorized.items()},
+        }
+
+    def _plan(self, root: str, request: Dict) -> Dict:
+        engine, actions = self._journeys(root)
+        return {
+            "already_in_place": engine.already_in_place,
+            "actions": [{"src": source, "dst": destination} for _, source, destination, _ in actions],
+        }
+
+    def _apply(self, root: str, request: Dict) -> Dict:
+        engine, actions = self._journeys(root)
+        outcome = engine.execute_actions(actions)
+        # Carry remembered fingerprints along with the files we moved ourselves
+        known = self._remember(self.fingerprints, root, dict)
+        for operation, source, destination, _ in actions:
+            if operation == 'move' and source in known and not os.path.exists(source) and os.path.exists(destination):
+                known[destination] = known.pop(source)
+        outcome["already_in_place"] = engine.already_in_place
+        return outcome
+
+    def _survey(self, root: str):
+        """
+        🔍 Scan and Categorize a Realm, Reusing Warm Memories
+
+        Args:
+            root (str): The realm
+
+        Returns:
+            Tuple[List[Dict], Dict[str, List[Dict]]]: The records and the records by category
+        """
+        known = self._remember(self.fingerprints, root, dict)
+        scanner = FileScanner(root, governor=self.governor, known_fingerprints=known, fingerprint=self.fingerprint)
+        files = list(scanner.scan())
+        if self.fingerprint:
+            known.clear()
+            known.update((file['path'], (file['size'], file['modified'], file['fingerprint'])) for file in files)
+        categorizer = FileCategorizer(self.categories, category_cache=self.category_cache)
+        return files, categorizer.categorize(files)
+
+    def _journeys(self, root: str):
+        """
+        🗺️ Plan the Journeys That Would Organize a Realm
+
+        Args:
+            root (str): The realm
+
+        Returns:
+            Tuple[ActionEngine, List[tuple]]: The realm's engine and the planned journeys
+        """
+        _, categorized = self._survey(root)
+        plan = IntelligentOrganizer(None).create_organization_plan(categorized)
+        known = self._remember(self.fingerprints, root, dict)
+        engine = self._remember(self.engines, root, lambda: ActionEngine(
+            governor=self.governor,
+            fingerprinter=FileScanner(root, governor=self.governor, known_fingerprints=known).fingerprint_records))
+        engine.plan_actions(plan, root, self.layout)
+        actions: List[tuple] = list(engine.get_planned_actions())
+        return engine, actions
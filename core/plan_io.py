@@ -0,0 +1,89 @@
+import gzip
+import json
+import time
+from pathlib import Path
+from typing import Dict, Generator, Iterable
+
+PLAN_FORMAT = "data-chaos-wizard-plan"
+PLAN_VERSION = 1
+
+
+def _open_plan(path, mode):
+    """
+    📂 Open a Plan Scroll, Unrolling gzip When Its Name Ends in .gz
+
+    Args:
+        path (str or Path): The plan file
+        mode (str): 'rt' or 'wt'
+
+    Returns:
+        IO: A text stream over the plan
+    """
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def export_plan(actions: Iterable[tuple], path) -> int:
+    """
+    📜 Write Planned Actions to a Portable Scroll
+
+    The scroll is JSON Lines: a header line, then one line per action carrying
+    the size and modification time the source had when it was planned, so a
+    later ``apply`` can cheaply check that nothing changed in between. Paths
+    ending in ``.gz`` are gzip-compressed on the fly.
+
+    Args:
+        actions (Iterable[tuple]): ('move', source, destination, record) tuples, or
+            ('pack', [sources], satchel, [records]) whose per-file fields become lists
+        path (str or Path): Where to write the scroll
+
+    Returns:
+        int: The number of actions written
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with _open_plan(path, 'wt') as scroll:
+        scroll.write(json.dumps({"format": PLAN_FORMAT, "version": PLAN_VERSION, "created": time.time()}) + "\n")
+        for operation, source, destination, record in actions:
+            if operation == 'pack':
+                # A satchel's sources and records are lists, one entry per folded file
+                size = [member.get('size') for member in record]
+                mtime = [member.get('modified') for member in record]
+                fingerprint = [member.get('fingerprint') for member in record]
+            else:
+                size, mtime, fingerprint = record.get('size'), record.get('modified'), record.get('fingerprint')
+            scroll.write(json.dumps({
+                "op": operation,
+                "src": source,
+                "dst": destination,
+                "size": size,
+                "mtime": mtime,
+                "fingerprint": fingerprint,
+            }, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def iter_plan(path) -> Generator[Dict, None, None]:
+    """
+    📖 Read a Plan Scroll One Action at a Time
+
+    Args:
+        path (str or Path): The scroll written by ``export_plan``
+
+    Yields:
+        Dict: One action with 'op', 'src', 'dst', 'size', 'mtime' and 'fingerprint'
+
+    Raises:
+        ValueError: If the file is not a plan scroll this version understands
+    """
+    with _open_plan(path, 'rt') as scroll:
+        header = json.loads(scroll.readline() or '{}')
+        if header.get("format") != PLAN_FORMAT:
+            raise ValueError(f"📜 This is not a plan scroll: {path}")
+        if header.get("version") != PLAN_VERSION:
+            raise ValueError(f"📜 Plan scroll version {header.get('version')} is not understood: {path}")
+        for line in scroll:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,92 @@
+import time
+from typing import Callable, Dict, Optional
+
+
+class ScanBudget:
+    """
+    ⏳ The ScanBudget: An Hourglass for Quests With a Hard Maintenance Window 🚪
+
+    One hourglass is shared by the whole quest: the scanner, the optional
+    analyses and the migration each ask it before taking the next step, and
+    stop cleanly once the sand has run out, leaving the rest for the next
+    run. The budget can be measured in seconds, in operations (directories
+    listed, files examined, journeys performed), or both, whichever runs out
+    first.
+
+    Attributes:
+        seconds (float): Wall-clock seconds the quest may spend, None for no limit
+        operations (int): Operations the quest may perform, None for no limit
+        spent (int): Operations charged so far
+        started (float): When the hourglass was turned, by its clock
+    """
+
+    def __init__(self, seconds: Optional[float] = None, operations: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        🎭 Summon the ScanBudget into existence!
+
+        Args:
+            seconds (float, optional): Wall-clock seconds the quest may spend
+            operations (int, optional): Operations the quest may perform
+            clock (Callable, optional): Source of the time, in seconds
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if seconds is not None and seconds <= 0:
+            raise ValueError("⏳ A time budget must be a positive number of seconds")
+        if operations is not None and operations <= 0:
+            raise ValueError("⏳ An operation budget must be a positive number of operations")
+        self.seconds = seconds
+        self.operations = operations
+        self.clock = clock
+        self.spent = 0
+        self.started = None
+
+    def start(self):
+        """
+        🔄 Turn the Hourglass, Unless It Is Already Running
+        """
+        if self.started is None:
+            self.started = self.clock()
+
+    @property
+    def elapsed(self) -> float:
+        return 0.0 if self.started is None else self.clock() - self.started
+
+    def charge(self, operations: int = 1):
+        """
+        🪙 Count Operations Against the Budget
+
+        Args:
+            operations (int): How many operations were just performed
+        """
+        self.start()
+        self.spent += operations
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        ⌛ Has the Sand Run Out?
+
+        Returns:
+            bool: True once either limit has been reached
+        """
+        if self.operations is not None and self.spent >= self.operations:
+            return True
+        return self.seconds is not None and self.elapsed >= self.seconds
+
+    def summary(self) -> Dict:
+        """
+        📋 Tell How Much Was Allowed and How Much Was Used
+
+        Returns:
+            Dict: 'seconds', 'operations', 'elapsed_seconds', 'operations_spent' and 'exhausted'
+        """
+        return {
+            "seconds": self.seconds,
+            "operations": self.operations,
+            "elapsed_seconds": self.elapsed,
+            "operations_spent": self.spent,
+            "exhausted": self.exhausted,
+        }
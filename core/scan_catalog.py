@@ -0,0 +1,596 @@
+import json
+import mmap
+from array import array
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class PathColumn:
+    """
+    🧵 The PathColumn: Every Path in One Long Thread of Bytes 🪡
+
+    Millions of Python strings cost far more memory than the characters they
+    hold. This column keeps all paths as one UTF-8 byte heap plus an offsets
+    array, and only turns a row back into a string when someone asks for it.
+
+    Attributes:
+        heap (bytes-like): All paths, UTF-8 encoded and concatenated
+        offsets (np.ndarray): Start of row i at offsets[i], end at offsets[i + 1]
+    """
+
+    def __init__(self, heap, offsets):
+        self.heap = heap
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_strings(cls, paths: Iterable[str]) -> "PathColumn":
+        """
+        🪡 Spin a List of Paths Into a Single Thread
+
+        Args:
+            paths (Iterable[str]): The paths to spin
+
+        Returns:
+            PathColumn: The spun column
+        """
+        encoded = [path.encode('utf-8', 'surrogateescape') for path in paths]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(path) for path in encoded], out=offsets[1:])
+        return cls(b''.join(encoded), offsets)
+
+    def __len__(self) -> int:
+        return self.offsets.size - 1
+
+    def __getitem__(self, row) -> str:
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return bytes(self.heap[start:end]).decode('utf-8', 'surrogateescape')
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+
+class ScanCatalog:
+    """
+    🗃️ The ScanCatalog: Columnar Ledger of the Whole File Kingdom 📊
+
+    Instead of a mountain of little dictionaries, the catalog keeps one NumPy
+    column per attribute (size, modification time, category, extension), with
+    categories and extensions interned as small integer codes. Every summary
+    the chroniclers need then becomes a handful of vectorized operations
+    (``bincount``, ``searchsorted``, ``argpartition``) that sweep tens of
+    millions of rows in well under a second.
+
+    Attributes:
+        paths (PathColumn): File paths, one per row
+        sizes (np.ndarray): File sizes in bytes (int64)
+        modified (np.ndarray): Modification times as UNIX timestamps (float64)
+        category_codes (np.ndarray): Index into ``category_names`` for each row (int32)
+        category_names (List[str]): The interned category names
+        extension_codes (np.ndarray): Index into ``extension_names`` for each row (int32)
+        extension_names (List[str]): The interned extensions, without the dot
+        fingerprints (np.ndarray): Fingerprint per row as ASCII bytes, empty when unknown
+        indexes (Dict[str, np.ndarray]): Secondary indexes, see ``build_indexes``
+        inodes (np.ndarray): Inode number per row (uint64), 0 when unknown
+        devices (np.ndarray): Device number per row (uint64), 0 when unknown
+        scope (Dict): What was scanned: 'root' and the 'filters' that left files out, None when unknown
+    """
+
+    # 📏 Upper edges of the size buckets; the last bucket is open-ended
+    SIZE_BUCKETS = (
+        ("< 4 KB", 4 * 1024),
+        ("4 KB - 64 KB", 64 * 1024),
+        ("64 KB - 1 MB", 1024 ** 2),
+        ("1 MB - 16 MB", 16 * 1024 ** 2),
+        ("16 MB - 256 MB", 256 * 1024 ** 2),
+        ("256 MB - 1 GB", 1024 ** 3),
+        (">= 1 GB", None),
+    )
+
+    # ⏳ Upper edges (in days since modification) of the age buckets
+    AGE_BUCKETS = (
+        ("< 30 days", 30),
+        ("30 - 90 days", 90),
+        ("90 days - 1 year", 365),
+        ("1 - 2 years", 730),
+        (">= 2 years", None),
+    )
+
+    # 🔑 Secondary indexes: row numbers sorted by the named column
+    INDEXED_COLUMNS = ('sizes', 'modified', 'category_codes', 'extension_codes', 'fingerprints')
+
+    # 🗺️ Catalogs saved under this suffix are memory-mapped snapshots rather than NumPy archives
+    SNAPSHOT_SUFFIX = ".wzcat"
+    SNAPSHOT_MAGIC = b"WZCATSNP"
+    SNAPSHOT_VERSION = 1
+    SNAPSHOT_HEADER = struct.Struct('<8sHHIQQ')  # magic, version, reserved, rows, directory offset, length
+    SNAPSHOT_ALIGNMENT = 64
+    # 📇 One fixed-layout record per row, every field naturally aligned
+    SNAPSHOT_RECORD = np.dtype([('size', '<i8'), ('modified', '<f8'), ('inode', '<u8'), ('device', '<u8'),
+                                ('category', '<i4'), ('extension', '<i4'), ('fingerprint', 'S32')])
+
+    def __init__(self, paths, sizes, modified, category_codes, category_names: List[str],
+                 extension_codes, extension_names: List[str], fingerprints=None, indexes=None,
+                 inodes=None, devices=None, scope: Optional[Dict] = None):
+        """
+        🎭 Summon the ScanCatalog from ready-made columns
+
+        Args:
+            paths (List[str] or PathColumn): File paths, one per row
+            sizes (array-like): File sizes in bytes
+            modified (array-like): Modification timestamps
+            category_codes (array-like): Category code per row
+            category_names (List[str]): Names behind the category codes
+            extension_codes (array-like): Extension code per row
+            extension_names (List[str]): Names behind the extension codes
+            fingerprints (array-like, optional): Fingerprint per row as ASCII bytes, empty when unknown
+            indexes (Dict[str, np.ndarray], optional): Previously built secondary indexes
+            inodes (array-like, optional): Inode number per row, 0 when unknown
+            devices (array-like, optional): Device number per row, 0 when unknown
+            scope (Dict, optional): What was scanned: 'root' and the 'filters' that left files out
+
+        Raises:
+            ValueError: If the columns don't all have the same length
+        """
+        self.paths = paths if isinstance(paths, PathColumn) else PathColumn.from_strings(paths)
+        self.sizes = np.asarray(sizes, dtype=np.int64)
+        self.modified = np.asarray(modified, dtype=np.float64)
+        self.category_codes = np.asarray(category_codes, dtype=np.int32)
+        self.category_names = list(category_names)
+        self.extension_codes = np.asarray(extension_codes, dtype=np.int32)
+        self.extension_names = list(extension_names)
+        self.fingerprints = (np.zeros(self.sizes.size, dtype='S32') if fingerprints is None
+                             else np.asarray(fingerprints, dtype='S32'))
+        self.indexes = dict(indexes or {})
+        self.inodes = (np.zeros(self.sizes.size, dtype=np.uint64) if inodes is None
+                       else np.asarray(inodes, dtype=np.uint64))
+        self.devices = (np.zeros(self.sizes.size, dtype=np.uint64) if devices is None
+                        else np.asarray(devices, dtype=np.uint64))
+        self.scope = scope
+
+        lengths = {len(self.paths), self.sizes.size, self.modified.size, self.category_codes.size,
+                   self.extension_codes.size, self.fingerprints.size, self.inodes.size, self.devices.size}
+        if len(lengths) != 1:
+            raise ValueError(f"📊 The catalog's columns disagree about its length: {sorted(lengths)}")
+
+    @classmethod
+    def from_categorized(cls, categorized_files: Dict[str, List[Dict]],
+                         scope: Optional[Dict] = None) -> "ScanCatalog":
+        """
+        🏗️ Build a Catalog From the FileCategorizer's Sorted Chest
+
+        Args:
+            categorized_files (Dict[str, List[Dict]]): Category -> scanner records
+            scope (Dict, optional): What was scanned: 'root' and the 'filters' that left files out
+
+        Returns:
+            ScanCatalog: The columnar catalog
+        """
+        return cls.from_categorized_stream(((category, file) for category, files in categorized_files.items()
+                                            for file in files), scope)
+
+    @classmethod
+    def from_categorized_stream(cls, categorized: Iterable[Tuple[str, Dict]],
+                                scope: Optional[Dict] = None) -> "ScanCatalog":
+        """
+        🌊 Build a Catalog From (Category, Record) Pairs as They Flow By
+
+        No record is kept: each is poured into the columns and let go, so a
+        realm can be cataloged straight from the scanner.
+
+        Args:
+            categorized (Iterable[Tuple[str, Dict]]): (category, scanner record) pairs
+            scope (Dict, optional): What was scanned: 'root' and the 'filters' that left files out
+
+        Returns:
+            ScanCatalog: The columnar catalog
+        """
+        catalog = cls._from_rows((category, cls._extension_of(file['path']), file) for category, file in categorized)
+        catalog.scope = scope
+        return catalog
+
+    @classmethod
+    def from_organization_plan(cls, organization_plan: Dict[str, Dict[str, List[Dict]]]) -> "ScanCatalog":
+        """
+        🏗️ Build a Catalog From the IntelligentOrganizer's Blueprint
+
+        Args:
+            organization_plan (Dict): Category -> file type -> scanner records
+
+        Returns:
+            ScanCatalog: The columnar catalog
+        """
+        rows = ((category, file_type, file)
+                for category, file_types in organization_plan.items()
+                for file_type, files in file_types.items() for file in files)
+        return cls._from_rows(rows)
+
+    @classmethod
+    def _from_rows(cls, rows: Iterable[Tuple[str, str, Dict]]) -> "ScanCatalog":
+        """
+        🧱 Pour (category, extension, record) Rows Into Columns
+
+        Args:
+            rows (Iterable[Tuple[str, str, Dict]]): The rows to pour
+
+        Returns:
+            ScanCatalog: The columnar catalog
+        """
+        categories: Dict[str, int] = {}
+        extensions: Dict[str, int] = {}
+        # Packed buffers rather than lists: a row costs its path's bytes and about 80 more
+        heap, offsets = bytearray(), array('q', [0])
+        sizes, modified, category_codes, extension_codes = array('q'), array('d'), array('i'), array('i')
+        inodes, devices, fingerprints = array('Q'), array('Q'), bytearray()
+        for category, extension, file in rows:
+            heap += file['path'].encode('utf-8', 'surrogateescape')
+            offsets.append(len(heap))
+            inodes.append(file.get('inode') or 0)
+            devices.append(file.get('device') or 0)
+            fingerprints += (file.get('fingerprint') or '').encode('ascii', 'replace')[:32].ljust(32, b'\0')
+            sizes.append(file['size'])
+            modified.append(file.get('modified') or 0.0)
+            category_codes.append(categories.setdefault(category, len(categories)))
+            extension_codes.append(extensions.setdefault(extension, len(extensions)))
+        return cls(PathColumn(bytes(heap), np.frombuffer(offsets, dtype=np.int64)),
+                   np.frombuffer(sizes, dtype=np.int64), np.frombuffer(modified, dtype=np.float64),
+                   np.frombuffer(category_codes, dtype=np.int32), list(categories),
+                   np.frombuffer(extension_codes, dtype=np.int32), list(extensions),
+                   np.frombuffer(bytes(fingerprints), dtype='S32'),
+                   inodes=np.frombuffer(inodes, dtype=np.uint64), devices=np.frombuffer(devices, dtype=np.uint64))
+
+    @staticmethod
+    def _extension_of(file_path: str) -> str:
+        """
+        🔍 Name a File's Extension the Way the IntelligentOrganizer Does
+
+        Args:
+            file_path (str): The file's path
+
+        Returns:
+            str: The lower-case extension without its dot, or 'unknown'
+        """
+        _, extension = os.path.splitext(file_path)
+        return extension.lower()[1:] if extension else 'unknown'
+
+    def __len__(self) -> int:
+        return self.sizes.size
+
+    def build_indexes(self) -> Dict[str, np.ndarray]:
+        """
+        🔑 Sort the Row Numbers by Every Indexed Column
+
+        Each index is a permutation of the rows in ascending column order, so
+        range and equality lookups become binary searches instead of scans.
+
+        Returns:
+            Dict[str, np.ndarray]: Column name -> row numbers in column order
+        """
+        for column in self.INDEXED_COLUMNS:
+            if column not in self.indexes:
+                self.indexes[column] = np.argsort(getattr(self, column), kind='stable').astype(np.int64)
+        return self.indexes
+
+    def row(self, row: int) -> Dict:
+        """
+        📄 Turn One Row of Columns Back Into a Record
+
+        Args:
+            row (int): The row number
+
+        Returns:
+            Dict: The row's path, size, modification time, category, extension and fingerprint
+        """
+        return {
+            "path": self.paths[row],
+            "size": int(self.sizes[row]),
+            "modified": float(self.modified[row]),
+            "category": self.category_names[self.category_codes[row]],
+            "extension": self.extension_names[self.extension_codes[row]],
+            "fingerprint": self.fingerprints[row].decode('ascii') or None,
+        }
+
+    def to_categorized(self) -> Dict[str, List[Dict]]:
+        """
+        📚 Turn the Rows Back Into Scanner Records, Sorted by Category
+
+        This lets a plan be made from a saved catalog, without scanning or
+        categorizing again. Creation times are not kept in the catalog.
+
+        Returns:
+            Dict[str, List[Dict]]: Category -> records, as FileCategorizer.categorize returns them
+        """
+        categorized: Dict[str, List[Dict]] = {name: [] for name in self.category_names}
+        for category, record in self.iter_categorized():
+            categorized[category].append(record)
+        return categorized
+
+    def iter_categorized(self, chunk_rows: int = 65536) -> Generator[Tuple[str, Dict], None, None]:
+        """
+        🌊 Stream the Rows Back as (Category, Scanner Record) Pairs, One at a Time
+
+        Columns are turned into Python values a chunk at a time, so a stream
+        over millions of rows stays swift without ever holding them all.
+
+        Args:
+            chunk_rows (int): Rows converted at once
+
+        Yields:
+            Tuple[str, Dict]: The row's category and its record
+        """
+        for start in range(0, len(self), chunk_rows):
+            stop = min(start + chunk_rows, len(self))
+            columns = zip((self.paths[row] for row in range(start, stop)), self.sizes[start:stop].tolist(),
+                          self.modified[start:stop].tolist(), self.category_codes[start:stop].tolist(),
+                          self.inodes[start:stop].tolist(), self.devices[start:stop].tolist(),
+                          self.fingerprints[start:stop].tolist())
+            for path, size, modified, category, inode, device, fingerprint in columns:
+                yield self.category_names[category], {
+                    'path': path,
+                    'name': os.path.basename(path),
+                    'extension': os.path.splitext(path)[1],
+                    'size': size,
+                    'created': None,
+                    'modified': modified,
+                    'inode': inode,
+                    'device': device,
+                    'fingerprint': fingerprint.decode('ascii') or None,
+                }
+
+    def save(self, path) -> None:
+        """
+        💾 Preserve the Catalog, Indexes Included, in One NumPy Archive
+
+        A path ending in ``SNAPSHOT_SUFFIX`` is written as a memory-mapped
+        snapshot instead (see ``save_snapshot``).
+
+        Args:
+            path (str or Path): Where to store the catalog (an .npz or .wzcat file)
+        """
+        if str(path).endswith(self.SNAPSHOT_SUFFIX):
+            self.save_snapshot(path)
+            return
+        self.build_indexes()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as handle:
+            np.savez(handle,
+                     path_heap=np.frombuffer(self.paths.heap, dtype=np.uint8),
+                     path_offsets=self.paths.offsets,
+                     sizes=self.sizes,
+                     modified=self.modified,
+                     category_codes=self.category_codes,
+                     category_names=np.array(self.category_names, dtype=str),
+                     extension_codes=self.extension_codes,
+                     extension_names=np.array(self.extension_names, dtype=str),
+                     fingerprints=self.fingerprints,
+                     inodes=self.inodes,
+                     devices=self.devices,
+                     scope=np.array(json.dumps(self.scope)),
+                     **{f"index_{column}": index for column, index in self.indexes.items()})
+
+    @classmethod
+    def load(cls, path) -> "ScanCatalog":
+        """
+        📂 Bring a Preserved Catalog Back to Life
+
+        Args:
+            path (str or Path): The .npz or .wzcat file written by ``save``
+
+        Returns:
+            ScanCatalog: The catalog, with its secondary indexes
+        """
+        if str(path).endswith(cls.SNAPSHOT_SUFFIX):
+            return cls.load_snapshot(path)
+        with np.load(path, allow_pickle=False) as archive:
+            return cls(PathColumn(archive['path_heap'].tobytes(), archive['path_offsets']),
+                       archive['sizes'], archive['modified'],
+                       archive['category_codes'], archive['category_names'].tolist(),
+                       archive['extension_codes'], archive['extension_names'].tolist(),
+                       archive['fingerprints'],
+                       {name[len("index_"):]: archive[name] for name in archive.files if name.startswith("index_")},
+                       # Catalogs saved before inodes were kept load with unknown ones
+                       inodes=archive['inodes'] if 'inodes' in archive.files else None,
+                       devices=archive['devices'] if 'devices' in archive.files else None,
+                       scope=json.loads(archive['scope'].item()) if 'scope' in archive.files else None)
+
+    def save_snapshot(self, path) -> None:
+        """
+        🗺️ Preserve the Catalog as a Snapshot That Loads in an Instant
+
+        The file is laid out so it can be memory-mapped and used as it lies:
+
+        - 🏷️ a header: magic, version, row count, and where the directory is
+        - 📇 ``records``: one fixed-layout SNAPSHOT_RECORD per row
+        - 🧵 ``path_offsets`` and ``path_heap``: the PathColumn, as is
+        - 🔑 ``index_<column>``: the secondary indexes
+        - 🗂️ a JSON directory naming every section's offset, type and length,
+          along with the interned category and extension names and the scope
+
+        Sections start on 64-byte boundaries. The snapshot replaces any earlier
+        one atomically, so a catalog still mapped from the old file (as when a
+        scan is compared with its predecessor) keeps reading the old contents.
+
+        Args:
+            path (str or Path): Where to store the snapshot
+        """
+        self.build_indexes()
+        records = np.empty(len(self), dtype=self.SNAPSHOT_RECORD)
+        for field, column in (('size', self.sizes), ('modified', self.modified), ('inode', self.inodes),
+                              ('device', self.devices), ('category', self.category_codes),
+                              ('extension', self.extension_codes), ('fingerprint', self.fingerprints)):
+            records[field] = column
+        sections = [("records", records),
+                    ("path_offsets", self.paths.offsets.astype('<i8')),
+                    ("path_heap", np.frombuffer(self.paths.heap, dtype=np.uint8))]
+        sections += [(f"index_{column}", index.astype('<i8')) for column, index in self.indexes.items()]
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        temporary = f"{path}.tmp"
+        directory = {"category_names": self.category_names, "extension_names": self.extension_names,
+                     "scope": self.scope, "sections": {}}
+        with open(temporary, 'wb') as handle:
+            handle.write(b"\0" * self.SNAPSHOT_HEADER.size)
+            for name, array in sections:
+                handle.write(b"\0" * (-handle.tell() % self.SNAPSHOT_ALIGNMENT))
+                directory["sections"][name] = [handle.tell(), array.size]
+                handle.write(array.tobytes())
+            directory_offset = handle.tell()
+            encoded = json.dumps(directory, ensure_ascii=False).encode('utf-8', 'surrogateescape')
+            handle.write(encoded)
+            handle.seek(0)
+            handle.write(self.SNAPSHOT_HEADER.pack(self.SNAPSHOT_MAGIC, self.SNAPSHOT_VERSION, 0, len(self),
+                                                   directory_offset, len(encoded)))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load_snapshot(cls, path) -> "ScanCatalog":
+        """
+        ⚡ Open a Snapshot by Mapping It Into Memory, Reading Nothing Up Front
+
+        Every column is a NumPy view straight into the mapped file, so opening
+        a catalog of millions of rows costs a few page faults; pages are read
+        by the kernel only when a summary or query first touches them, and
+        are shared between processes that map the same snapshot.
+
+        Args:
+            path (str or Path): The snapshot written by ``save_snapshot``
+
+        Returns:
+            ScanCatalog: The catalog, with its secondary indexes, all read-only
+
+        Raises:
+            ValueError: If the file is not a snapshot this version understands
+        """
+        with open(path, 'rb') as handle:
+            header = handle.read(cls.SNAPSHOT_HEADER.size)
+            if len(header) < cls.SNAPSHOT_HEADER.size:
+                raise ValueError(f"🗺️ Not a catalog snapshot: {path}")
+            magic, version, _, rows, directory_offset, directory_length = cls.SNAPSHOT_HEADER.unpack(header)
+            if magic != cls.SNAPSHOT_MAGIC:
+                raise ValueError(f"🗺️ Not a catalog snapshot: {path}")
+            if version != cls.SNAPSHOT_VERSION:
+                raise ValueError(f"🗺️ Catalog snapshot version {version} is not understood: {path}")
+            mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        directory = json.loads(bytes(mapping[directory_offset:directory_offset + directory_length])
+                               .decode('utf-8', 'surrogateescape'))
+        sections = directory["sections"]
+
+        def view(name, dtype):
+            offset, count = sections[name]
+            return np.frombuffer(mapping, dtype=dtype, count=count, offset=offset)
+
+        records = view("records", cls.SNAPSHOT_RECORD)
+        heap_offset, heap_length = sections["path_heap"]
+        return cls(PathColumn(memoryview(mapping)[heap_offset:heap_offset + heap_length], view("path_offsets", '<i8')),
+                   records['size'], records['modified'],
+                   records['category'], directory["category_names"],
+                   records['extension'], directory["extension_names"],
+                   records['fingerprint'],
+                   {name[len("index_"):]: view(name, '<i8') for name in sections if name.startswith("index_")},
+                   inodes=records['inode'], devices=records['device'], scope=directory.get("scope"))
+
+    @property
+    def total_files(self) -> int:
+        return int(self.sizes.size)
+
+    @property
+    def total_bytes(self) -> int:
+        return int(self.sizes.sum())
+
+    def by_category(self) -> Dict[str, Dict]:
+        """
+        🗺️ Count Files, Bytes and Distinct Extensions in Every Category
+
+        Returns:
+            Dict[str, Dict]: Category -> {"total_files", "total_size", "groups"}
+        """
+        count = len(self.category_names)
+        files = np.bincount(self.category_codes, minlength=count)
+        size = np.bincount(self.category_codes, weights=self.sizes, minlength=count)
+        pairs = np.unique(self.category_codes.astype(np.int64) * max(len(self.extension_names), 1)
+                          + self.extension_codes)
+        groups = np.bincount(pairs // max(len(self.extension_names), 1), minlength=count)
+        return {
+            name: {"total_files": int(files[code]), "total_size": int(size[code]), "groups": int(groups[code])}
+            for code, name in enumerate(self.category_names)
+        }
+
+    def by_extension(self) -> Dict[str, Dict]:
+        """
+        🧪 Count Files and Bytes for Every Extension
+
+        Returns:
+            Dict[str, Dict]: Extension -> {"total_files", "total_size"}, largest first
+        """
+        count = len(self.extension_names)
+        files = np.bincount(self.extension_codes, minlength=count)
+        size = np.bincount(self.extension_codes, weights=self.sizes, minlength=count)
+        order = np.argsort(-size, kind='stable')
+        return {self.extension_names[code]: {"total_files": int(files[code]), "total_size": int(size[code])}
+                for code in order.tolist()}
+
+    def size_histogram(self) -> Dict[str, Dict]:
+        """
+        📏 Sort Every File Into a Size Bucket
+
+        Returns:
+            Dict[str, Dict]: Bucket label -> {"total_files", "total_size"}
+        """
+        edges = np.array([edge for _, edge in self.SIZE_BUCKETS[:-1]], dtype=np.int64)
+        return self._bucketize(np.searchsorted(edges, self.sizes, side='right'), self.SIZE_BUCKETS)
+
+    def age_histogram(self, now: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        ⏳ Sort Every File Into an Age Bucket by Its Last Modification
+
+        Args:
+            now (float, optional): The reference timestamp, defaults to the present
+
+        Returns:
+            Dict[str, Dict]: Bucket label -> {"total_files", "total_size"}
+        """
+        now = time.time() if now is None else now
+        age_days = (now - self.modified) / 86400.0
+        edges = np.array([edge for _, edge in self.AGE_BUCKETS[:-1]], dtype=np.float64)
+        return self._bucketize(np.searchsorted(edges, age_days, side='right'), self.AGE_BUCKETS)
+
+    def _bucketize(self, bucket_codes: np.ndarray, buckets) -> Dict[str, Dict]:
+        """
+        🪣 Tally Files and Bytes per Bucket
+
+        Args:
+            bucket_codes (np.ndarray): Bucket index of each row
+            buckets (tuple): (label, edge) pairs
+
+        Returns:
+            Dict[str, Dict]: Bucket label -> {"total_files", "total_size"}
+        """
+        files = np.bincount(bucket_codes, minlength=len(buckets))
+        size = np.bincount(bucket_codes, weights=self.sizes, minlength=len(buckets))
+        return {label: {"total_files": int(files[code]), "total_size": int(size[code])}
+                for code, (label, _) in enumerate(buckets)}
+
+    def largest(self, count: int = 10) -> List[Dict]:
+        """
+        🐘 Find the Giants of the Kingdom
+
+        Args:
+            count (int): How many giants to return
+
+        Returns:
+            List[Dict]: The largest files, biggest first
+        """
+        count = min(count, len(self))
+        if count <= 0:
+            return []
+        top = np.argpartition(-self.sizes, count - 1)[:count]
+        top = top[np.argsort(-self.sizes[top], kind='stable')]
+        return [self.row(row) for row in top.tolist()]
@@ -0,0 +1,171 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Generator, List, Optional
+
+
+class ScanCheckpoint:
+    """
+    🔖 The ScanCheckpoint: Bookmark for Expeditions Lasting Many Hours 📍
+
+    A long expedition interrupted by a crash or a Ctrl-C should not have to
+    start again from the gates. The bookmark keeps two scrolls in its folder:
+
+    - 📜 ``records.jsonl``: every record the scanner found, appended as it goes
+    - 🧭 ``frontier.json``: the directories still waiting to be explored, how
+      many were already finished, and how many bytes of ``records.jsonl``
+      belong to that state
+
+    Saving appends new records and atomically replaces the small frontier
+    file, so it is cheap enough to do every few seconds. On resume, anything
+    written to ``records.jsonl`` after the last saved frontier is cut off:
+    those directories are still on the frontier and will be explored again.
+    Once an expedition has explored everything, both scrolls are cleared,
+    leaving nothing stale to resume.
+
+    Attributes:
+        directory (Path): Where the bookmark's scrolls are kept
+        interval (float): Minimum seconds between two saves
+    """
+
+    RECORDS_FILE = "records.jsonl"
+    FRONTIER_FILE = "frontier.json"
+
+    def __init__(self, directory, interval: float = 5.0):
+        """
+        🎭 Summon the ScanCheckpoint into existence!
+
+        Args:
+            directory (str or Path): Where the bookmark's scrolls are kept
+            interval (float): Minimum seconds between two saves
+        """
+        self.directory = Path(directory)
+        self.interval = interval
+        self._records = None
+        self._last_save = 0.0
+
+    @property
+    def records_path(self) -> Path:
+        return self.directory / self.RECORDS_FILE
+
+    @property
+    def frontier_path(self) -> Path:
+        return self.directory / self.FRONTIER_FILE
+
+    def load(self, root_directory: str) -> Optional[Dict]:
+        """
+        📖 Read the Last Saved Position of an Earlier Expedition
+
+        Args:
+            root_directory (str): The realm being explored, which must match the bookmark's
+
+        Returns:
+            Dict: The saved state, or None if there is nothing to resume
+
+        Raises:
+            ValueError: If the bookmark belongs to a different realm
+        """
+        if not self.frontier_path.exists():
+            return None
+        with open(self.frontier_path, encoding='utf-8') as handle:
+            state = json.load(handle)
+        if state["root"] != str(root_directory):
+            raise ValueError(f"🔖 This bookmark belongs to {state['root']}, not {root_directory}")
+        return state
+
+    def restored_records(self, state: Dict) -> Generator[Dict, None, None]:
+        """
+        📜 Replay the Records Saved Together With a Frontier
+
+        Args:
+            state (Dict): The state returned by ``load``
+
+        Yields:
+            Dict: Every record that belongs to the saved state
+        """
+        with open(self.records_path, 'rb') as handle:
+            remaining = state["records_offset"]
+            for line in handle:
+                if remaining <= 0:
+                    break
+                remaining -= len(line)
+                yield json.loads(line)
+
+    def start(self, state: Optional[Dict] = None):
+        """
+        🚩 Open the Scrolls for Writing, Fresh or Continuing a Saved State
+
+        Args:
+            state (Dict, optional): The state being resumed; None starts from scratch
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if state is None:
+            if self.frontier_path.exists():
+                self.frontier_path.unlink()
+            self._records = open(self.records_path, 'wb')
+        else:
+            self._records = open(self.records_path, 'r+b')
+            self._records.truncate(state["records_offset"])
+            self._records.seek(state["records_offset"])
+        self._last_save = time.monotonic()
+
+    def append(self, records: List[Dict]):
+        """
+        ✍️ Note Down Records Found Since the Last Save
+
+        Args:
+            records (List[Dict]): The records of one finished directory
+        """
+        for record in records:
+            self._records.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n")
+
+    def maybe_save(self, root_directory: str, frontier: List[str], completed: int, force: bool = False) -> bool:
+        """
+        💾 Save the Frontier If the Interval Has Passed (or When Forced)
+
+        Args:
+            root_directory (str): The realm being explored
+            frontier (List[str]): Directories still waiting to be explored
+            completed (int): Directories already finished
+            force (bool): Save even if the interval hasn't passed
+
+        Returns:
+            bool: True if a save happened
+        """
+        if not force and time.monotonic() - self._last_save < self.interval:
+            return False
+        self._records.flush()
+        os.fsync(self._records.fileno())
+        state = {
+            "root": str(root_directory),
+            "frontier": frontier,
+            "completed_directories": completed,
+            "records_offset": self._records.tell(),
+            "saved_at": time.time(),
+        }
+        temporary = self.frontier_path.with_suffix(".tmp")
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            json.dump(state, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.frontier_path)
+        self._last_save = time.monotonic()
+        return True
+
+    def clear(self):
+        """
+        🧹 Tear Up the Scrolls of an Expedition That Reached Its End
+        """
+        self.close()
+        for path in (self.frontier_path, self.frontier_path.with_suffix(".tmp"), self.records_path):
+            if path.exists():
+                path.unlink()
+
+    def close(self):
+        """
+        📕 Close the Records Scroll
+        """
+        if self._records is not None:
+            self._records.close()
+            self._records = None
@@ -0,0 +1,293 @@
+import os
+import math
+import random
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.file_scanner import FileScanner
+from core.file_categorizer import FileCategorizer
+
+
+_FINGERPRINT = re.compile(r'^[0-9a-f]{32}$')
+
+
+class ScanEstimator:
+    """
+    🔭 The ScanEstimator: Far-Seeing Oracle of Enormous Realms 🌌
+
+    Before sending the FileScanner on a journey of many hours, this oracle
+    casts a handful of random probes into the realm and extrapolates how many
+    files, bytes, categories and duplicates are hiding there.
+
+    Every probe walks from the root down to a leaf, choosing one random
+    subdirectory at each level (Knuth's tree-size estimator). The counts seen
+    along the way, multiplied by the branching factors above them, give an
+    unbiased guess for the whole tree. Averaging many probes narrows the guess,
+    and the spread between probes gives us the confidence interval.
+
+    Attributes:
+        scanner (FileScanner): Guards the root and lends us its fingerprint spell
+        categorizer (FileCategorizer): Sorts the sampled files into categories
+        files_per_directory (int): How many files to inspect in each visited directory
+        max_fingerprints (int): How many sampled files may be read for duplicate hunting
+        max_fingerprint_size (int): Sampled files larger than this many bytes are never read
+        duplicate_share (float): Part of the time budget kept for reading files in the duplicate hunt
+    """
+
+    # 📏 The z-score for a two-sided 95% confidence interval
+    Z_95 = 1.96
+
+    def __init__(self, root_directory: str, categorizer: Optional[FileCategorizer] = None,
+                 files_per_directory: int = 8, max_fingerprints: int = 200,
+                 max_cached_directories: int = 10000, seed: Optional[int] = None,
+                 max_fingerprint_size: int = 64 * 1024 * 1024, duplicate_share: float = 0.25):
+        """
+        🎭 Summon the ScanEstimator into existence!
+
+        Args:
+            root_directory (str): The realm whose size we want to foresee
+            categorizer (FileCategorizer, optional): The sorter used for the sampled files
+            files_per_directory (int): Files inspected per visited directory
+            max_fingerprints (int): Upper bound on sampled files that get fingerprinted
+            max_cached_directories (int): Directory listings remembered between probes
+            seed (int, optional): Seed for the random probes, for repeatable visions
+            max_fingerprint_size (int): Largest sampled file, in bytes, read in the duplicate hunt
+            duplicate_share (float): Part of the time budget kept for the duplicate hunt, between 0 and 1
+
+        Raises:
+            ValueError: If the chosen realm doesn't exist or isn't a directory, or the share is out of range
+        """
+        if not 0 <= duplicate_share <= 1:
+            raise ValueError("🔭 The duplicate hunt's share of the time budget must lie between 0 and 1")
+        self.scanner = FileScanner(root_directory)
+        self.categorizer = categorizer or FileCategorizer()
+        self.files_per_directory = files_per_directory
+        self.max_fingerprints = max_fingerprints
+        self.max_fingerprint_size = max_fingerprint_size
+        self.duplicate_share = duplicate_share
+        self.max_cached_directories = max_cached_directories
+        self._random = random.Random(seed)
+        self._listings: Dict[str, Tuple[List[str], List[str]]] = {}
+
+    def estimate(self, time_budget: float = 10.0, max_probes: int = 100000, min_probes: int = 2,
+                 min_fingerprints: int = 2) -> Dict:
+        """
+        🔮 Gaze Into the Realm and Foretell Its Size
+
+        The probes get the time budget minus the duplicate hunt's share; the
+        hunt then reads files until the whole budget is spent.
+
+        Args:
+            time_budget (float): Seconds we may spend gazing
+            max_probes (int): Stop after this many probes even if time remains
+            min_probes (int): Probes cast even if the time budget is already spent
+            min_fingerprints (int): Files read in the duplicate hunt even if the time budget is already spent
+
+        Returns:
+            Dict: Extrapolated totals with 95% confidence intervals
+        """
+        started = time.monotonic()
+        deadline = started + time_budget * (1 - self.duplicate_share)
+        file_estimates, byte_estimates = [], []
+        category_files = defaultdict(list)
+        category_bytes = defaultdict(list)
+        sampled_files = []
+
+        probes = 0
+        while probes < max_probes and (probes < min_probes or time.monotonic() < deadline):
+            files, size, categories, samples = self._probe()
+            probes += 1
+            file_estimates.append(files)
+            byte_estimates.append(size)
+            for category in set(category_files) | set(categories):
+                if category not in category_files:
+                    category_files[category] = [0.0] * (probes - 1)
+                    category_bytes[category] = [0.0] * (probes - 1)
+                counted, weighed = categories.get(category, (0.0, 0.0))
+                category_files[category].append(counted)
+                category_bytes[category].append(weighed)
+            sampled_files.extend(samples)
+        duplicates = self._estimate_duplicates(sampled_files, started + time_budget, min_fingerprints)
+
+        return {
+            "root": str(self.scanner.root_directory),
+            "probes": probes,
+            "elapsed_seconds": time.monotonic() - started,
+            "files": self._confidence_interval(file_estimates),
+            "bytes": self._confidence_interval(byte_estimates),
+            "categories": {
+                category: {
+                    "files": self._confidence_interval(category_files[category]),
+                    "bytes": self._confidence_interval(category_bytes[category]),
+                }
+                for category in sorted(category_files)
+            },
+            "duplicates": duplicates,
+        }
+
+    def _probe(self):
+        """
+        🎯 Cast a Single Random Probe From Root to Leaf
+
+        Returns:
+            tuple: (file estimate, byte estimate, {category: (files, bytes)}, sampled file records)
+        """
+        weight = 1.0
+        total_files = 0.0
+        total_bytes = 0.0
+        categories = defaultdict(lambda: [0.0, 0.0])
+        samples = []
+        directory = str(self.scanner.root_directory)
+
+        while directory is not None:
+            file_names, subdirectories = self._list_directory(directory)
+            if file_names:
+                picked = self._random.sample(file_names, min(self.files_per_directory, len(file_names)))
+                records = [record for record in (self._stat_file(directory, name) for name in picked) if record]
+                if records:
+                    # Each inspected file stands in for this many files of the whole realm
+                    represents = weight * len(file_names) / len(records)
+                    total_files += weight * len(file_names)
+                    for category, files in self.categorizer.categorize(records).items():
+                        for record in files:
+                            total_bytes += represents * record['size']
+                            categories[category][0] += represents
+                            categories[category][1] += represents * record['size']
+                    samples.extend(records)
+
+            if not subdirectories:
+                break
+            weight *= len(subdirectories)
+            directory = os.path.join(directory, self._random.choice(subdirectories))
+
+        return total_files, total_bytes, {k: tuple(v) for k, v in categories.items()}, samples
+
+    def _list_directory(self, directory: str) -> Tuple[List[str], List[str]]:
+        """
+        📖 Read (or Remember) the Table of Contents of a Directory
+
+        Args:
+            directory (str): The directory to list
+
+        Returns:
+            tuple: (file names, subdirectory names), both sorted for repeatable probes
+        """
+        cached = self._listings.get(directory)
+        if cached is not None:
+            return cached
+
+        file_names, subdirectories = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            file_names.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            print(f"🚫 The guards won't let us peek into: {directory}")
+
+        listing = (sorted(file_names), sorted(subdirectories))
+        if len(self._listings) < self.max_cached_directories:
+            self._listings[directory] = listing
+        return listing
+
+    @staticmethod
+    def _stat_file(directory: str, name: str) -> Optional[Dict]:
+        """
+        📏 Measure a Sampled File Without Reading Its Contents
+
+        Args:
+            directory (str): Where the file lives
+            name (str): The file's name
+
+        Returns:
+            Dict: A scanner-shaped record without a fingerprint, or None if it vanished
+        """
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return {
+            'path': path,
+            'name': name,
+            'extension': os.path.splitext(name)[1],
+            'size': stat.st_size,
+            'created': stat.st_ctime,
+            'modified': stat.st_mtime,
+        }
+
+    def _estimate_duplicates(self, sampled_files: List[Dict], deadline: Optional[float] = None,
+                             min_fingerprints: int = 0) -> Dict:
+        """
+        👯 Hunt for Twins Among the Sampled Files
+
+        Only files whose size matches another sampled file can be twins, so only
+        those are fingerprinted, up to ``max_fingerprints`` of them and none
+        larger than ``max_fingerprint_size``. Files of one size are read one
+        after another, so the hunt completes whole families before the deadline
+        stops it. The result is a lower bound: twins whose partner was never
+        sampled, or never read, stay hidden.
+
+        Args:
+            sampled_files (List[Dict]): Every record inspected by the probes
+            deadline (float, optional): ``time.monotonic()`` moment after which no more files are read
+            min_fingerprints (int): Files read even if the deadline has passed
+
+        Returns:
+            Dict: How many sampled files were read and how many turned out to be twins
+        """
+        unique = {record['path']: record for record in sampled_files}
+        by_size = defaultdict(list)
+        for record in unique.values():
+            by_size[record['size']].append(record)
+
+        families = [group for size, group in by_size.items() if len(group) > 1 and size <= self.max_fingerprint_size]
+        self._random.shuffle(families)
+        candidates = [record for group in families for record in group][:self.max_fingerprints]
+
+        seen = defaultdict(int)
+        fingerprinted = 0
+        for record in candidates:
+            if fingerprinted >= min_fingerprints and deadline is not None and time.monotonic() >= deadline:
+                break
+            fingerprint = self.scanner._generate_file_fingerprint(Path(record['path']))
+            fingerprinted += 1
+            if _FINGERPRINT.match(fingerprint):  # Unreadable files all share a word like "Error", not a digest
+                seen[(record['size'], fingerprint)] += 1
+        duplicates = sum(count - 1 for count in seen.values() if count > 1)
+
+        return {
+            "sampled_files": len(unique),
+            "fingerprinted_files": fingerprinted,
+            "duplicate_files": duplicates,
+            "duplicate_fraction_lower_bound": duplicates / len(unique) if unique else 0.0,
+        }
+
+    @classmethod
+    def _confidence_interval(cls, values: List[float]) -> Dict:
+        """
+        📐 Turn a Pile of Probe Results Into an Estimate With Error Bars
+
+        Args:
+            values (List[float]): One estimate per probe
+
+        Returns:
+            Dict: Mean estimate and the 95% confidence bounds (never below zero)
+        """
+        count = len(values)
+        if count == 0:
+            return {"estimate": 0.0, "low": 0.0, "high": 0.0}
+        mean = sum(values) / count
+        if count == 1:
+            return {"estimate": mean, "low": mean, "high": mean}
+        variance = sum((value - mean) ** 2 for value in values) / (count - 1)
+        margin = cls.Z_95 * math.sqrt(variance / count)
+        return {"estimate": mean, "low": max(0.0, mean - margin), "high": mean + margin}
@@ -0,0 +1,106 @@
+import heapq
+import os
+from typing import List
+
+
+class ScanFrontier:
+    """
+    🧭 The ScanFrontier: The Directories Still Waiting, in the Order Worth Exploring 🗺️
+
+    By default the frontier is a plain stack, so the walk goes depth first in
+    name order. When a walk may be cut short by its budget, the subtrees most
+    worth seeing should come first, so the frontier can instead be a priority
+    queue keyed by a heuristic, looked up with one ``stat`` per directory:
+
+    - 🕰️ ``recent``: directories whose modification time is newest first
+      (a directory's time changes whenever files are added, removed or renamed in it)
+    - 🐘 ``largest``: directories with the biggest listings first (a directory's
+      own size grows with the number of entries it holds)
+
+    Either way the frontier can be written to a checkpoint as a list whose last
+    path is explored next, and rebuilt from such a list.
+
+    Attributes:
+        priority (str): 'walk', 'recent' or 'largest'
+    """
+
+    PRIORITIES = ("walk", "recent", "largest")
+
+    def __init__(self, priority: str = "walk"):
+        """
+        🎭 Summon the ScanFrontier into existence!
+
+        Args:
+            priority (str): 'walk' (depth first, by name), 'recent' or 'largest'
+
+        Raises:
+            ValueError: If the priority is unknown
+        """
+        if priority not in self.PRIORITIES:
+            raise ValueError(f"🧭 Unknown scan priority '{priority}', choose one of {', '.join(self.PRIORITIES)}")
+        self.priority = priority
+        self._stack: List[str] = []
+        self._heap: List[tuple] = []
+
+    def _key(self, directory: str) -> float:
+        try:
+            stat = os.stat(directory)
+        except OSError:
+            return 0.0  # Unreadable directories wait behind everything else
+        return -(stat.st_mtime if self.priority == "recent" else stat.st_size)
+
+    def add(self, directories: List[str]):
+        """
+        ➕ Put Directories on the Frontier
+
+        Args:
+            directories (List[str]): Subdirectories of one directory, in name order
+        """
+        if self.priority == "walk":
+            # Reversed so the walk pops them in name order
+            self._stack.extend(reversed(directories))
+        else:
+            for directory in directories:
+                heapq.heappush(self._heap, (self._key(directory), directory))
+
+    def peek(self) -> str:
+        return self._stack[-1] if self.priority == "walk" else self._heap[0][1]
+
+    def pop(self) -> str:
+        return self._stack.pop() if self.priority == "walk" else heapq.heappop(self._heap)[1]
+
+    def __len__(self) -> int:
+        return len(self._stack) + len(self._heap)
+
+    def snapshot(self) -> List[str]:
+        """
+        📸 The Waiting Directories, the Next One to Explore Last (as Checkpoints Keep Them)
+
+        Returns:
+            List[str]: The frontier's directories
+        """
+        if self.priority == "walk":
+            return list(self._stack)
+        return [directory for _, directory in sorted(self._heap, reverse=True)]
+
+    def restore(self, directories: List[str]):
+        """
+        📖 Rebuild the Frontier From a Snapshot
+
+        Args:
+            directories (List[str]): A snapshot, the next one to explore last
+        """
+        if self.priority == "walk":
+            self._stack = list(directories)
+        else:
+            self._heap = []
+            self.add(list(reversed(directories)))
+
+    def pending(self) -> List[str]:
+        """
+        ⏭️ The Waiting Directories in the Order They Would Be Explored
+
+        Returns:
+            List[str]: The frontier's directories, next one first
+        """
+        return list(reversed(self.snapshot()))
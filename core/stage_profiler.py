@@ -0,0 +1,180 @@
+import cProfile
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Generator, List, Optional, Tuple
+
+
+class StageProfiler:
+    """
+    🔬 The StageProfiler: A Spyglass Trained on Every Chapter of the Quest 🔥
+
+    When a quest is slow, the profiler tells which spells the time went to,
+    one pipeline stage at a time, without attaching any outside tool:
+
+    1. 🎯 ``sample`` (the default) interrupts the quest every few milliseconds
+       of wall-clock time (``signal.setitimer``) and notes the stack of every
+       working thread. It costs a few percent, sees time spent waiting for
+       disks as well as time spent computing, and yields true call stacks.
+    2. 📏 ``cprofile`` counts every call with the deterministic ``cProfile``.
+       Timings are exact but every call pays for being counted, and only
+       caller → callee pairs are known, so its stacks are two frames deep.
+
+    Each stage's stacks are kept in collapsed form (``frame;frame;frame``
+    with a weight), ready for any flamegraph renderer, together with the
+    time spent in every function.
+
+    Attributes:
+        mode (str): One of MODES
+        interval (float): Seconds between samples in ``sample`` mode
+        stages (Dict[str, Dict]): Stage -> 'seconds' (wall clock), 'stacks' (collapsed stack -> weight),
+            'unit' of the weights ('samples' or 'microseconds') and 'functions' (label -> 'self_seconds',
+            'total_seconds' and 'calls', None when sampled)
+    """
+
+    MODES = ("sample", "cprofile")
+
+    def __init__(self, mode: str = "sample", interval: float = 0.005):
+        """
+        🎭 Summon the StageProfiler into existence!
+
+        Args:
+            mode (str): One of MODES
+            interval (float): Seconds between samples in ``sample`` mode
+
+        Raises:
+            ValueError: If the mode is unknown, the interval not positive, or sampling unavailable here
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"🔬 Unknown profiling mode '{mode}', expected one of {', '.join(self.MODES)}")
+        if interval <= 0:
+            raise ValueError("🔬 The sampling interval must be a positive number of seconds")
+        if mode == "sample" and not hasattr(signal, "setitimer"):
+            raise ValueError("🔬 This platform has no interval timers to sample with; use the 'cprofile' mode")
+        self.mode = mode
+        self.interval = interval
+        self.stages: Dict[str, Dict] = {}
+        self._samples: Optional[Counter] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        """
+        🎬 Profile Everything Done Inside the ``with`` Block as One Stage
+
+        The stage is recorded even when the block raises, so an interrupted
+        quest still leaves its profile behind. A stage entered twice adds to
+        what it recorded before.
+
+        Args:
+            name (str): Name of the stage
+
+        Raises:
+            ValueError: If another stage is still being profiled, or sampling outside the main thread
+        """
+        if self._samples is not None:
+            raise ValueError("🔬 Stages cannot be nested; the spyglass watches one stage at a time")
+        if self.mode == "sample" and threading.current_thread() is not threading.main_thread():
+            raise ValueError("🔬 Sampling relies on signals, which only the main thread receives")
+        self._samples = Counter()
+        started = time.perf_counter()
+        profile = None
+        if self.mode == "sample":
+            previous_handler = signal.signal(signal.SIGALRM, self._sample)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        else:
+            profile = cProfile.Profile()
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is None:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+                recorded = self._from_samples(self._samples)
+            else:
+                profile.disable()
+                recorded = self._from_profile(profile)
+            self._samples = None
+            self._record(name, time.perf_counter() - started, *recorded)
+
+    def _sample(self, signum, frame):
+        """
+        📸 Note the Stack of Every Worker Thread (the SIGALRM Handler)
+
+        Daemon threads, such as the progress bar's monitor, idle on the side
+        of the quest rather than doing its work, and are left out.
+        """
+        skipped = {thread.ident for thread in threading.enumerate() if thread.daemon}
+        skipped.add(threading.main_thread().ident)  # Its frame is the handler's; the interrupted one is given
+        self._samples[self._stack(frame)] += 1
+        for thread_id, thread_frame in sys._current_frames().items():
+            if thread_id not in skipped:
+                self._samples[self._stack(thread_frame)] += 1
+
+    @staticmethod
+    def _stack(frame) -> Tuple[str, ...]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    def _from_samples(self, samples: Counter) -> Tuple[Counter, Dict[str, Dict], str]:
+        functions: Dict[str, Dict] = {}
+        for stack, count in samples.items():
+            for label in set(stack):
+                function = functions.setdefault(label, {"self_seconds": 0.0, "total_seconds": 0.0, "calls": None})
+                function["total_seconds"] += count * self.interval
+            functions[stack[-1]]["self_seconds"] += count * self.interval
+        return Counter({";".join(stack): count for stack, count in samples.items()}), functions, "samples"
+
+    @staticmethod
+    def _from_profile(profile: cProfile.Profile) -> Tuple[Counter, Dict[str, Dict], str]:
+        def label(function):
+            filename, line, name = function
+            if filename == '~':
+                return name  # Built-ins have no file
+            return f"{name} ({os.path.basename(filename)}:{line})"
+
+        stacks, functions = Counter(), {}
+        for function, (_, calls, self_time, total_time, callers) in pstats.Stats(profile).stats.items():
+            functions[label(function)] = {"self_seconds": self_time, "total_seconds": total_time, "calls": calls}
+            if not callers:
+                stacks[label(function)] += round(self_time * 1e6)
+            for caller, (_, _, edge_self_time, _) in callers.items():
+                stacks[f"{label(caller)};{label(function)}"] += round(edge_self_time * 1e6)
+        return +stacks, functions, "microseconds"
+
+    def _record(self, name: str, seconds: float, stacks: Counter, functions: Dict[str, Dict], unit: str):
+        recorded = self.stages.setdefault(name, {"seconds": 0.0, "stacks": Counter(), "unit": unit,
+                                                 "functions": {}})
+        recorded["seconds"] += seconds
+        recorded["stacks"].update(stacks)
+        for label, function in functions.items():
+            known = recorded["functions"].setdefault(label, {"self_seconds": 0.0, "total_seconds": 0.0,
+                                                             "calls": None})
+            known["self_seconds"] += function["self_seconds"]
+            known["total_seconds"] += function["total_seconds"]
+            if function["calls"] is not None:
+                known["calls"] = (known["calls"] or 0) + function["calls"]
+
+    def hot_functions(self, name: str, top: int = 20) -> List[Dict]:
+        """
+        🔥 The Functions a Stage Spent the Most Time In, Not Counting Their Callees
+
+        Args:
+            name (str): Name of a profiled stage
+            top (int): How many functions to name
+
+        Returns:
+            List[Dict]: 'function', 'self_seconds', 'total_seconds' and 'calls', hottest first
+        """
+        functions = self.stages[name]["functions"]
+        hottest = sorted(functions.items(), key=lambda item: (-item[1]["self_seconds"], -item[1]["total_seconds"]))
+        return [dict(function=label, **function) for label, function in hottest[:top]]
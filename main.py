@@ -48,12 +48,39 @@ watch as chaos transforms into harmony in your digital realm!
 """
 
 import argparse
+import contextlib
+import json
 import logging
+import os
+import socket
+import sys
+import time
 from tqdm import tqdm
+from config import DEFAULT_CATALOG_PATH, DEFAULT_CHECKPOINT_DIR, DEFAULT_MANIFEST_PATH, DEFAULT_SOCKET_PATH
 from core.file_scanner import FileScanner
 from core.file_categorizer import FileCategorizer
 from core.intelligent_organizer import IntelligentOrganizer
 from core.action_engine import ActionEngine
+from core.scan_estimator import ScanEstimator
+from core.hash_scheduler import HashScheduler
+from core.io_ordering import IOOrderer
+from core.page_cache import PageCachePolicy
+from core.relationship_analyzer import RelationshipAnalyzer
+from core.scan_catalog import ScanCatalog
+from core.catalog_diff import CatalogDiff
+from core.catalog_query import CatalogQuery
+from core.io_governor import IOGovernor
+from core.scan_checkpoint import ScanCheckpoint
+from core.external_planner import ExternalPlanner
+from core.layout_rules import LayoutRules
+from core.organizer_service import OrganizerService
+from core.file_packer import FilePacker
+from core.merkle_tree import MerkleTree
+from core.fingerprint_index import FingerprintIndex
+from core.duplicate_finder import DuplicateFinder
+from core.scan_budget import ScanBudget
+from core.scan_frontier import ScanFrontier
+from core.stage_profiler import StageProfiler
 from reporting.report_generator import ReportGenerator
 
 
@@ -63,20 +90,279 @@ def setup_logging(verbose):
     return logging.getLogger(__name__)
 
 
-def setup_argparse():
-    parser = argparse.ArgumentParser(description="Intelligent Data Organizer")
+def setup_argparse(argv=None):
+    parser = argparse.ArgumentParser(description="Intelligent Data Organizer",
+                                     epilog="Other commands: " + ", ".join(sorted(COMMANDS)))
     parser.add_argument("directory", help="Directory to organize")
     parser.add_argument("--dry-run", action="store_true", help="Perform a dry run without making changes")
     parser.add_argument("--verbose", action="store_true", help="Enable detailed logging")
-    return parser.parse_args()
-
-
-def scan_files(directory, logger):
+    parser.add_argument("--estimate", action="store_true",
+                        help="Sample the directory and extrapolate totals instead of running a full scan")
+    parser.add_argument("--time-budget", type=float, default=10.0,
+                        help="Seconds the --estimate mode may spend sampling and hunting duplicates (default: 10)")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="Read every file for a content fingerprint (default: metadata only, no file is opened)")
+    parser.add_argument("--hash-lanes", action="store_true",
+                        help="Fingerprint files through separate small-file and large-file lanes")
+    parser.add_argument("--large-file-threshold", type=int, default=64,
+                        help="Size in MB from which a file takes the large-file lane (default: 64)")
+    parser.add_argument("--small-hash-workers", type=int, default=4,
+                        help="Workers in the small-file lane (default: 4)")
+    parser.add_argument("--large-hash-workers", type=int, default=1,
+                        help="Concurrent streams in the large-file lane (default: 1)")
+    parser.add_argument("--io-order", choices=["walk", "inode", "extent"], default="walk",
+                        help="Order in which files are read for fingerprinting; with --hash-lanes each lane "
+                             "then reads in that order with a single worker (default: walk)")
+    parser.add_argument("--io-window", type=int, default=4096,
+                        help="Files sorted together by --io-order (default: 4096)")
+    parser.add_argument("--cache-policy", choices=["default", "sequential", "drop-behind"], default="default",
+                        help="Page-cache hints while fingerprinting; 'drop-behind' leaves no cache footprint")
+    parser.add_argument("--relationships", action="store_true",
+                        help="Find files sharing large regions using content-defined chunking")
+    parser.add_argument("--min-shared-fraction", type=float, default=0.5,
+                        help="Report file pairs sharing at least this fraction of bytes (default: 0.5)")
+    parser.add_argument("--find-duplicates", action="store_true",
+                        help="Find identical files, reading only files whose size (then first bytes) repeat")
+    parser.add_argument("--duplicate-error-rate", type=float, default=0.01,
+                        help="False-positive rate of the size sieve; costs extra reads, never wrong results "
+                             "(default: 0.01)")
+    parser.add_argument("--from-catalog", action="store_true",
+                        help="Plan and report from the saved --catalog instead of scanning again")
+    parser.add_argument("--report-changes", action="store_true",
+                        help="Report files added, removed, modified, moved and renamed since the last saved catalog")
+    parser.add_argument("--skip-organized", action="store_true",
+                        help="Don't rescan <category>/<type> directories left by an earlier run")
+    parser.add_argument("--export-plan", metavar="PATH",
+                        help="Write the planned actions to PATH (.jsonl, or .jsonl.gz to compress) for 'apply'")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG_PATH,
+                        help=f"Where to persist the scan catalog for later queries (default: {DEFAULT_CATALOG_PATH})")
+    parser.add_argument("--manifest", metavar="PATH",
+                        help="Seal a Merkle manifest of directories at PATH, for compare and --incremental "
+                             f"(default: none, or {DEFAULT_MANIFEST_PATH} with --incremental)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only skips relisting directories whose mtime is unchanged, taking their files from "
+                             "the manifest; every file is still categorized and planned (files rewritten in place "
+                             "go unnoticed)")
+    parser.add_argument("--layout", metavar="RULES",
+                        help="File of layout rules choosing where files go (default: <category>/<file type>)")
+    parser.add_argument("--max-memory-records", type=int, default=0,
+                        help="Stream the scan into a disk-backed plan, holding at most this many file records "
+                             "in memory; the catalog's packed columns still grow with the realm "
+                             "(default: 0, all in memory)")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Save scan progress every few seconds, so an interrupted scan can be resumed "
+                             "(implied by --deadline and --max-operations)")
+    parser.add_argument("--checkpoint-dir", default=DEFAULT_CHECKPOINT_DIR,
+                        help=f"Where scan progress is saved (default: {DEFAULT_CHECKPOINT_DIR})")
+    parser.add_argument("--checkpoint-interval", type=float, default=5.0,
+                        help="Seconds between scan checkpoints (default: 5)")
+    parser.add_argument("--resume-scan", action="store_true",
+                        help="Continue an interrupted scan from its last checkpoint")
+    parser.add_argument("--pack-small-files", type=int, metavar="BYTES", default=0,
+                        help="Fold files smaller than BYTES into indexed tar satchels per bucket (default: 0, off)")
+    parser.add_argument("--pack-max-members", type=int, default=10000,
+                        help="Most files folded into one satchel (default: 10000)")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS",
+                        help="Stop cleanly after SECONDS, planning and moving only what was scanned by then")
+    parser.add_argument("--max-operations", type=int, metavar="N",
+                        help="Stop cleanly after N operations (directories listed, files examined, files moved)")
+    parser.add_argument("--scan-priority", choices=ScanFrontier.PRIORITIES, default="walk",
+                        help="Subtrees to scan first: depth-first 'walk', most 'recent'ly changed, or 'largest' "
+                             "(default: walk)")
+    parser.add_argument("--profile", nargs="?", const="sample", choices=StageProfiler.MODES,
+                        help="Profile every stage ('sample' if no mode is given) and write collapsed stacks "
+                             "and hot functions to the reports directory")
+    parser.add_argument("--profile-interval", type=float, default=5.0, metavar="MS",
+                        help="Milliseconds between stack samples in the 'sample' profiling mode (default: 5)")
+    add_governor_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def add_governor_arguments(parser):
+    parser.add_argument("--max-mbps", type=float, help="Ceiling on MB/s read or moved (default: unlimited)")
+    parser.add_argument("--max-iops", type=float, help="Ceiling on I/O operations per second (default: unlimited)")
+    parser.add_argument("--io-schedule", metavar="WINDOWS",
+                        help="Time-of-day ceilings, e.g. '08:00-18:00=20/200,18:00-08:00=-/-' (MB/s / IOPS)")
+    parser.add_argument("--latency-target-ms", type=float,
+                        help="Back off the ceilings when I/O latency exceeds this many milliseconds")
+
+
+def create_governor(args):
+    if args.max_mbps is None and args.max_iops is None and not args.io_schedule:
+        return None
+    return IOGovernor(max_bytes_per_second=args.max_mbps * 1024 * 1024 if args.max_mbps else None,
+                      max_ops_per_second=args.max_iops,
+                      schedule=IOGovernor.parse_schedule(args.io_schedule) if args.io_schedule else None,
+                      latency_target=args.latency_target_ms / 1000 if args.latency_target_ms else None)
+
+
+def create_budget(args):
+    if args.deadline is None and args.max_operations is None:
+        return None
+    budget = ScanBudget(seconds=args.deadline, operations=args.max_operations)
+    budget.start()
+    return budget
+
+
+def create_profiler(args):
+    if not args.profile:
+        return None
+    return StageProfiler(mode=args.profile, interval=args.profile_interval / 1000)
+
+
+def profiled(profiler, stage):
+    return profiler.stage(stage) if profiler is not None else contextlib.nullcontext()
+
+
+def write_profiles(profiler, logger):
+    paths = ReportGenerator("reports").generate_profile_reports(profiler)
+    for stage, profile in profiler.stages.items():
+        hottest = profiler.hot_functions(stage, 1)
+        print(f"🔬 {stage}: {profile['seconds']:.2f}s"
+              + (f", hottest in {hottest[0]['function']}" if hottest else ""))
+    print(f"🔥 Collapsed stacks and hot functions written to {paths[-1].parent}")
+    logger.info(f"Profiles written to {', '.join(str(path) for path in paths)}")
+    return paths
+
+
+def setup_query_argparse(argv):
+    parser = argparse.ArgumentParser(prog="main.py query",
+                                     description="Answer questions from the persisted scan catalog")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG_PATH,
+                        help=f"Catalog written by a previous run (default: {DEFAULT_CATALOG_PATH})")
+    parser.add_argument("--category", help="Only files of this category")
+    parser.add_argument("--extension", help="Only files with this extension")
+    parser.add_argument("--min-size", type=int, help="Only files of at least this many bytes")
+    parser.add_argument("--max-size", type=int, help="Only files of at most this many bytes")
+    parser.add_argument("--older-than-days", type=float, help="Only files untouched for this many days")
+    parser.add_argument("--newer-than-days", type=float, help="Only files modified within this many days")
+    parser.add_argument("--fingerprint", help="Only files with exactly this fingerprint")
+    parser.add_argument("--sort", choices=["size", "modified"], default="size", help="Sort column (default: size)")
+    parser.add_argument("--ascending", action="store_true", help="Smallest / oldest first")
+    parser.add_argument("--offset", type=int, default=0, help="Matching rows to skip (for paging)")
+    parser.add_argument("--limit", type=int, default=50, help="Rows per page, 0 for all (default: 50)")
+    return parser.parse_args(argv)
+
+
+def create_cache_policy(args):
+    if args.cache_policy == "default":
+        return None
+    return PageCachePolicy(mode=args.cache_policy)
+
+
+def create_hash_scheduler(args, cache_policy=None, governor=None):
+    if not args.hash_lanes:
+        return None
+    return HashScheduler(large_file_threshold=args.large_file_threshold * 1024 * 1024,
+                         small_workers=args.small_hash_workers,
+                         large_workers=args.large_hash_workers,
+                         cache_policy=cache_policy,
+                         governor=governor)
+
+
+def create_fingerprinter(args, governor=None):
+    # 🖐️ Consumers needing contents fingerprint on demand what the scan left unread
+    return FileScanner(args.directory, cache_policy=create_cache_policy(args), governor=governor).fingerprint_records
+
+
+def create_io_orderer(args):
+    if args.io_order == "walk":
+        return None
+    return IOOrderer(mode=args.io_order, window=args.io_window)
+
+
+def create_scanner(directory, logger, args, governor=None, budget=None, keep_records=True):
+    cache_policy = create_cache_policy(args)
+    skip_directory = None
+    if args.skip_organized:
+        skip_directory = ActionEngine.organized_directory_filter(directory, FileCategorizer())
+    checkpoint = None
+    # Budgeted scans keep a checkpoint, so --resume-scan can carry on with their pending subtrees
+    if args.checkpoint or args.resume_scan or budget is not None:
+        checkpoint = ScanCheckpoint(args.checkpoint_dir, interval=args.checkpoint_interval)
+    # The manifest holds every file's metadata; it is only built when asked for
+    manifest = args.manifest or (DEFAULT_MANIFEST_PATH if args.incremental else None)
+    scanner = FileScanner(directory,
+                          hash_scheduler=create_hash_scheduler(args, cache_policy, governor),
+                          io_orderer=create_io_orderer(args),
+                          cache_policy=cache_policy,
+                          skip_directory=skip_directory,
+                          governor=governor,
+                          checkpoint=checkpoint,
+                          resume=args.resume_scan,
+                          fingerprint=args.fingerprint,
+                          merkle=manifest is not None,
+                          previous_tree=load_previous_manifest(directory, manifest, args, logger),
+                          budget=budget,
+                          priority=args.scan_priority,
+                          keep_records=keep_records)
+    return scanner, manifest
+
+
+def finish_scan(scanner, manifest, logger):
+    if scanner.pending_directories:
+        if manifest is not None:
+            # A tree missing whole subtrees would make the next incremental scan skip them for good
+            logger.warning(f"Scan stopped by its budget with {len(scanner.pending_directories)} subtrees pending; "
+                           f"the manifest at {manifest} is left as it was")
+        return scanner.pending_directories
+    if manifest is not None:
+        tree = scanner.merkle_tree()
+        tree.save(manifest)
+        logger.info(f"Merkle manifest of {len(tree.directories)} directories saved to {manifest} ({tree.digest})")
+    return []
+
+
+def scan_files(directory, logger, args, governor=None, budget=None):
     logger.info(f"Scanning directory: {directory}")
-    scanner = FileScanner(directory)
+    scanner, manifest = create_scanner(directory, logger, args, governor, budget)
     files = list(scanner.scan())
     logger.info(f"Total files scanned: {len(files)}")
-    return files
+    return files, finish_scan(scanner, manifest, logger)
+
+
+def scan_into_external_plan(directory, logger, args, governor=None, budget=None):
+    # 🗄️ Records flow from the scanner through the categorizer into the planner's runs and the
+    # catalog's packed columns; at most --max-memory-records of them are held at once, and the
+    # scanner keeps none (a manifest, if asked for, keeps only its compact per-file metadata)
+    logger.info(f"Scanning {directory} into a disk-backed plan "
+                f"(at most {args.max_memory_records} records in memory)")
+    scanner, manifest = create_scanner(directory, logger, args, governor, budget, keep_records=False)
+    planner = ExternalPlanner(max_records_in_memory=args.max_memory_records)
+    try:
+        def categorized():
+            for category, record in FileCategorizer().categorize_stream(scanner.scan()):
+                planner.add(category, record)
+                yield category, record
+
+        catalog = ScanCatalog.from_categorized_stream(categorized(), scan_scope(directory, args))
+        catalog.save(args.catalog)
+    except BaseException:
+        planner.close()
+        raise
+    logger.info(f"Total files scanned: {len(catalog)}, planned in {len(planner.runs)} spilled runs; "
+                f"scan catalog saved to {args.catalog}")
+    return planner, catalog, finish_scan(scanner, manifest, logger)
+
+
+def report_pending(pending, budget, logger):
+    report_path = ReportGenerator("reports").generate_pending_report(pending, budget.summary())
+    print(f"⌛ The hourglass ran out: {len(pending)} subtrees were left for the next run ({report_path})")
+    logger.info(f"Subtrees left for the next run recorded in {report_path}")
+    return report_path
+
+
+def load_previous_manifest(directory, manifest, args, logger):
+    if not args.incremental:
+        return None
+    if not os.path.exists(manifest):
+        logger.warning(f"No manifest at {manifest} yet; scanning in full")
+        return None
+    previous = MerkleTree.load(manifest)
+    if previous.root != os.path.abspath(directory):
+        logger.warning(f"The manifest at {manifest} describes {previous.root}; scanning in full")
+        return None
+    return previous
 
 
 def categorize_files(files, logger):
@@ -97,27 +383,160 @@ def create_organization_plan(categorized_files, categorizer, verbose, logger):
     return organization_plan
 
 
-def generate_reports(files, organization_plan, logger):
+def generate_reports(files, organization_plan, logger, catalog=None):
     logger.info("Generating reports")
     report_generator = ReportGenerator("reports")
-    report_generator.generate_summary_report(files, organization_plan)
+    report_generator.generate_summary_report(files, organization_plan, catalog)
     logger.info("Reports generated in the 'reports' directory")
 
 
-def execute_plan(organization_plan, target_directory, dry_run, logger):
-    action_engine = ActionEngine()
-    action_engine.plan_actions(organization_plan, target_directory)
-    planned_actions = action_engine.get_planned_actions()
+def estimate_directory(directory, time_budget, logger):
+    logger.info(f"Estimating directory: {directory} (budget {time_budget}s)")
+    estimator = ScanEstimator(directory)
+    estimate = estimator.estimate(time_budget=time_budget)
+    report_path = ReportGenerator("reports").generate_estimate_report(estimate)
+    logger.info(f"Estimate written to {report_path}")
+
+    files, size = estimate["files"], estimate["bytes"]
+    print(f"🔭 ~{files['estimate']:,.0f} files (95%: {files['low']:,.0f} - {files['high']:,.0f})")
+    print(f"🔭 ~{size['estimate']:,.0f} bytes (95%: {size['low']:,.0f} - {size['high']:,.0f})")
+    print(f"📜 Prophecy recorded in {report_path}")
+    return estimate
+
+
+def analyze_relationships(files, min_shared_fraction, logger):
+    logger.info("Analyzing relationships between files")
+    analyzer = RelationshipAnalyzer()
+    analyzer.add_files(files)
+    analysis = analyzer.analyze(min_shared_fraction=min_shared_fraction)
+    report_path = ReportGenerator("reports").generate_relationship_report(analysis)
+    logger.info(f"Found {len(analysis['pairs'])} related pairs, "
+                f"{analysis['dedup_savings_bytes']} bytes saveable by chunk dedup ({report_path})")
+    return analysis
+
+
+def find_duplicates(files, error_rate, logger, governor=None):
+    logger.info("Hunting for duplicate files")
+    finder = DuplicateFinder(false_positive_rate=error_rate, governor=governor)
+    report_path = ReportGenerator("reports").generate_duplicate_report(finder, files)
+    stats = finder.stats
+    logger.info(f"Found {stats['duplicate_sets']} duplicate sets ({stats['wasted_bytes']} bytes in extra copies), "
+                f"reading {stats['partially_hashed']} file heads and {stats['fully_hashed']} whole files; "
+                f"size sieve of {stats['filter_bytes']} bytes ({report_path})")
+    return stats
+
+
+def scan_scope(directory, args):
+    # Filters that leave files out of a scan; catalogs are only compared when these match
+    return {"root": os.path.abspath(directory), "filters": {"skip_organized": bool(args.skip_organized)}}
+
+
+def build_catalog(categorized_files, catalog_path, logger, scope=None):
+    catalog = ScanCatalog.from_categorized(categorized_files, scope)
+    catalog.save(catalog_path)
+    logger.info(f"Scan catalog with {len(catalog)} rows saved to {catalog_path}")
+    return catalog
+
+
+def open_catalog(catalog_path, logger):
+    started = time.perf_counter()
+    catalog = ScanCatalog.load(catalog_path)
+    logger.info(f"Catalog of {len(catalog)} rows opened from {catalog_path} in {time.perf_counter() - started:.3f}s")
+    return catalog
+
+
+def load_previous_catalog(catalog_path, logger):
+    # Loaded before the new catalog replaces it; a mapped snapshot keeps reading the old file
+    if not os.path.exists(catalog_path):
+        logger.warning(f"No catalog at {catalog_path} yet; there is nothing to compare with")
+        return None
+    return ScanCatalog.load(catalog_path)
+
+
+def report_changes(previous, catalog, pending, logger):
+    if pending:
+        logger.warning("The scan was cut short, so its changes would be mostly removals; no change report")
+        return None
+    logger.info("Comparing the scan with the previous catalog")
+    diff = CatalogDiff(previous, catalog)
+    reason = diff.incomparable_reason()
+    if reason:
+        print(f"🧭 No change report: {reason}")
+        logger.warning(f"Change report skipped: {reason}")
+        return None
+    report_path = ReportGenerator("reports").generate_change_report(diff)
+    stats = diff.stats
+    print(f"🔄 Since the last census: {stats['added']} added, {stats['removed']} removed, "
+          f"{stats['modified']} modified, {stats['moved']} moved, {stats['renamed']} renamed "
+          f"(+{stats['bytes_added']:,} / -{stats['bytes_removed']:,} bytes)")
+    logger.info(f"Change report written to {report_path}")
+    return stats
+
+
+def run_query(argv):
+    args = setup_query_argparse(argv)
+    now = time.time()
+    catalog = ScanCatalog.load(args.catalog)
+    if args.fingerprint and not (catalog.fingerprints != b'').any():
+        print("🖐️ This catalog holds no fingerprints; scan with --fingerprint to search by them")
+    query = CatalogQuery(catalog)
+    rows = query.find(category=args.category, extension=args.extension,
+                      min_size=args.min_size, max_size=args.max_size,
+                      modified_before=now - args.older_than_days * 86400 if args.older_than_days else None,
+                      modified_after=now - args.newer_than_days * 86400 if args.newer_than_days else None,
+                      fingerprint=args.fingerprint, order_by=args.sort, descending=not args.ascending,
+                      offset=args.offset, limit=args.limit or None)
+
+    shown = 0
+    for row in rows:
+        modified = time.strftime("%Y-%m-%d", time.localtime(row["modified"]))
+        print(f"{row['size']:>15}  {modified}  {row['category']:<10}  {row['fingerprint'] or '-':<32}  {row['path']}")
+        shown += 1
+    if args.limit and shown == args.limit:
+        print(f"📖 More may follow: --offset {args.offset + shown}")
+
+
+def create_external_plan(categorized, max_records_in_memory, logger):
+    logger.info(f"Creating disk-backed organization plan (at most {max_records_in_memory} records in memory)")
+    planner = ExternalPlanner(max_records_in_memory=max_records_in_memory)
+    planner.add_stream(categorized)
+    logger.info(f"Organization plan created in {len(planner.runs)} spilled runs")
+    return planner
+
+
+def execute_plan(organization_plan, target_directory, dry_run, logger, export_path=None, governor=None,
+                 layout=None, pack_threshold=None, pack_max_members=10000, budget=None, fingerprinter=None):
+    action_engine = ActionEngine(governor=governor, pack_threshold=pack_threshold,
+                                 pack_max_members=pack_max_members, budget=budget, fingerprinter=fingerprinter)
+    if isinstance(organization_plan, ExternalPlanner):
+        # 🗄️ Journeys are streamed from the planner's runs every time they are needed
+        def planned_actions():
+            return action_engine.iter_actions(organization_plan.groups(), target_directory, layout)
+    else:
+        action_engine.plan_actions(organization_plan, target_directory, layout)
+
+        def planned_actions():
+            return action_engine.get_planned_actions()
 
     logger.info("Planned actions:")
-    for action in planned_actions:
-        logger.info(f"- Move {action[1]} to {action[2]}")
+    for action in planned_actions():
+        if action[0] == 'pack':
+            logger.info(f"- Pack {len(action[1])} files into {action[2]}")
+        else:
+            logger.info(f"- Move {action[1]} to {action[2]}")
+    logger.info(f"{action_engine.already_in_place} files already rest in their rightful place")
+
+    if export_path:
+        count = action_engine.export_plan(export_path, planned_actions())
+        logger.info(f"Plan with {count} actions exported to {export_path}")
 
     if not dry_run:
         confirm = input("Do you want to execute these actions? (yes/no): ").lower()
         if confirm == 'yes':
-            action_engine.execute_actions()
+            outcome = action_engine.execute_actions(planned_actions())
             logger.info("Actions executed successfully")
+            if outcome["deferred"]:
+                logger.warning(f"{outcome['deferred']} files were left in place when the budget ran out")
         else:
             logger.info("Action execution cancelled")
     else:
@@ -126,6 +545,174 @@ def execute_plan(organization_plan, target_directory, dry_run, logger):
     return action_engine
 
 
+def setup_apply_argparse(argv):
+    parser = argparse.ArgumentParser(prog="main.py apply",
+                                     description="Execute a plan exported with --export-plan, without rescanning")
+    parser.add_argument("plan", help="Plan file (.jsonl or .jsonl.gz)")
+    parser.add_argument("--verbose", action="store_true", help="Enable detailed logging")
+    add_governor_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def run_apply(argv):
+    args = setup_apply_argparse(argv)
+    setup_logging(args.verbose)
+    outcome = ActionEngine(governor=create_governor(args)).apply_plan(args.plan)
+    print(f"🎉 Moved {outcome['moved']} files, packed {outcome['packed']}, "
+          f"skipped {outcome['stale']} changed since planning, {outcome['failed']} failed")
+    return outcome
+
+
+def setup_compare_argparse(argv):
+    parser = argparse.ArgumentParser(prog="main.py compare",
+                                     description="Compare two trees through their Merkle manifests")
+    parser.add_argument("before", help="Manifest (.json.gz) or directory to compare from")
+    parser.add_argument("after", help="Manifest (.json.gz) or directory to compare to")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="Fingerprint the contents of directories scanned for the comparison")
+    parser.add_argument("--limit", type=int, default=100, help="Differences listed per kind, 0 for all (default: 100)")
+    return parser.parse_args(argv)
+
+
+def load_tree(path, fingerprint):
+    if not os.path.isdir(path):
+        return MerkleTree.load(path)
+    scanner = FileScanner(path, fingerprint=fingerprint, merkle=True)
+    for _ in scanner.scan():
+        pass
+    return scanner.merkle_tree()
+
+
+def run_compare(argv):
+    args = setup_compare_argparse(argv)
+    before, after = load_tree(args.before, args.fingerprint), load_tree(args.after, args.fingerprint)
+    comparison = before.compare(after)
+    if comparison["identical"]:
+        print(f"🌳 The trees are identical ({before.digest})")
+        return comparison
+    for kind, sign in (("added", "+"), ("removed", "-"), ("changed", "~")):
+        paths = comparison[kind]
+        for path in paths[:args.limit or None]:
+            print(f"{sign} {path}")
+        if args.limit and len(paths) > args.limit:
+            print(f"{sign} ... and {len(paths) - args.limit} more")
+    print(f"⚖️ {len(comparison['added'])} added, {len(comparison['removed'])} removed, "
+          f"{len(comparison['changed'])} changed; {comparison['directories_visited']} of "
+          f"{comparison['directories_total']} directories visited")
+    return comparison
+
+
+def setup_index_export_argparse(argv):
+    parser = argparse.ArgumentParser(prog="main.py index-export",
+                                     description="Export the catalog's fingerprints as a compact, sorted index; "
+                                                 "files the scan didn't fingerprint are read for it now")
+    parser.add_argument("output", help="Index file to write")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG_PATH,
+                        help=f"Catalog of a scan (default: {DEFAULT_CATALOG_PATH})")
+    parser.add_argument("--label", help="Name of this host and root in merged results (default: hostname:catalog)")
+    add_governor_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def run_index_export(argv):
+    args = setup_index_export_argparse(argv)
+    label = args.label or f"{socket.gethostname()}:{os.path.abspath(args.catalog)}"
+    catalog = ScanCatalog.load(args.catalog)
+    root = (catalog.scope or {}).get("root")
+    fingerprinter = None
+    if root and os.path.isdir(root):
+        # 🖐️ Fingerprints the scan didn't take are taken now, for files unchanged since
+        fingerprinter = FileScanner(root, governor=create_governor(args)).fingerprint_records
+    count = FingerprintIndex.from_catalog(catalog, args.output, label, fingerprinter)
+    if not count:
+        print("🖐️ No file of the catalog could be fingerprinted; scan with --fingerprint, or rescan if it moved")
+    print(f"🗝️ {count} fingerprints of {label} written to {args.output}")
+    return count
+
+
+def setup_index_merge_argparse(argv):
+    parser = argparse.ArgumentParser(prog="main.py index-merge",
+                                     description="Merge fingerprint indexes into sets of duplicate files")
+    parser.add_argument("indexes", nargs="+", help="Index files written by index-export, from any hosts")
+    parser.add_argument("--output", metavar="PATH", help="Write the duplicate sets as JSON lines to PATH")
+    parser.add_argument("--cross-root-only", action="store_true",
+                        help="Only report sets whose copies live in more than one index")
+    parser.add_argument("--min-size", type=int, default=1, help="Ignore files smaller than this (default: 1)")
+    return parser.parse_args(argv)
+
+
+def run_index_merge(argv):
+    args = setup_index_merge_argparse(argv)
+    sets, wasted = 0, 0
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for duplicates in FingerprintIndex.merge(args.indexes, min_size=args.min_size,
+                                                 cross_root_only=args.cross_root_only):
+            output.write(json.dumps(duplicates, ensure_ascii=False) + "\n")
+            sets += 1
+            wasted += duplicates["size"] * (len(duplicates["members"]) - 1)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"🔀 {sets} duplicate sets across {len(args.indexes)} indexes, {wasted} bytes in extra copies",
+          file=sys.stderr if output is sys.stdout else sys.stdout)
+    return sets
+
+
+def setup_unpack_argparse(argv):
+    parser = argparse.ArgumentParser(prog="main.py unpack",
+                                     description="Restore the files folded into satchels by --pack-small-files")
+    parser.add_argument("paths", nargs="+", help="Satchels (.wizard-pack-NNNN.tar), or directories to search for them")
+    parser.add_argument("--into", metavar="DIR", help="Restore into DIR instead of next to each satchel")
+    parser.add_argument("--keep", action="store_true", help="Keep the satchels after restoring their files")
+    return parser.parse_args(argv)
+
+
+def run_unpack(argv):
+    args = setup_unpack_argparse(argv)
+    packer = FilePacker()
+    containers = []
+    for path in args.paths:
+        containers.extend(FilePacker.find_containers(path) if os.path.isdir(path) else [path])
+    restored = 0
+    for container in containers:
+        restored += packer.unpack(container, destination=args.into, remove=not args.keep)
+    print(f"📤 Restored {restored} files from {len(containers)} satchels")
+    return restored
+
+
+def setup_serve_argparse(argv):
+    parser = argparse.ArgumentParser(prog="main.py serve",
+                                     description="Keep the wizard awake behind a Unix socket, with warm caches")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH,
+                        help=f"Unix socket to listen on (default: {DEFAULT_SOCKET_PATH})")
+    parser.add_argument("--layout", metavar="RULES", help="File of layout rules choosing where files go")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="Fingerprint scanned files, keeping the fingerprints warm between requests")
+    parser.add_argument("--max-warm-realms", type=int, default=32,
+                        help="Drop folders whose warm caches are kept, least recently used forgotten first "
+                             "(default: 32)")
+    parser.add_argument("--verbose", action="store_true", help="Enable detailed logging")
+    add_governor_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def run_serve(argv):
+    args = setup_serve_argparse(argv)
+    setup_logging(args.verbose)
+    service = OrganizerService(args.socket,
+                               layout=LayoutRules.from_file(args.layout) if args.layout else None,
+                               governor=create_governor(args),
+                               fingerprint=args.fingerprint,
+                               max_realms=args.max_warm_realms)
+    print(f"🗼 The wizard awaits requests on {args.socket}")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print("🌙 The wizard's tower is closed")
+
+
 def main():
     """
     🎭 The Grand Adventure Begins!
@@ -133,45 +720,136 @@ def main():
     This is where our heroic tale unfolds. Each step is a thrilling chapter
     in our quest to bring order to the chaotic file lands!
     """
-    args = setup_argparse()
+    argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
+    args = setup_argparse(argv)
     logger = setup_logging(args.verbose)
 
     try:
-        with tqdm(total=5, disable=args.verbose) as pbar:
-
-            # Scan files
-            pbar.set_description("🔍 Scouting the Realm")
-            files = scan_files(args.directory, logger)
-            pbar.update(1)
-
-            # Categorize files
-            pbar.set_description("📚 Deciphering Ancient Scrolls")
-            categorized_files = categorize_files(files, logger)
-            pbar.update(1)
-
-            # Create organization plan
-            pbar.set_description("🗺️ Crafting the Master Plan")
-            categorizer = FileCategorizer()
-            organization_plan = create_organization_plan(categorized_files, categorizer, args.verbose, logger)
-            pbar.update(1)
-
-            # Generate report
-            pbar.set_description("📜 Recording Legends")
-            generate_reports(files, organization_plan, logger)
-            pbar.update(1)
-
-            # Execute plan
-            pbar.set_description("✨ Casting the Grand Spell")
-            execute_plan(organization_plan, args.directory, args.dry_run, logger)
-            pbar.update(1)
+        if args.estimate:
+            estimate_directory(args.directory, args.time_budget, logger)
+            return
+
+        governor = create_governor(args)
+        budget = create_budget(args)
+        profiler = create_profiler(args)
+        # Rules are compiled before the scan, so a typo doesn't cost a whole expedition
+        layout = LayoutRules.from_file(args.layout) if args.layout else None
+        if args.max_memory_records and (args.relationships or args.find_duplicates):
+            raise ValueError("🗄️ --relationships and --find-duplicates look at every file at once, "
+                             "so they can't run within --max-memory-records")
+        organization_plan = files = categorized_files = None
+        try:
+            with tqdm(total=5, disable=args.verbose) as pbar:
+
+                if args.from_catalog:
+                    # A snapshot catalog is mapped, not read: planning starts at once
+                    pbar.set_description("🗺️ Unrolling the Saved Map")
+                    with profiled(profiler, "catalog"):
+                        catalog = open_catalog(args.catalog, logger)
+                        if not args.max_memory_records:
+                            categorized_files = catalog.to_categorized()
+                            files = [file for category_files in categorized_files.values()
+                                     for file in category_files]
+                        pending = []
+                    pbar.update(2)
+                elif args.max_memory_records:
+                    # Scanning, categorizing and cataloging in one stream, straight into a disk-backed plan
+                    pbar.set_description("🔍 Scouting the Realm")
+                    with profiled(profiler, "scan"):
+                        previous_catalog = load_previous_catalog(args.catalog, logger) if args.report_changes else None
+                        organization_plan, catalog, pending = scan_into_external_plan(args.directory, logger, args,
+                                                                                      governor, budget)
+                        if previous_catalog is not None:
+                            report_changes(previous_catalog, catalog, pending, logger)
+                    pbar.update(2)
+                else:
+                    # Scan files
+                    pbar.set_description("🔍 Scouting the Realm")
+                    with profiled(profiler, "scan"):
+                        files, pending = scan_files(args.directory, logger, args, governor, budget)
+                    pbar.update(1)
+
+                    # Categorize files
+                    pbar.set_description("📚 Deciphering Ancient Scrolls")
+                    with profiled(profiler, "categorize"):
+                        categorized_files = categorize_files(files, logger)
+                        previous_catalog = load_previous_catalog(args.catalog, logger) if args.report_changes else None
+                        catalog = build_catalog(categorized_files, args.catalog, logger,
+                                                scan_scope(args.directory, args))
+                        if previous_catalog is not None:
+                            report_changes(previous_catalog, catalog, pending, logger)
+                    pbar.update(1)
+
+                # Create organization plan
+                pbar.set_description("🗺️ Crafting the Master Plan")
+                with profiled(profiler, "plan"):
+                    if isinstance(organization_plan, ExternalPlanner):
+                        logger.info("Organization plan already drawn on disk while scanning")
+                    elif args.max_memory_records:
+                        organization_plan = create_external_plan(catalog.iter_categorized(), args.max_memory_records,
+                                                                 logger)
+                    else:
+                        categorizer = FileCategorizer()
+                        organization_plan = create_organization_plan(categorized_files, categorizer, args.verbose,
+                                                                     logger)
+                pbar.update(1)
+
+                # Generate report
+                pbar.set_description("📜 Recording Legends")
+                with profiled(profiler, "report"):
+                    # A disk-backed plan is summarized by its categories; the catalog carries every figure
+                    planned = (catalog.by_category() if isinstance(organization_plan, ExternalPlanner)
+                               else organization_plan)
+                    generate_reports(files, planned, logger, catalog)
+                    if pending:
+                        report_pending(pending, budget, logger)
+                    if budget is not None and budget.exhausted and (args.relationships or args.find_duplicates):
+                        logger.warning("Out of time: relationship and duplicate analyses are left for the next run")
+                    else:
+                        if args.relationships:
+                            analyze_relationships(files, args.min_shared_fraction, logger)
+                        if args.find_duplicates:
+                            find_duplicates(files, args.duplicate_error_rate, logger, governor)
+                pbar.update(1)
+
+                # Execute plan
+                pbar.set_description("✨ Casting the Grand Spell")
+                with profiled(profiler, "execute"):
+                    execute_plan(organization_plan, args.directory, args.dry_run, logger, args.export_plan,
+                                 governor, layout, args.pack_small_files or None, args.pack_max_members, budget,
+                                 create_fingerprinter(args, governor))
+                pbar.update(1)
+        finally:
+            if isinstance(organization_plan, ExternalPlanner):
+                organization_plan.close()
+            # Written even when the quest is halted: a slow run is often a halted one
+            if profiler is not None and profiler.stages:
+                write_profiles(profiler, logger)
 
         print("🎉 The file kingdom is now in perfect harmony! Your quest is complete!")
 
+    except KeyboardInterrupt:
+        logger.warning("🛑 The quest was halted; scans run with --checkpoint can be continued with --resume-scan")
     except Exception as e:
         logger.error(f"🔥 Oh no! A wild dragon appeared: {str(e)}")
         if args.verbose:
             logger.exception("🕵️‍♂️ Detective's notes on the dragon:")
 
 
+# 🧭 Commands that don't organize a directory but work from earlier results
+COMMANDS = {
+    "query": run_query,
+    "apply": run_apply,
+    "serve": run_serve,
+    "unpack": run_unpack,
+    "compare": run_compare,
+    "index-export": run_index_export,
+    "index-merge": run_index_merge,
+}
+
+
 if __name__ == "__main__":
     main()
@@ -2,6 +2,8 @@ import csv
 from pathlib import Path
 from datetime import datetime
 
+from core.scan_catalog import ScanCatalog
+
 
 class ReportGenerator:
     """
@@ -15,6 +17,9 @@ class ReportGenerator:
         output_directory (Path): The enchanted library where our chronicles are stored
     """
 
+    # 🐘 How many of the largest files the summary names
+    LARGEST_FILES = 20
+
     def __init__(self, output_directory):
         """
         🎭 Summon the ReportGenerator into existence!
@@ -28,7 +33,7 @@ class ReportGenerator:
         self.output_directory = Path(output_directory)
         self.output_directory.mkdir(parents=True, exist_ok=True)
 
-    def generate_summary_report(self, scanned_files, organization_plan):
+    def generate_summary_report(self, scanned_files, organization_plan, catalog=None):
         """
         📚 Craft the Epic Saga of File Organization
 
@@ -36,17 +41,28 @@ class ReportGenerator:
         quest into one grand tale. It's like writing a book that summarizes
         an entire season of your favorite TV show!
 
+        The figures come from a columnar ScanCatalog, so even kingdoms of tens
+        of millions of files are summarized in a blink.
+
         Args:
-            scanned_files (list): The brave files that embarked on our quest
+            scanned_files (list): The brave files that embarked on our quest; None to count the catalog's rows
             organization_plan (dict): The master plan of our file kingdom
+            catalog (ScanCatalog, optional): A ready-made catalog; built from the plan if missing
 
         Returns:
             dict: A magical scroll containing the summary of our adventures
         """
+        if catalog is None:
+            catalog = ScanCatalog.from_organization_plan(organization_plan)
+
         report = {
-            "total_files": len(scanned_files),
-            "total_size": sum(file['size'] for file in scanned_files),
-            "categories": self._summarize_categories(organization_plan),
+            "total_files": len(scanned_files) if scanned_files is not None else len(catalog),
+            "total_size": catalog.total_bytes,
+            "categories": self._summarize_categories(catalog),
+            "extensions": catalog.by_extension(),
+            "size_buckets": catalog.size_histogram(),
+            "age_buckets": catalog.age_histogram(),
+            "largest_files": catalog.largest(self.LARGEST_FILES),
             "actions": self._summarize_actions(organization_plan)
         }
 
@@ -54,7 +70,7 @@ class ReportGenerator:
         return report
 
     @staticmethod
-    def _summarize_categories(organization_plan):
+    def _summarize_categories(catalog):
         """
         🗺️ Map the Territories of our File Kingdom
 
@@ -62,18 +78,12 @@ class ReportGenerator:
         in our file kingdom. It's like drawing a fantasy map for a magical world!
 
         Args:
-            organization_plan (dict): The master plan of our file kingdom
+            catalog (ScanCatalog): The columnar ledger of our file kingdom
 
         Returns:
             dict: A magical map showing the size and diversity of each land
         """
-        category_summary = {}
-        for category, groups in organization_plan.items():
-            category_summary[category] = {
-                "total_files": sum(len(files) for files in groups),
-                "groups": len(groups)
-            }
-        return category_summary
+        return catalog.by_category()
 
     @staticmethod
     def _summarize_actions(organization_plan):
@@ -95,6 +105,225 @@ class ReportGenerator:
         }
         return action_summary
 
+    def generate_estimate_report(self, estimate):
+        """
+        🔭 Chronicle the Oracle's Prophecy
+
+        This method records the ScanEstimator's extrapolated totals, with their
+        confidence intervals, so the size of a realm is known before the long
+        journey begins.
+
+        Args:
+            estimate (dict): The prophecy returned by ScanEstimator.estimate
+
+        Returns:
+            Path: Where the prophecy was written
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.output_directory / f"estimate_report_{timestamp}.csv"
+
+        with open(filepath, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Metric", "Value"])
+            writer.writerow(["Root", estimate["root"]])
+            writer.writerow(["Probes", estimate["probes"]])
+            writer.writerow(["Elapsed (seconds)", f"{estimate['elapsed_seconds']:.2f}"])
+            writer.writerow([])
+            writer.writerow(["Quantity", "Estimate", "95% Low", "95% High"])
+            for label, key in (("Total Files", "files"), ("Total Size (bytes)", "bytes")):
+                interval = estimate[key]
+                writer.writerow([label, round(interval["estimate"]), round(interval["low"]), round(interval["high"])])
+            writer.writerow([])
+            writer.writerow(["Category", "Files", "Files 95% Low", "Files 95% High",
+                             "Bytes", "Bytes 95% Low", "Bytes 95% High"])
+            for category, data in estimate["categories"].items():
+                files, size = data["files"], data["bytes"]
+                writer.writerow([category, round(files["estimate"]), round(files["low"]), round(files["high"]),
+                                 round(size["estimate"]), round(size["low"]), round(size["high"])])
+            writer.writerow([])
+            duplicates = estimate["duplicates"]
+            writer.writerow(["Sampled Files", duplicates["sampled_files"]])
+            writer.writerow(["Fingerprinted Files", duplicates["fingerprinted_files"]])
+            writer.writerow(["Duplicate Files In Sample", duplicates["duplicate_files"]])
+            writer.writerow(["Duplicate Fraction (lower bound)", f"{duplicates['duplicate_fraction_lower_bound']:.4f}"])
+
+        return filepath
+
+    def generate_relationship_report(self, analysis):
+        """
+        🧬 Chronicle the Hidden Kinship Between Files
+
+        This method records which files share large stretches of content and
+        how much space chunk-level deduplication could win back.
+
+        Args:
+            analysis (dict): The revelations of RelationshipAnalyzer.analyze
+
+        Returns:
+            Path: Where the chronicle was written
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.output_directory / f"relationship_report_{timestamp}.csv"
+
+        with open(filepath, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Metric", "Value"])
+            writer.writerow(["Files Analyzed", analysis["files"]])
+            writer.writerow(["Chunks", analysis["chunks"]])
+            writer.writerow(["Total Size (bytes)", analysis["total_bytes"]])
+            writer.writerow(["Unique Chunk Bytes", analysis["unique_bytes"]])
+            writer.writerow(["Chunk Dedup Savings (bytes)", analysis["dedup_savings_bytes"]])
+            writer.writerow([])
+            writer.writerow(["File A", "File B", "Shared Bytes", "Shared Fraction"])
+            for pair in analysis["pairs"]:
+                writer.writerow([pair["a"], pair["b"], pair["shared_bytes"], f"{pair['shared_fraction']:.4f}"])
+            writer.writerow([])
+            writer.writerow(["Cluster", "Members"])
+            for index, members in enumerate(analysis["clusters"], start=1):
+                writer.writerow([index, len(members)] + members)
+
+        return filepath
+
+    def generate_duplicate_report(self, finder, records):
+        """
+        👯 Chronicle Every Set of Identical Files
+
+        The sets are written as the finder confirms them, so even millions of
+        them never gather in memory; the tallies follow once the hunt is done.
+
+        Args:
+            finder (DuplicateFinder): The finder to send on the hunt
+            records (Sequence[Dict]): The scanner records to search
+
+        Returns:
+            Path: Where the chronicle was written
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.output_directory / f"duplicate_report_{timestamp}.csv"
+
+        with open(filepath, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Size (bytes)", "Fingerprint", "Copies", "Paths"])
+            for duplicates in finder.find(records):
+                writer.writerow([duplicates["size"], duplicates["fingerprint"], len(duplicates["paths"])]
+                                + duplicates["paths"])
+            writer.writerow([])
+            writer.writerow(["Metric", "Value"])
+            for metric, value in finder.stats.items():
+                writer.writerow([metric.replace("_", " ").title(), value])
+
+        return filepath
+
+    def generate_change_report(self, diff):
+        """
+        🔄 Chronicle Everything That Changed Since the Last Census
+
+        The changes are written as the diff finds them; the tallies and the
+        growth of every category follow.
+
+        Args:
+            diff (CatalogDiff): The previous and the current catalog, ready to compare
+
+        Returns:
+            Path: Where the chronicle was written
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.output_directory / f"change_report_{timestamp}.csv"
+
+        with open(filepath, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Change", "Path", "Previous Path", "Size (bytes)", "Size Change (bytes)", "Category"])
+            for change in diff.changes():
+                writer.writerow([change["change"], change["path"], change["previous_path"] or "",
+                                 change["size"], change["size_change"], change["category"]])
+            writer.writerow([])
+            writer.writerow(["Metric", "Value"])
+            for metric, value in diff.stats.items():
+                writer.writerow([metric.replace("_", " ").title(), value])
+            writer.writerow([])
+            writer.writerow(["Category", "Files Before", "Files After", "Files Change",
+                             "Bytes Before", "Bytes After", "Bytes Change"])
+            for category, growth in diff.category_growth().items():
+                writer.writerow([category, growth["files_before"], growth["files_after"], growth["files_change"],
+                                 growth["bytes_before"], growth["bytes_after"], growth["bytes_change"]])
+
+        return filepath
+
+    def generate_pending_report(self, pending, budget):
+        """
+        ⌛ Chronicle the Subtrees Left Unexplored When the Hourglass Ran Out
+
+        The plan and reports of a budgeted quest cover only what was scanned;
+        this chronicle names the rest, so the next run (or ``--resume-scan``)
+        knows where to carry on.
+
+        Args:
+            pending (list): Directories whose whole subtrees were not scanned, in priority order
+            budget (dict): The hourglass's ``ScanBudget.summary``
+
+        Returns:
+            Path: Where the chronicle was written
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.output_directory / f"pending_subtrees_{timestamp}.csv"
+
+        with open(filepath, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Metric", "Value"])
+            writer.writerow(["Time Budget (seconds)", budget["seconds"] if budget["seconds"] is not None else ""])
+            writer.writerow(["Operation Budget", budget["operations"] if budget["operations"] is not None else ""])
+            writer.writerow(["Elapsed (seconds)", f"{budget['elapsed_seconds']:.2f}"])
+            writer.writerow(["Operations Spent", budget["operations_spent"]])
+            writer.writerow(["Pending Subtrees", len(pending)])
+            writer.writerow([])
+            writer.writerow(["Priority", "Pending Subtree"])
+            for rank, directory in enumerate(pending, start=1):
+                writer.writerow([rank, directory])
+
+        return filepath
+
+    def generate_profile_reports(self, profiler, top=20):
+        """
+        🔥 Chronicle Where Every Stage of a Profiled Quest Spent Its Time
+
+        Each stage's stacks go to their own ``profile_<stage>_<timestamp>.folded``
+        file, one collapsed stack and its weight per line, which flamegraph
+        renderers (``flamegraph.pl``, speedscope, inferno) read as they are.
+        The hottest functions of every stage are gathered in one CSV.
+
+        Args:
+            profiler (StageProfiler): The spyglass, after the stages were profiled
+            top (int): Hot functions named per stage
+
+        Returns:
+            List[Path]: The stack files, then the hot-function chronicle
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        paths = []
+        for stage, profile in profiler.stages.items():
+            filepath = self.output_directory / f"profile_{stage}_{timestamp}.folded"
+            with open(filepath, 'w', encoding='utf-8') as folded:
+                for stack, weight in sorted(profile["stacks"].items()):
+                    folded.write(f"{stack} {weight}\n")
+            paths.append(filepath)
+
+        filepath = self.output_directory / f"profile_hotspots_{timestamp}.csv"
+        with open(filepath, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Stage", "Seconds", "Mode", "Stack Weights"])
+            for stage, profile in profiler.stages.items():
+                writer.writerow([stage, f"{profile['seconds']:.3f}", profiler.mode, profile["unit"]])
+            writer.writerow([])
+            writer.writerow(["Stage", "Rank", "Function", "Self (seconds)", "Total (seconds)", "Calls"])
+            for stage in profiler.stages:
+                for rank, function in enumerate(profiler.hot_functions(stage, top), start=1):
+                    writer.writerow([stage, rank, function["function"], f"{function['self_seconds']:.4f}",
+                                     f"{function['total_seconds']:.4f}",
+                                     function["calls"] if function["calls"] is not None else ""])
+        paths.append(filepath)
+
+        return paths
+
     def _save_summary_report(self, report):
         """
         💾 Preserve Our Legends in the Magical Archives
@@ -116,9 +345,25 @@ class ReportGenerator:
             writer.writerow(["Total Files", report["total_files"]])
             writer.writerow(["Total Size (bytes)", report["total_size"]])
             writer.writerow([])
-            writer.writerow(["Category", "Total Files", "Groups"])
+            writer.writerow(["Category", "Total Files", "Groups", "Total Size (bytes)"])
             for category, data in report["categories"].items():
-                writer.writerow([category, data["total_files"], data["groups"]])
+                writer.writerow([category, data["total_files"], data["groups"], data["total_size"]])
+            writer.writerow([])
+            writer.writerow(["Extension", "Total Files", "Total Size (bytes)"])
+            for extension, data in report["extensions"].items():
+                writer.writerow([extension, data["total_files"], data["total_size"]])
+            writer.writerow([])
+            writer.writerow(["Size Bucket", "Total Files", "Total Size (bytes)"])
+            for bucket, data in report["size_buckets"].items():
+                writer.writerow([bucket, data["total_files"], data["total_size"]])
+            writer.writerow([])
+            writer.writerow(["Age Bucket", "Total Files", "Total Size (bytes)"])
+            for bucket, data in report["age_buckets"].items():
+                writer.writerow([bucket, data["total_files"], data["total_size"]])
+            writer.writerow([])
+            writer.writerow(["Largest Files", "Size (bytes)", "Category", "Extension"])
+            for file in report["largest_files"]:
+                writer.writerow([file["path"], file["size"], file["category"], file["extension"]])
             writer.writerow([])
             writer.writerow(["Total Actions", report["actions"]["total_actions"]])
             writer.writerow(["Total Moves", report["actions"]["moves"]])
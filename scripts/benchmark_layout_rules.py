@@ -0,0 +1,158 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+# 🧙‍♂️ Enchant our vision to see the kingdom's core
+# (Add the project root to the Python path)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.layout_rules import LayoutRules  # noqa: E402
+
+# 📐 Rule sets of growing ambition, from a pure extension table to regex routing
+RULE_SETS = {
+    "type table": """
+        type in jpg,jpeg,png,gif => pictures
+        type in mp3,wav,flac => music
+        type in mp4,avi,mov => movies
+        type in txt,md,pdf,doc,docx => papers
+        type in zip,rar,7z => boxes
+    """,
+    "size and dates": """
+        size > 1G => bulk
+        category == images => photos/{year}/{month}
+        age > 730d => attic/{category}/{year}
+    """,
+    "regex routing": """
+        size > 1G => bulk
+        path ~ /projects/(?P<project>[^/]+)/ => projects/{project}/{type}
+        type in mp3,flac and age > 365d => music/{parent}
+        * => {category}/{type}
+    """,
+}
+
+EXTENSIONS = ['jpg', 'png', 'txt', 'pdf', 'mp3', 'flac', 'mp4', 'zip', 'py', 'csv']
+CATEGORIES = {'jpg': 'images', 'png': 'images', 'txt': 'documents', 'pdf': 'documents', 'mp3': 'audio',
+              'flac': 'audio', 'mp4': 'video', 'zip': 'archives'}
+
+
+def make_records(count, seed=7):
+    """
+    🎲 Conjure Synthetic Records Resembling a Real Scan
+
+    Args:
+        count (int): How many records to conjure
+        seed (int): Seed for repeatable conjuring
+
+    Returns:
+        List[Tuple[Dict, str]]: (record, category) pairs
+    """
+    rng = random.Random(seed)
+    now = time.time()
+    records = []
+    for i in range(count):
+        extension = rng.choice(EXTENSIONS)
+        top = rng.choice(['home/alice', 'home/bob', 'projects/apollo', 'projects/zephyr', 'media'])
+        record = {
+            'path': f"/data/{top}/dir{rng.randrange(500)}/file{i}.{extension}",
+            'size': int(rng.lognormvariate(12, 3)),
+            'modified': now - rng.uniform(0, 5 * 365 * 86400),
+        }
+        records.append((record, CATEGORIES.get(extension, 'unknown')))
+    return records
+
+
+def interpret(layout, record, category):
+    """
+    🐌 Evaluate Parsed Rules Naively, One Condition at a Time, for Comparison
+
+    Args:
+        layout (LayoutRules): Rules whose parsed form is evaluated
+        record (Dict): The scanner record
+        category (str): Its category
+
+    Returns:
+        str: The destination directory
+    """
+    path = record['path']
+    fields = {
+        'category': category,
+        'path': path,
+        'type': os.path.splitext(path)[1].lower()[1:] or 'unknown',
+        'name': os.path.basename(path),
+        'parent': os.path.basename(os.path.dirname(path)),
+        'size': record['size'],
+        'modified': record['modified'],
+    }
+    compare = {'==': lambda a, b: a == b, '!=': lambda a, b: a != b, '<': lambda a, b: a < b,
+               '<=': lambda a, b: a <= b, '>': lambda a, b: a > b, '>=': lambda a, b: a >= b,
+               'in': lambda a, b: a in b}
+    for rule in layout.rules:
+        values = {}
+        for field, operator, value in rule['conditions']:
+            if operator == '~':
+                match = value.search(fields[field])
+                if match is None:
+                    break
+                values.update(match.groupdict())
+            elif not compare[operator](fields[field], value):
+                break
+        else:
+            moment = time.localtime(record['modified'])
+            values.update(fields, year=f"{moment.tm_year:04d}", month=f"{moment.tm_mon:02d}",
+                          day=f"{moment.tm_mday:02d}")
+            return rule['template'].format(**values)
+    return f"{category}/{fields['type']}"
+
+
+def measure(route, records):
+    """
+    ⏱️ Time One Routing Spell Over Every Record
+
+    Args:
+        route (Callable): ``route(record, category) -> directory``
+        records (List[Tuple[Dict, str]]): The records to route
+
+    Returns:
+        float: Records routed per second
+    """
+    started = time.perf_counter()
+    for record, category in records:
+        route(record, category)
+    return len(records) / (time.perf_counter() - started)
+
+
+def main():
+    """
+    🏁 The Grand Race Between Compiled and Interpreted Rules
+    """
+    parser = argparse.ArgumentParser(description="Benchmark compiled layout rules")
+    parser.add_argument("--records", type=int, default=1000000, help="Synthetic records to route (default: 1000000)")
+    parser.add_argument("--min-rate", type=float, default=0,
+                        help="Exit with failure if any compiled rule set routes fewer records per second")
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    print(f"🎲 Routing {len(records):,} synthetic records")
+    slowest = float('inf')
+    for name, text in RULE_SETS.items():
+        layout = LayoutRules(text)
+        sample = records[:min(len(records), 20000)]
+        mismatches = sum(layout(record, category) != interpret(layout, record, category)
+                         for record, category in sample)
+        compiled = measure(layout.route, records)
+        interpreted = measure(lambda record, category: interpret(layout, record, category), sample)
+        slowest = min(slowest, compiled)
+        print(f"📐 {name:<15} compiled {compiled:>12,.0f}/s   interpreted {interpreted:>10,.0f}/s   "
+              f"({compiled / interpreted:.1f}x, {mismatches} mismatches)")
+        if mismatches:
+            sys.exit(f"💥 Compiled and interpreted rules disagree on {mismatches} records")
+
+    if slowest < args.min_rate:
+        sys.exit(f"🐢 Slowest rule set routed {slowest:,.0f} records/s, below {args.min_rate:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+# 🧙‍♂️ Enchant our vision to see the kingdom's core
+# (Add the project root to the Python path)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from core.action_engine import ActionEngine  # noqa: E402
+from core.file_categorizer import FileCategorizer  # noqa: E402
+from core.intelligent_organizer import IntelligentOrganizer  # noqa: E402
+from reporting.report_generator import ReportGenerator  # noqa: E402
+
+# 🧮 Bytes per record each stage may add at its peak (tracemalloc), and the whole pipeline may add to RSS.
+# Measured on CPython 3.11 at 1 M records (590, 9, 9, 254, 194 and 1,256) and rounded up by about a
+# quarter (the tiny stages get a little more slack). They hold from about 100,000 records up; smaller runs
+# are dominated by fixed costs. Tighten them when a change makes the path leaner, so the next regression
+# is caught.
+STAGE_BUDGETS = {
+    "records": 750,
+    "categorize": 40,
+    "organize": 40,
+    "plan_actions": 330,
+    "report": 250,
+}
+RSS_BUDGET = 1600
+
+STAGES = tuple(STAGE_BUDGETS)
+EXTENSIONS = ['jpg', 'png', 'txt', 'pdf', 'mp3', 'flac', 'mp4', 'zip', 'py', 'csv', 'tar.gz', '']
+TOPS = ['home/alice', 'home/bob', 'projects/apollo', 'projects/zephyr', 'media']
+
+
+class InMemoryReportGenerator(ReportGenerator):
+    """
+    📜 A Chronicler That Keeps Its Summary Instead of Writing It Down
+    """
+
+    def __init__(self):
+        self.output_directory = None
+        self.report = None
+
+    def _save_summary_report(self, report):
+        self.report = report
+
+
+def synthetic_records(count):
+    """
+    🎲 Stream Records Shaped Exactly Like the Scanner's, Without Touching Any Disk
+
+    The values are spread with cheap integer arithmetic rather than a random
+    generator, so ten million of them are conjured in seconds and every run
+    sees the same realm.
+
+    Args:
+        count (int): How many records to conjure
+
+    Yields:
+        Dict: A scanner record
+    """
+    now = 1_700_000_000.0
+    for i in range(count):
+        spread = (i * 2654435761) & 0xFFFFFFFF
+        extension = EXTENSIONS[spread % len(EXTENSIONS)]
+        name = f"file{i}.{extension}" if extension else f"file{i}"
+        path = f"/data/{TOPS[spread % len(TOPS)]}/dir{spread % 997}/{name}"
+        yield {
+            'path': path,
+            'name': name,
+            'extension': os.path.splitext(name)[1],
+            'size': spread % (1 << 24),
+            'created': now - spread % 157_680_000,
+            'modified': now - spread % 157_680_000,
+            'inode': i + 1,
+            'device': 42,
+            'fingerprint': None,
+        }
+
+
+def run_pipeline(count, stage_done=None):
+    """
+    🏭 Push a Synthetic Stream Through Scan → Categorize → Plan → Report
+
+    Args:
+        count (int): How many records to push through
+        stage_done (Callable, optional): Called with each stage's name when it is done
+
+    Returns:
+        Dict: What the stages produced, kept alive until the end like in main.py
+    """
+    stage_done = stage_done or (lambda stage: None)
+    products = {}
+    products["records"] = list(synthetic_records(count))
+    stage_done("records")
+    categorizer = FileCategorizer()
+    products["categorize"] = categorizer.categorize(products["records"])
+    stage_done("categorize")
+    products["organize"] = IntelligentOrganizer(categorizer).create_organization_plan(products["categorize"])
+    stage_done("organize")
+    engine = ActionEngine()
+    engine.plan_actions(products["organize"], "/organized")
+    products["plan_actions"] = engine
+    stage_done("plan_actions")
+    products["report"] = InMemoryReportGenerator().generate_summary_report(products["records"],
+                                                                           products["organize"])
+    stage_done("report")
+    return products
+
+
+def measure_tracemalloc(count):
+    """
+    🔬 Peak Python Allocations of Every Stage, per Record
+
+    Each stage's peak is measured from what was already allocated when it
+    started, so a stage is charged for what it adds, not for its inputs.
+
+    Args:
+        count (int): How many records to push through
+
+    Returns:
+        Dict: Stage -> {"peak": bytes per record at the stage's peak, "kept": bytes per record it left allocated}
+    """
+    results = {}
+    tracemalloc.start()
+    start = [tracemalloc.get_traced_memory()[0]]
+
+    def stage_done(stage):
+        current, peak = tracemalloc.get_traced_memory()
+        results[stage] = {"peak": (peak - start[0]) / count, "kept": (current - start[0]) / count}
+        tracemalloc.reset_peak()
+        start[0] = tracemalloc.get_traced_memory()[0]
+
+    products = run_pipeline(count, stage_done)
+    tracemalloc.stop()
+    del products
+    return results
+
+
+def max_rss_bytes():
+    # Linux reports kilobytes, macOS bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure_rss(count):
+    """
+    📈 Growth of the Process's Resident Set Over the Whole Pipeline, per Record
+
+    Measured without tracemalloc, whose own bookkeeping would swell it.
+
+    Args:
+        count (int): How many records to push through
+
+    Returns:
+        Dict: {"rss": bytes per record, "seconds": how long the pipeline took}
+    """
+    before = max_rss_bytes()
+    started = time.perf_counter()
+    products = run_pipeline(count)
+    seconds = time.perf_counter() - started
+    rss = (max_rss_bytes() - before) / count
+    del products
+    return {"rss": rss, "seconds": seconds}
+
+
+def in_fresh_process(function, count):
+    """
+    🧼 Run a Measurement in a Fresh Interpreter, so No Run Inherits Another's Peak
+
+    Args:
+        function (Callable): ``measure_tracemalloc`` or ``measure_rss``
+        count (int): How many records to push through
+
+    Returns:
+        Dict: The measurement
+    """
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(function, (count,))
+
+
+def parse_budget(text):
+    stage, _, value = text.partition('=')
+    if stage not in STAGE_BUDGETS or not value:
+        raise argparse.ArgumentTypeError(f"expected STAGE=BYTES with STAGE one of {', '.join(STAGES)}")
+    return stage, float(value)
+
+
+def main():
+    """
+    🏁 Measure Bytes per Record at Scale and Fail When a Budget Is Exceeded
+    """
+    parser = argparse.ArgumentParser(description="Memory and scale regression harness for the planning pipeline")
+    parser.add_argument("--records", type=int, nargs="+", default=[1_000_000],
+                        help="Synthetic stream sizes to push through, e.g. 1000000 10000000 (default: 1000000)")
+    parser.add_argument("--budget", type=parse_budget, action="append", default=[], metavar="STAGE=BYTES",
+                        help=f"Override a stage's peak bytes per record ({', '.join(STAGES)})")
+    parser.add_argument("--rss-budget", type=float, default=RSS_BUDGET,
+                        help=f"RSS growth allowed per record over the whole pipeline (default: {RSS_BUDGET})")
+    parser.add_argument("--skip-rss", action="store_true", help="Only measure tracemalloc peaks")
+    parser.add_argument("--json", metavar="PATH", help="Also write the measurements to PATH as JSON")
+    args = parser.parse_args()
+
+    budgets = dict(STAGE_BUDGETS, **dict(args.budget))
+    measurements, failures = {}, []
+    for count in args.records:
+        print(f"🎲 Pushing {count:,} synthetic records through the pipeline")
+        stages = in_fresh_process(measure_tracemalloc, count)
+        for stage in STAGES:
+            peak, kept = stages[stage]["peak"], stages[stage]["kept"]
+            verdict = "✅" if peak <= budgets[stage] else "💥"
+            print(f"   {verdict} {stage:<13} peak {peak:>8,.0f} B/record   kept {kept:>8,.0f} B/record   "
+                  f"(budget {budgets[stage]:,.0f})")
+            if peak > budgets[stage]:
+                failures.append(f"{stage} peaked at {peak:,.0f} B/record with {count:,} records")
+        measurements[count] = {"stages": stages}
+        if not args.skip_rss:
+            rss = in_fresh_process(measure_rss, count)
+            verdict = "✅" if rss["rss"] <= args.rss_budget else "💥"
+            print(f"   {verdict} {'rss':<13} {rss['rss']:>13,.0f} B/record   in {rss['seconds']:.1f}s "
+                  f"(budget {args.rss_budget:,.0f})")
+            if rss["rss"] > args.rss_budget:
+                failures.append(f"RSS grew by {rss['rss']:,.0f} B/record with {count:,} records")
+            measurements[count]["rss"] = rss
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as handle:
+            json.dump({"budgets": budgets, "rss_budget": args.rss_budget, "measurements": measurements},
+                      handle, indent=2)
+    if failures:
+        sys.exit("💥 Over budget: " + "; ".join(failures))
+    print("🎉 Every stage stayed within its budget")
+
+
+if __name__ == "__main__":
+    main()
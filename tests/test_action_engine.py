@@ -0,0 +1,192 @@
+"""
+🧙‍♂️ The Magical Trials of the Action Engine 🔮
+
+Here we test the engine that plans and performs the great file migration:
+it must send wanderers home and leave settled files exactly where they are.
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from core.action_engine import ActionEngine
+from core.file_categorizer import FileCategorizer
+from core.file_scanner import FileScanner
+from core.scan_budget import ScanBudget
+
+
+class TestActionEngine(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Action Engine Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring a Realm That Was Partly Organized Before
+        """
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.settled = os.path.join(self.root, 'documents', 'txt', 'old.txt')
+        self.wanderer = os.path.join(self.root, 'new.txt')
+        for path in (self.settled, self.wanderer):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as handle:
+                handle.write('scroll')
+
+    def test_settled_files_need_no_journey(self):
+        """
+        🏠 Only the Wanderer Is Sent on a Journey
+        """
+        plan = {'documents': {'txt': [{'path': self.settled}, {'path': self.wanderer}]}}
+        engine = ActionEngine()
+
+        engine.plan_actions(plan, self.root)
+
+        self.assertEqual([action[:3] for action in engine.get_planned_actions()],
+                         [('move', self.wanderer, os.path.join(self.root, 'documents', 'txt', 'new.txt'))])
+        self.assertEqual(engine.already_in_place, 1)
+
+    def test_replanning_after_execution_is_empty(self):
+        """
+        🔁 A Second Run Over an Organized Realm Plans Nothing
+        """
+        plan = {'documents': {'txt': [{'path': self.settled}, {'path': self.wanderer}]}}
+        engine = ActionEngine()
+        engine.plan_actions(plan, self.root)
+        engine.execute_actions()
+
+        moved = os.path.join(self.root, 'documents', 'txt', 'new.txt')
+        engine.plan_actions({'documents': {'txt': [{'path': self.settled}, {'path': moved}]}}, self.root)
+
+        self.assertEqual(engine.get_planned_actions(), [])
+        self.assertEqual(engine.already_in_place, 2)
+
+    def test_journeys_past_the_deadline_are_deferred(self):
+        """
+        ⌛ Once the Hourglass Runs Out, the Remaining Files Stay Where They Are
+        """
+        stray = os.path.join(self.root, 'stray.txt')
+        with open(stray, 'w') as handle:
+            handle.write('another scroll')
+        plan = {'documents': {'txt': [{'path': self.wanderer}, {'path': stray}]}}
+        engine = ActionEngine(budget=ScanBudget(operations=1))
+        engine.plan_actions(plan, self.root)
+
+        outcome = engine.execute_actions()
+
+        self.assertEqual(outcome, {"moved": 1, "packed": 0, "failed": 0, "deferred": 1})
+        self.assertFalse(os.path.exists(self.wanderer))
+        self.assertTrue(os.path.exists(stray))
+
+    def test_exported_plan_is_applied_later(self):
+        """
+        📜 A Plan Written Today Is Carried Out Tomorrow, Stale Entries Skipped
+        """
+        scanner = FileScanner(self.root)
+        records = list(scanner.scan())
+        plan = {'documents': {'txt': records}}
+        engine = ActionEngine()
+        engine.plan_actions(plan, os.path.join(self.root, 'organized'))
+        plan_path = os.path.join(self.root, 'plan.jsonl.gz')
+
+        self.assertEqual(engine.export_plan(plan_path), 2)
+        with open(self.settled, 'a') as handle:
+            handle.write(' changed after planning')
+        outcome = ActionEngine().apply_plan(plan_path)
+
+        self.assertEqual(outcome, {"moved": 1, "packed": 0, "stale": 1, "failed": 0})
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'organized', 'documents', 'txt', 'new.txt')))
+        self.assertTrue(os.path.exists(self.settled))
+
+    def test_moves_across_devices_are_verified_while_copying(self):
+        """
+        🌉 A Copy Across Devices Is Checked Against Its Fingerprint Before the Source Goes
+        """
+        destination = os.path.join(self.root, 'elsewhere', 'new.txt')
+        cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+        engine = ActionEngine()
+
+        with patch('core.action_engine.os.rename', side_effect=cross_device):
+            with self.assertRaises(OSError):
+                engine._move_file(self.wanderer, destination, hashlib.md5(b'another scroll').hexdigest())
+            self.assertTrue(os.path.exists(self.wanderer))
+            self.assertEqual(os.listdir(os.path.dirname(destination)), [])
+
+            engine._move_file(self.wanderer, destination, hashlib.md5(b'scroll').hexdigest())
+
+        self.assertFalse(os.path.exists(self.wanderer))
+        with open(destination) as handle:
+            self.assertEqual(handle.read(), 'scroll')
+
+    def test_moves_across_devices_without_fingerprint_ask_for_one(self):
+        """
+        🖐️ Without a Fingerprint, One Is Taken on Demand Before the Copy and Checked Against It
+        """
+        destination = os.path.join(self.root, 'elsewhere', 'new.txt')
+        cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+        asked = []
+
+        def stale_fingerprinter(records):
+            for record in records:
+                asked.append((record['path'], record['size']))
+                record['fingerprint'] = hashlib.md5(b'another scroll').hexdigest()
+                yield record
+
+        with patch('core.action_engine.os.rename', side_effect=cross_device):
+            with self.assertRaises(OSError):
+                ActionEngine(fingerprinter=stale_fingerprinter)._move_file(self.wanderer, destination, None)
+            self.assertEqual(asked, [(self.wanderer, len('scroll'))])
+            self.assertTrue(os.path.exists(self.wanderer))
+            self.assertEqual(os.listdir(os.path.dirname(destination)), [])
+
+            scanner = FileScanner(self.root)
+            ActionEngine(fingerprinter=scanner.fingerprint_records)._move_file(self.wanderer, destination, None)
+
+        self.assertFalse(os.path.exists(self.wanderer))
+        with open(destination) as handle:
+            self.assertEqual(handle.read(), 'scroll')
+
+    def test_organized_directories_are_not_rescanned(self):
+        """
+        ⏭️ The Scanner Leaves Organized Lands Unexplored
+        """
+        judge = ActionEngine.organized_directory_filter(self.root, FileCategorizer())
+        scanner = FileScanner(self.root, skip_directory=judge)
+
+        paths = [record['path'] for record in scanner.scan()]
+
+        self.assertEqual(paths, [self.wanderer])
+        self.assertTrue(judge(os.path.join(self.root, 'documents', 'txt')))
+        self.assertFalse(judge(os.path.join(self.root, 'documents')))
+        self.assertFalse(judge(os.path.join(self.root, 'holiday', 'txt')))
+
+    def test_own_folders_named_like_categories_are_still_explored(self):
+        """
+        🗂️ Only the Exact Category/Type Lands the Organizer Makes Are Skipped, Not a User's Own Folders
+        """
+        keepsakes = [os.path.join(self.root, 'documents', 'taxes', '2025.pdf'),
+                     os.path.join(self.root, 'images', 'family', 'beach.jpg'),
+                     os.path.join(self.root, 'documents', 'jpg', 'misfiled.jpg')]
+        for path in keepsakes:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as handle:
+                handle.write('memory')
+        judge = ActionEngine.organized_directory_filter(self.root, FileCategorizer())
+
+        paths = sorted(record['path'] for record in FileScanner(self.root, skip_directory=judge).scan())
+
+        self.assertEqual(paths, sorted(keepsakes + [self.wanderer]))
+        # Categories divined from the mime scrolls and hidden behind compression are known too
+        self.assertTrue(judge(os.path.join(self.root, 'text', 'py')))
+        self.assertTrue(judge(os.path.join(self.root, 'application', 'gz')))
+        self.assertTrue(judge(os.path.join(self.root, 'unknown', 'unknown')))
+        self.assertFalse(judge(os.path.join(self.root, 'unknown', 'txt')))
+        self.assertFalse(judge(os.path.join(self.root, 'documents', 'TXT')))
+
+
+if __name__ == '__main__':
+    unittest.main()
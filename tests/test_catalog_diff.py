@@ -0,0 +1,135 @@
+"""
+🧙‍♂️ The Magical Trials of the Catalog Diff 🔄
+
+Here we hold two censuses of the same kingdom side by side and check that
+every newcomer, departure, change, move and rename is named exactly once.
+"""
+
+import os
+import tempfile
+import unittest
+
+from core.catalog_diff import CatalogDiff
+from core.scan_catalog import ScanCatalog
+
+
+def record(path, size, modified=1000.0, inode=0, fingerprint=None, device=1):
+    return {'path': path, 'size': size, 'modified': modified, 'inode': inode, 'device': device,
+            'fingerprint': fingerprint}
+
+
+class TestCatalogDiff(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Catalog Diff Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring Yesterday's and Today's Census
+        """
+        self.previous = ScanCatalog.from_categorized({
+            'documents': [
+                record('/realm/notes.txt', 100, inode=1),
+                record('/realm/draft.txt', 50, inode=2),
+                record('/realm/old/report.pdf', 300, inode=3),
+                record('/realm/gone.txt', 10, inode=4),
+            ],
+            'images': [
+                record('/realm/photo.jpg', 400, inode=5, fingerprint='a' * 32),
+            ],
+        })
+        self.current = ScanCatalog.from_categorized({
+            'documents': [
+                record('/realm/notes.txt', 120, modified=2000.0, inode=1),
+                record('/realm/final.txt', 50, inode=2),
+                record('/realm/archive/report.pdf', 300, inode=3),
+                record('/realm/new.txt', 70, inode=6),
+            ],
+            'images': [
+                # Copied to another disk and deleted here: a new inode, the same contents
+                record('/backup/photo.jpg', 400, inode=9, device=2, fingerprint='a' * 32),
+                record('/realm/holiday.png', 900, inode=7),
+            ],
+        })
+
+    def test_every_kind_of_change_is_named_once(self):
+        """
+        📜 Added, Removed, Modified, Moved and Renamed Files Are Told Apart
+        """
+        diff = CatalogDiff(self.previous, self.current)
+
+        changes = {(change['change'], change['path'], change['previous_path']) for change in diff.changes()}
+
+        self.assertEqual(changes, {
+            ('modified', '/realm/notes.txt', None),
+            ('renamed', '/realm/final.txt', '/realm/draft.txt'),
+            ('moved', '/realm/archive/report.pdf', '/realm/old/report.pdf'),
+            ('moved', '/backup/photo.jpg', '/realm/photo.jpg'),
+            ('added', '/realm/new.txt', None),
+            ('added', '/realm/holiday.png', None),
+            ('removed', '/realm/gone.txt', None),
+        })
+        self.assertEqual(diff.stats['moved'], 2)
+        self.assertEqual(diff.stats['bytes_added'], 20 + 70 + 900)
+        self.assertEqual(diff.stats['bytes_removed'], 10)
+
+    def test_reused_inode_with_other_contents_is_not_a_move(self):
+        """
+        🪪 A Freed Inode Reused by a Different File Is a Removal and an Addition
+        """
+        previous = ScanCatalog.from_categorized({'documents': [record('/realm/a.txt', 10, inode=8)]})
+        current = ScanCatalog.from_categorized({'documents': [record('/realm/b.txt', 99, 5000.0, inode=8)]})
+
+        kinds = sorted(change['change'] for change in CatalogDiff(previous, current).changes())
+
+        self.assertEqual(kinds, ['added', 'removed'])
+
+    def test_saved_catalogs_keep_their_inodes(self):
+        """
+        💾 A Catalog Brought Back From Disk Still Recognizes Its Renamed Files
+        """
+        with tempfile.TemporaryDirectory() as workspace:
+            path = os.path.join(workspace, 'catalog.npz')
+            self.previous.save(path)
+            previous = ScanCatalog.load(path)
+
+        diff = CatalogDiff(previous, self.current)
+        list(diff.changes())
+
+        self.assertEqual(diff.stats['renamed'], 1)
+        self.assertEqual(previous.inodes.tolist(), [1, 2, 3, 4, 5])
+
+    def test_censuses_of_different_realms_are_not_compared(self):
+        """
+        🧭 Catalogs of Two Different Roots, or Filters, Are Refused, Even After a Trip to Disk
+        """
+        files = {'documents': [record('/realm/a.txt', 10, inode=1)]}
+        filters = {'skip_organized': False}
+        other_root = ScanCatalog.from_categorized(files, {'root': '/other', 'filters': filters})
+        same_root = ScanCatalog.from_categorized(files, {'root': '/realm', 'filters': filters})
+        current = ScanCatalog.from_categorized(files, {'root': '/realm', 'filters': filters})
+        with tempfile.TemporaryDirectory() as workspace:
+            path = os.path.join(workspace, 'catalog' + ScanCatalog.SNAPSHOT_SUFFIX)
+            other_root.save(path)
+            other_root = ScanCatalog.load(path)
+
+        self.assertIn('/other', CatalogDiff(other_root, current).incomparable_reason())
+        skipped = ScanCatalog.from_categorized(files, {'root': '/realm', 'filters': {'skip_organized': True}})
+        self.assertIsNotNone(CatalogDiff(skipped, current).incomparable_reason())
+        self.assertIsNotNone(CatalogDiff(self.previous, current).incomparable_reason())
+        self.assertIsNone(CatalogDiff(same_root, current).incomparable_reason())
+
+    def test_growth_per_category(self):
+        """
+        📈 Each Category's Growth in Files and Bytes, Fastest Growing First
+        """
+        growth = CatalogDiff(self.previous, self.current).category_growth()
+
+        self.assertEqual(list(growth), ['images', 'documents'])
+        self.assertEqual(growth['images']['bytes_change'], 900)
+        self.assertEqual(growth['documents']['files_change'], 0)
+        self.assertEqual(growth['documents']['bytes_change'], 540 - 460)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+🔎 The Magical Trials of the Catalog Query 📚
+
+Here we question the librarian about a preserved catalog and make sure every
+answer is right, arrives in the right order, and pages without gaps.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.catalog_query import CatalogQuery
+from core.scan_catalog import ScanCatalog
+
+DAY = 86400.0
+NOW = 1_700_000_000.0
+
+
+class TestCatalogQuery(unittest.TestCase):
+    """
+    🏰 The Reading Room of Catalog Query Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Preserving a Catalog and Loading It Back, as the CLI Would
+        """
+        categorized = {
+            'video': [{'path': f'/realm/movie{i}.mp4', 'size': 1000 * i, 'modified': NOW - i * 100 * DAY,
+                       'fingerprint': f'{i:032x}'} for i in range(1, 11)],
+            'documents': [{'path': '/realm/notes.txt', 'size': 50, 'modified': NOW - 900 * DAY,
+                           'fingerprint': f'{3:032x}'},
+                          {'path': '/realm/todo.md', 'size': 70, 'modified': NOW, 'fingerprint': None}],
+        }
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'catalog.npz')
+        ScanCatalog.from_categorized(categorized).save(path)
+        self.query = CatalogQuery(ScanCatalog.load(path))
+
+    def _paths(self, **conditions):
+        return [row['path'] for row in self.query.find(**conditions)]
+
+    def test_largest_in_category(self):
+        """
+        🐘 The Largest Videos, Biggest First
+        """
+        self.assertEqual(self._paths(category='video', limit=3),
+                         ['/realm/movie10.mp4', '/realm/movie9.mp4', '/realm/movie8.mp4'])
+
+    def test_untouched_for_two_years(self):
+        """
+        🕸️ Files Nobody Has Touched for Two Years, Oldest First
+        """
+        paths = self._paths(modified_before=NOW - 730 * DAY, order_by='modified', descending=False)
+
+        self.assertEqual(paths, ['/realm/movie10.mp4', '/realm/movie9.mp4', '/realm/notes.txt', '/realm/movie8.mp4'])
+
+    def test_fingerprint_lookup(self):
+        """
+        🖐️ Everything Sealed With the Same Fingerprint
+        """
+        rows = list(self.query.find(fingerprint=f'{3:032x}'))
+
+        self.assertEqual(sorted(row['path'] for row in rows), ['/realm/movie3.mp4', '/realm/notes.txt'])
+        self.assertEqual(rows[0]['fingerprint'], f'{3:032x}')
+
+    def test_pagination_has_no_gaps(self):
+        """
+        📖 Page After Page, Every Row Appears Exactly Once
+        """
+        everything = self._paths()
+        pages = [self._paths(offset=offset, limit=4) for offset in range(0, 12, 4)]
+
+        self.assertEqual(len(everything), 12)
+        self.assertEqual([path for page in pages for path in page], everything)
+
+    def test_combined_conditions_and_unknown_names(self):
+        """
+        🧩 Conditions Combine, and Unknown Names Find Nothing
+        """
+        self.assertEqual(self._paths(extension='.MP4', min_size=4000, max_size=6000, descending=False),
+                         ['/realm/movie4.mp4', '/realm/movie5.mp4', '/realm/movie6.mp4'])
+        self.assertEqual(self._paths(category='dragons'), [])
+        with self.assertRaises(ValueError):
+            list(self.query.find(order_by='colour'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+🧙‍♂️ The Magical Trials of the Duplicate Finder 👯
+
+Here we hide twins among strangers and check that the finder names every
+twin exactly, while opening only the files whose size could have a twin.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+from core.duplicate_finder import BloomFilter, DuplicateFinder
+from core.file_scanner import FileScanner
+
+
+class TestBloomFilter(unittest.TestCase):
+    """
+    🌸 The Garden of Bloom Filter Tests
+    """
+
+    def test_never_forgets_and_rarely_imagines(self):
+        """
+        🧠 Added Keys Are Always Remembered; Strangers Are Rarely Mistaken for Them
+        """
+        sieve = BloomFilter(10000, false_positive_rate=0.01)
+        self.assertFalse(sieve.add(b"key-0"))
+        self.assertTrue(sieve.add(b"key-0"))
+        for number in range(1, 10000):
+            sieve.add(f"key-{number}".encode())
+
+        self.assertTrue(all(f"key-{number}".encode() in sieve for number in range(10000)))
+        imagined = sum(f"stranger-{number}".encode() in sieve for number in range(10000))
+        self.assertLess(imagined, 300)
+        self.assertLess(sieve.nbytes, 10000 * 2)
+
+    def test_rate_must_be_a_probability(self):
+        """
+        🚫 Rates Outside (0, 1) Are Refused
+        """
+        for rate in (0, 1, 1.5):
+            with self.subTest(rate=rate), self.assertRaises(ValueError):
+                BloomFilter(10, rate)
+
+
+class TestDuplicateFinder(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Duplicate Finder Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring Twins, a Look-Alike and a Lone Stranger
+        """
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        head = b'h' * 5000
+        contents = {
+            'twin1.bin': head + b'same tail',
+            'twin2.bin': head + b'same tail',
+            'lookalike.bin': head + b'diff tail',  # Same size and first bytes, different content
+            'small1.txt': b'tiny',
+            'small2.txt': b'tiny',
+            'stranger.txt': b'nobody else is this long',
+            'empty1.txt': b'',
+            'empty2.txt': b'',
+        }
+        for name, content in contents.items():
+            with open(os.path.join(self.root, name), 'wb') as handle:
+                handle.write(content)
+        with redirect_stdout(StringIO()):
+            self.records = list(FileScanner(self.root).scan())
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def test_twins_are_found_exactly(self):
+        """
+        👯 Only True Twins Are Reported, Look-Alikes and Empty Files Are Not
+        """
+        finder = DuplicateFinder(partial_bytes=4096)
+
+        found = list(finder.find(self.records))
+
+        self.assertEqual([duplicates['paths'] for duplicates in found],
+                         [[self.path('twin1.bin'), self.path('twin2.bin')],
+                          [self.path('small1.txt'), self.path('small2.txt')]])
+        self.assertEqual(found[0]['fingerprint'], hashlib.md5(b'h' * 5000 + b'same tail').hexdigest())
+        self.assertEqual(finder.stats['duplicate_sets'], 2)
+        self.assertEqual(finder.stats['wasted_bytes'], 5009 + 4)
+
+    def test_only_files_with_repeated_sizes_are_read(self):
+        """
+        🙈 A File Whose Size Is Unique Is Never Opened
+        """
+        finder = DuplicateFinder(partial_bytes=4096)
+        with patch.object(FileScanner, '_generate_file_fingerprint',
+                          wraps=FileScanner._generate_file_fingerprint) as fingerprint, \
+                patch('core.duplicate_finder.open', wraps=open) as opened:
+            list(finder.find(self.records))
+
+        self.assertNotIn(self.path('stranger.txt'), [call.args[0] for call in opened.call_args_list])
+        # The three large look-alikes are peeked at, and read whole only because their heads agree
+        self.assertEqual(finder.stats['partially_hashed'], 5)
+        self.assertEqual(fingerprint.call_count, 3)
+
+    def test_known_fingerprints_spare_the_reads(self):
+        """
+        🖐️ Fingerprints From the Scan Are Reused Instead of Reading Again
+        """
+        for record in self.records:
+            with open(record['path'], 'rb') as handle:
+                record['fingerprint'] = hashlib.md5(handle.read()).hexdigest()
+        finder = DuplicateFinder(partial_bytes=4096)
+
+        found = list(finder.find(self.records))
+
+        self.assertEqual(len(found), 2)
+        self.assertEqual(finder.stats['fully_hashed'], 0)
+        self.assertEqual(finder.stats['partially_hashed'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
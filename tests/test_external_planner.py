@@ -0,0 +1,173 @@
+"""
+🧙‍♂️ The Magical Trials of the Cellar Architect 🗄️
+
+Here we make the desk absurdly small and check that the plan merged back from
+the cellar is exactly the plan the IntelligentOrganizer draws in memory.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import weakref
+from unittest.mock import patch
+
+from core.action_engine import ActionEngine
+from core.external_planner import ExternalPlanner
+from core.file_categorizer import FileCategorizer
+from core.file_scanner import FileScanner
+from core.intelligent_organizer import IntelligentOrganizer
+from core.scan_catalog import ScanCatalog
+
+
+class Record(dict):
+    """A scanner record that can be watched with a weak reference"""
+
+
+class TestExternalPlanner(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Cellar Architect Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring a Realm Bigger Than the Desk
+        """
+        self.categorized = {
+            'documents': [{'path': f'/realm/notes{i}.{ext}'} for i in range(7) for ext in ('txt', 'md')],
+            'images': [{'path': f'/realm/photo{i}.png'} for i in range(5)] + [{'path': '/realm/odd.PNG'}],
+            'unknown': [{'path': '/realm/README'}],
+        }
+
+    def test_groups_match_the_in_memory_blueprint(self):
+        """
+        🗂️ Spilled and Merged Groups Equal the Organizer's Nested Dict
+        """
+        blueprint = IntelligentOrganizer(categorizer=None).create_organization_plan(self.categorized)
+
+        with ExternalPlanner(max_records_in_memory=3) as planner:
+            planner.add_categorized(self.categorized)
+            self.assertGreater(len(planner.runs), 3)
+            merged = {}
+            for category, file_type, records in planner.groups():
+                self.assertNotIn(file_type, merged.setdefault(category, {}))
+                merged[category][file_type] = sorted(record['path'] for record in records)
+
+        self.assertEqual(merged, {category: {file_type: sorted(file['path'] for file in files)
+                                             for file_type, files in file_types.items()}
+                                  for category, file_types in blueprint.items()})
+
+    def test_plan_can_be_read_again_and_cellar_is_cleared(self):
+        """
+        🔁 Groups Can Be Streamed Twice, and Closing Clears the Cellar
+        """
+        planner = ExternalPlanner(max_records_in_memory=4).add_categorized(self.categorized)
+        first = [record['path'] for _, _, records in planner.groups() for record in records]
+        second = [record['path'] for _, _, records in planner.groups() for record in records]
+        cellar = os.path.dirname(planner.runs[0])
+
+        planner.close()
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), planner.total_records)
+        self.assertFalse(os.path.exists(cellar))
+
+    def test_lazy_actions_match_planned_actions(self):
+        """
+        🌊 Streamed Journeys Equal the Journeys Written on the Scroll
+        """
+        blueprint = IntelligentOrganizer(categorizer=None).create_organization_plan(self.categorized)
+        engine = ActionEngine()
+        engine.plan_actions(blueprint, '/kingdom')
+
+        with ExternalPlanner(max_records_in_memory=2) as planner:
+            planner.add_categorized(self.categorized)
+            streamed = list(ActionEngine().iter_actions(planner.groups(), '/kingdom'))
+
+        self.assertEqual(sorted(action[:3] for action in streamed),
+                         sorted(action[:3] for action in engine.get_planned_actions()))
+
+    def test_streamed_realm_is_never_held_whole(self):
+        """
+        🌊 Records Streamed Into the Planner and the Catalog Are Let Go Once Spilled
+        """
+        alive = most_alive = 0
+
+        def let_go():
+            nonlocal alive
+            alive -= 1
+
+        def scanned():
+            nonlocal alive, most_alive
+            for i in range(500):
+                record = Record(path=f'/realm/scroll{i}.{("txt", "png", "mp3")[i % 3]}', size=i, modified=0.0)
+                weakref.finalize(record, let_go)
+                alive += 1
+                most_alive = max(most_alive, alive)
+                yield record
+
+        with ExternalPlanner(max_records_in_memory=20) as planner:
+            def categorized():
+                for category, record in FileCategorizer().categorize_stream(scanned()):
+                    planner.add(category, record)
+                    yield category, record
+
+            catalog = ScanCatalog.from_categorized_stream(categorized())
+            planned = sum(len(list(records)) for _, _, records in planner.groups())
+
+        # The desk's twenty, plus the one on its way
+        self.assertLessEqual(most_alive, 21)
+        self.assertEqual(planned, 500)
+        self.assertEqual(len(catalog), 500)
+        self.assertEqual(catalog.by_category()['documents']['total_files'], 167)
+
+    def test_streaming_scanner_keeps_no_records(self):
+        """
+        🕵️ A Scanner Streaming Into the Planner Lets Every Record Go, Even While Growing Its Manifest
+        """
+        realm = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, realm)
+        for i in range(100):
+            chamber = os.path.join(realm, f'chamber{i % 4}')
+            os.makedirs(chamber, exist_ok=True)
+            with open(os.path.join(chamber, f'scroll{i}.txt'), 'w') as handle:
+                handle.write('ink' * i)
+        alive = most_alive = 0
+        noted = FileScanner._get_file_metadata
+
+        def let_go():
+            nonlocal alive
+            alive -= 1
+
+        def watched_metadata(scanner, file_path, fingerprint=True):
+            nonlocal alive, most_alive
+            record = Record(noted(scanner, file_path, fingerprint))
+            weakref.finalize(record, let_go)
+            alive += 1
+            most_alive = max(most_alive, alive)
+            return record
+
+        scanner = FileScanner(realm, merkle=True, keep_records=False)
+        with patch.object(FileScanner, '_get_file_metadata', watched_metadata), \
+                ExternalPlanner(max_records_in_memory=5) as planner:
+            planner.add_stream(FileCategorizer().categorize_stream(scanner.scan()))
+            planned = sum(len(list(records)) for _, _, records in planner.groups())
+
+        # A directory's listing (25 records) is the most the walk holds at once
+        self.assertLessEqual(most_alive, 25 + 5 + 1)
+        self.assertEqual(planned, 100)
+        self.assertEqual((scanner.scanned_files, scanner.scanned_count), ([], 100))
+        kept = FileScanner(realm, merkle=True)
+        list(kept.scan())
+        self.assertEqual(scanner.merkle_tree().digest, kept.merkle_tree().digest)
+
+    def test_desk_must_hold_something(self):
+        """
+        🚫 A Desk Without Room Is Refused
+        """
+        with self.assertRaises(ValueError):
+            ExternalPlanner(max_records_in_memory=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -188,6 +188,28 @@ class TestFileCategorizer(unittest.TestCase):
         category = self.categorizer._determine_category(file)
         self.assertEqual(category, expected_category)
 
+    @patch('mimetypes.guess_type', wraps=__import__('mimetypes').guess_type)
+    def test_divinations_are_remembered_per_ending(self, mock_guess_type):
+        """
+        🧠 The Memory of the Sorting Hat
+
+        Each file ending is divined once and remembered, even across sorters
+        sharing one memory, while hidden files and bare names keep their own answers.
+        """
+        shared = {}
+        first = FileCategorizer(TEST_CATEGORIES, category_cache=shared)
+        second = FileCategorizer(TEST_CATEGORIES, category_cache=shared)
+        paths = ['/a/one.svg', '/b/two.svg', '/c/.svg', '/d/README', '/e/three.tar.gz', '/f/four.gz']
+
+        answers = [first._determine_category({'path': path}) for path in paths]
+        calls = mock_guess_type.call_count
+        again = [second._determine_category({'path': path}) for path in paths]
+        redivined = mock_guess_type.call_count - calls
+
+        self.assertEqual(answers, again)
+        self.assertEqual(answers, [first._divine_category(path) for path in paths])
+        self.assertEqual(redivined, 2)  # Only names without an ending, README and .svg, are divined again
+
     def test_performance_large_file_set(self):
         """
         ⚡ The Lightning Speed Challenge
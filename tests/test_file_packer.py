@@ -0,0 +1,116 @@
+"""
+🧙‍♂️ The Magical Trials of the File Packer 🎒
+
+Here we fold tiny scrolls into satchels, read single scrolls straight from
+their offsets, and make sure every scroll comes back out exactly as it went in.
+"""
+
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from core.action_engine import ActionEngine
+from core.file_packer import FilePacker
+
+
+class TestFilePacker(unittest.TestCase):
+    """
+    🏰 The Grand Hall of File Packer Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring a Bucket of Tiny Scrolls
+        """
+        self.workspace = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workspace)
+        self.bucket = os.path.join(self.workspace, 'documents', 'txt')
+        os.makedirs(self.bucket)
+        self.sources = []
+        for number in range(3):
+            path = os.path.join(self.bucket, f"note{number}.txt")
+            with open(path, 'w') as handle:
+                handle.write(f"scroll number {number}\n" * (number + 1))
+            os.utime(path, (1600000000 + number, 1600000000 + number))
+            self.sources.append(path)
+        self.packer = FilePacker()
+
+    def test_members_are_read_with_one_seek(self):
+        """
+        🔑 Every Member Is Found Through the Index, and the Satchel Stays a Tar
+        """
+        container = FilePacker.next_container(self.bucket)
+        index = self.packer.pack(self.sources, container)
+
+        self.assertEqual(os.path.basename(container), '.wizard-pack-0001.tar')
+        self.assertEqual(sorted(index['members']), ['note0.txt', 'note1.txt', 'note2.txt'])
+        self.assertEqual(self.packer.read(container, 'note2.txt'), b"scroll number 2\n" * 3)
+        self.assertFalse(any(os.path.exists(source) for source in self.sources))
+        with tarfile.open(container) as tar:
+            self.assertEqual(tar.extractfile('note1.txt').read(), b"scroll number 1\n" * 2)
+
+    def test_unpack_restores_files_exactly(self):
+        """
+        📤 Unpacking Brings Back Contents and Modification Times, Then Tidies Up
+        """
+        container = FilePacker.next_container(self.bucket)
+        self.packer.pack(self.sources, container)
+
+        self.assertEqual(self.packer.unpack(container), 3)
+
+        with open(self.sources[1]) as handle:
+            self.assertEqual(handle.read(), "scroll number 1\n" * 2)
+        self.assertEqual(os.stat(self.sources[2]).st_mtime, 1600000002)
+        self.assertEqual(sorted(os.listdir(self.bucket)), ['note0.txt', 'note1.txt', 'note2.txt'])
+
+    def test_unpack_never_overwrites(self):
+        """
+        🛡️ A File Reborn in the Meantime Is Kept, and So Is the Satchel
+        """
+        container = FilePacker.next_container(self.bucket)
+        self.packer.pack(self.sources, container)
+        with open(self.sources[0], 'w') as handle:
+            handle.write("newer scroll")
+
+        with redirect_stdout(StringIO()):
+            restored = self.packer.unpack(container)
+
+        self.assertEqual(restored, 2)
+        with open(self.sources[0]) as handle:
+            self.assertEqual(handle.read(), "newer scroll")
+        self.assertTrue(os.path.exists(container))
+
+    def test_action_engine_folds_small_files_per_home(self):
+        """
+        🧚 Small Files Travel in a Satchel, Large Ones and Satchels Stay as They Are
+        """
+        big = os.path.join(self.workspace, 'big.txt')
+        with open(big, 'w') as handle:
+            handle.write("x" * 1000)
+        records = [{'path': path, 'size': os.path.getsize(path), 'modified': os.path.getmtime(path)}
+                   for path in self.sources + [big]]
+        engine = ActionEngine(pack_threshold=500, pack_max_members=2)
+
+        engine.plan_actions({'documents': {'txt': records}}, self.workspace)
+        actions = engine.get_planned_actions()
+
+        self.assertEqual([action[0] for action in actions], ['pack', 'move'])
+        self.assertEqual(actions[0][1], self.sources[:2])
+        self.assertEqual(actions[1][1], big)
+        # The lone small file left over needs no journey: it already lives in the bucket
+        self.assertEqual(engine.already_in_place, 1)
+
+        outcome = engine.execute_actions()
+        self.assertEqual(outcome, {"moved": 1, "packed": 2, "failed": 0, "deferred": 0})
+
+        engine.plan_actions({'documents': {'txt': [{'path': actions[0][2], 'size': 10, 'modified': 0}]}},
+                            self.workspace)
+        self.assertEqual(engine.get_planned_actions(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -228,6 +228,39 @@ class TestFileScanner(unittest.TestCase):
 
         self.assertEqual(len(scanned_files), 0, "Expected no files when permission is denied")
 
+    def test_fingerprints_are_lazy(self):
+        """
+        🙈 The Walk Opens No File Until Someone Asks for Fingerprints
+
+        A plain scan notes metadata only; fingerprints come on demand, and
+        records that already carry one are never read again.
+        """
+        self.mock_path.return_value.rglob.return_value = [self.create_mock_file('file1.txt'),
+                                                          self.create_mock_file('file2.jpg')]
+
+        with patch.object(FileScanner, '_generate_file_fingerprint', return_value='fake_hash') as fingerprint:
+            scanner = FileScanner('/fake/path')
+            scanned_files = list(scanner.scan())
+            self.assertEqual([record['fingerprint'] for record in scanned_files], [None, None])
+            fingerprint.assert_not_called()
+
+            sealed = list(scanner.fingerprint_records(scanned_files))
+            list(scanner.fingerprint_records(sealed))
+
+        self.assertEqual([record['fingerprint'] for record in sealed], ['fake_hash', 'fake_hash'])
+        self.assertEqual(fingerprint.call_count, 2)
+
+    def test_fingerprints_on_request(self):
+        """
+        🖐️ A Scanner Asked to Fingerprint Seals Every Record During the Walk
+        """
+        self.mock_path.return_value.rglob.return_value = [self.create_mock_file('file1.txt')]
+
+        with patch.object(FileScanner, '_generate_file_fingerprint', return_value='fake_hash'):
+            scanned_files = list(FileScanner('/fake/path', fingerprint=True).scan())
+
+        self.assertEqual(scanned_files[0]['fingerprint'], 'fake_hash')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+"""
+🗝️ The Magical Trials of the Fingerprint Index 📇
+
+Here we export the ledgers of several hosts and merge them, checking that
+twins are found across realms while the merge reads every ledger only once.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.file_scanner import FileScanner
+from core.fingerprint_index import FingerprintIndex
+from core.scan_catalog import ScanCatalog
+
+
+def fingerprint(content):
+    return hashlib.md5(content).hexdigest()
+
+
+class TestFingerprintIndex(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Fingerprint Index Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring the Catalogs of Two Hosts
+        """
+        self.workspace = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workspace)
+        self.castle = ScanCatalog.from_categorized({'documents': [
+            {'path': '/castle/a.txt', 'size': 5, 'fingerprint': fingerprint(b'hello')},
+            {'path': '/castle/b.txt', 'size': 5, 'fingerprint': fingerprint(b'hello')},
+            {'path': '/castle/c.txt', 'size': 5, 'fingerprint': fingerprint(b'world')},
+            {'path': '/castle/d.txt', 'size': 7, 'fingerprint': None},
+            {'path': '/castle/e.txt', 'size': 7, 'fingerprint': 'Permission denied'},
+            {'path': '/castle/empty.txt', 'size': 0, 'fingerprint': fingerprint(b'')},
+        ]})
+        self.tower = ScanCatalog.from_categorized({'images': [
+            {'path': '/tower/world.png', 'size': 5, 'fingerprint': fingerprint(b'world')},
+            {'path': '/tower/über.png', 'size': 6, 'fingerprint': fingerprint(b'unique')},
+            {'path': '/tower/empty.png', 'size': 0, 'fingerprint': fingerprint(b'')},
+        ]})
+
+    def export(self, catalog, label):
+        path = os.path.join(self.workspace, f"{label}.wfpi")
+        FingerprintIndex.from_catalog(catalog, path, label)
+        return path
+
+    def test_export_is_sorted_and_skips_unknown_fingerprints(self):
+        """
+        📇 Only Real Fingerprints Are Exported, in Digest Order, With Their Paths
+        """
+        index = FingerprintIndex(self.export(self.castle, 'castle'))
+        entries = list(index.entries())
+
+        self.assertEqual(index.label, 'castle')
+        self.assertEqual(len(index), 4)
+        self.assertEqual(entries, sorted(entries))
+        self.assertIn((bytes.fromhex(fingerprint(b'world')), 5, '/castle/c.txt'), entries)
+
+    def test_unfingerprinted_scans_are_fingerprinted_on_export(self):
+        """
+        🖐️ Files a Lazy Scan Left Unread Are Fingerprinted on Export, Unless They Changed Since
+        """
+        realm = os.path.join(self.workspace, 'realm')
+        os.makedirs(realm)
+        for name, content in (('a.txt', b'hello'), ('b.txt', b'hello'), ('c.txt', b'world')):
+            with open(os.path.join(realm, name), 'wb') as handle:
+                handle.write(content)
+        scanner = FileScanner(realm)
+        catalog = ScanCatalog.from_categorized({'documents': list(scanner.scan())})
+        with open(os.path.join(realm, 'c.txt'), 'ab') as handle:
+            handle.write(b' has changed')
+
+        path = os.path.join(self.workspace, 'realm.wfpi')
+        count = FingerprintIndex.from_catalog(catalog, path, 'realm', scanner.fingerprint_records)
+        entries = list(FingerprintIndex(path).entries())
+
+        self.assertEqual(count, 2)
+        self.assertEqual(sorted(entry[1] for entry in entries), [5, 5])
+        self.assertEqual({entry[0] for entry in entries}, {bytes.fromhex(fingerprint(b'hello'))})
+        self.assertEqual(FingerprintIndex.from_catalog(catalog, path, 'realm'), 0)
+
+    def test_merge_finds_twins_within_and_across_hosts(self):
+        """
+        🔀 The Merge Reports Every Duplicate Set, or Only Those Spanning Hosts
+        """
+        indexes = [self.export(self.castle, 'castle'), self.export(self.tower, 'tower')]
+
+        found = {duplicates['fingerprint']: duplicates for duplicates in FingerprintIndex.merge(indexes)}
+        across = list(FingerprintIndex.merge(indexes, cross_root_only=True))
+
+        self.assertEqual(set(found), {fingerprint(b'hello'), fingerprint(b'world')})
+        self.assertEqual(found[fingerprint(b'world')]['members'],
+                         [{'index': 'castle', 'path': '/castle/c.txt'}, {'index': 'tower', 'path': '/tower/world.png'}])
+        self.assertEqual([duplicates['fingerprint'] for duplicates in across], [fingerprint(b'world')])
+        # Empty files are all alike and skipped unless asked for
+        self.assertEqual(len(list(FingerprintIndex.merge(indexes, min_size=0))), 3)
+
+    def test_foreign_files_are_refused(self):
+        """
+        🚫 A File That Is Not an Index Is Refused
+        """
+        path = os.path.join(self.workspace, 'scroll.txt')
+        with open(path, 'wb') as handle:
+            handle.write(b'not an index at all, just a scroll')
+        with self.assertRaises(ValueError):
+            FingerprintIndex(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
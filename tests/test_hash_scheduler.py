@@ -0,0 +1,144 @@
+"""
+🚦 The Magical Trials of the Hash Scheduler 🛣️
+
+Here we make sure the traffic warden sends every file down the right lane,
+bundles the little ones together, and never loses a traveller on the way.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from core.file_scanner import FileScanner
+from core.hash_scheduler import HashScheduler
+
+
+class TestHashScheduler(unittest.TestCase):
+    """
+    🏰 The Toll Booth of Hash Scheduler Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Recording Every Fingerprint Spell Cast by the Lanes
+        """
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _fake_fingerprint(self, path, chunk_size):
+        with self.lock:
+            self.calls.append((str(path), chunk_size, threading.current_thread().name))
+        return f"hash-{path.name}"
+
+    def test_files_are_routed_by_size(self):
+        """
+        🐇🐘 Little Files and Giants Take Different Lanes
+        """
+        scheduler = HashScheduler(large_file_threshold=1000, small_buffer_size=10, large_buffer_size=99,
+                                  small_batch_size=2, fingerprint=self._fake_fingerprint)
+        records = [{'path': f'/realm/small{i}', 'size': 10} for i in range(5)]
+        records.append({'path': '/realm/giant', 'size': 5000})
+
+        results = list(scheduler.fingerprint_records(records))
+
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(record['fingerprint'].startswith('hash-') for record in results))
+        lanes = {path: (chunk_size, thread) for path, chunk_size, thread in self.calls}
+        self.assertEqual(lanes['/realm/giant'][0], 99)
+        self.assertTrue(lanes['/realm/giant'][1].startswith('large-lane'))
+        self.assertEqual(lanes['/realm/small0'][0], 10)
+        self.assertTrue(lanes['/realm/small0'][1].startswith('small-lane'))
+
+    def test_small_files_are_batched(self):
+        """
+        📦 Small Files Travel in Bundles
+        """
+        scheduler = HashScheduler(small_batch_size=3, fingerprint=self._fake_fingerprint)
+        batches = []
+        original = scheduler._hash_batch
+
+        def spy(batch, chunk_size, seal=None):
+            batches.append(len(batch))
+            return original(batch, chunk_size, seal)
+
+        scheduler._hash_batch = spy
+        list(scheduler.fingerprint_records({'path': f'/realm/f{i}', 'size': 1} for i in range(7)))
+
+        self.assertEqual(sorted(batches), [1, 3, 3])
+
+    def test_ordered_files_keep_their_order_within_each_lane(self):
+        """
+        💿 Files Already in On-Disk Order Are Read in That Order Within Each Lane
+        """
+        def slow_fingerprint(path, chunk_size):
+            time.sleep(0.001)
+            return self._fake_fingerprint(path, chunk_size)
+
+        scheduler = HashScheduler(large_file_threshold=1000, small_workers=4, large_workers=3,
+                                  small_batch_size=2, fingerprint=slow_fingerprint)
+        records = [{'path': f'/realm/f{i:02}', 'size': 5000 if i % 5 == 0 else 10} for i in range(40)]
+
+        results = list(scheduler.fingerprint_records(records, ordered=True))
+
+        self.assertEqual(len(results), 40)
+        for lane, giants in (('small-lane', False), ('large-lane', True)):
+            read = [path for path, _, thread in self.calls if thread.startswith(lane)]
+            given = [record['path'] for record in records if (record['size'] >= 1000) == giants]
+            self.assertEqual(read, given)
+
+    def test_known_fingerprints_are_not_read_again(self):
+        """
+        🔏 Fingerprints Already Carried or Remembered by the Scanner Are Reused, Not Read Again
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        for name in ('remembered.txt', 'new.txt'):
+            with open(os.path.join(root, name), 'wb') as handle:
+                handle.write(name.encode())
+        remembered = os.path.join(root, 'remembered.txt')
+        stat = os.stat(remembered)
+        scheduler = HashScheduler(fingerprint=self._fake_fingerprint)
+        scanner = FileScanner(root, hash_scheduler=scheduler,
+                              known_fingerprints={remembered: (stat.st_size, stat.st_mtime, 'remembered-seal')})
+
+        results = {record['name']: record['fingerprint'] for record in scanner.scan()}
+        carried = list(scheduler.fingerprint_records([{'path': '/realm/carried', 'size': 1, 'modified': 0.0,
+                                                       'fingerprint': 'manifest-seal'}], seal=scanner._seal))
+
+        self.assertEqual(results, {'remembered.txt': 'remembered-seal', 'new.txt': 'hash-new.txt'})
+        self.assertEqual(carried[0]['fingerprint'], 'manifest-seal')
+        self.assertEqual([path for path, _, _ in self.calls], [os.path.join(root, 'new.txt')])
+
+    def test_invalid_lane_configuration(self):
+        """
+        🚧 A Lane Without Workers Is No Lane at All
+        """
+        with self.assertRaises(ValueError):
+            HashScheduler(small_workers=0)
+        with self.assertRaises(ValueError):
+            HashScheduler(small_batch_size=0)
+
+    def test_scanner_uses_scheduler(self):
+        """
+        🔍 The FileScanner Hands Its Files to the Lanes
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        for name, content in (('a.txt', b'alpha'), ('b.txt', b'beta' * 100)):
+            with open(os.path.join(root, name), 'wb') as handle:
+                handle.write(content)
+
+        scanner = FileScanner(root, hash_scheduler=HashScheduler(large_file_threshold=100))
+        results = {record['name']: record['fingerprint'] for record in scanner.scan()}
+
+        self.assertEqual(results['a.txt'], hashlib.md5(b'alpha').hexdigest())
+        self.assertEqual(results['b.txt'], hashlib.md5(b'beta' * 100).hexdigest())
+        self.assertEqual(len(scanner.scanned_files), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
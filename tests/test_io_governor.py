@@ -0,0 +1,147 @@
+"""
+🚰 The Magical Trials of the I/O Governor 🌊
+
+Here we test the keeper of the floodgates with an enchanted clock, so that
+no trial has to wait for real seconds to pass.
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from core.action_engine import ActionEngine
+from core.file_scanner import FileScanner
+from core.io_governor import IOGovernor
+
+
+class FakeClock:
+    """
+    ⏰ An Enchanted Clock Whose Hands Only Move When Someone Sleeps
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+class TestIOGovernor(unittest.TestCase):
+    """
+    🏰 The Lock-Keeper's Cottage of I/O Governor Tests
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def _governor(self, **limits):
+        return IOGovernor(clock=self.clock, sleep=self.clock.sleep, **limits)
+
+    def test_byte_ceiling(self):
+        """
+        🪙 Ten Megabytes at Two Megabytes per Second Take Four Seconds After the First Bucket
+        """
+        governor = self._governor(max_bytes_per_second=2 * 1024 * 1024)
+        for _ in range(10):
+            governor.acquire(nbytes=1024 * 1024, ops=1)
+
+        self.assertAlmostEqual(self.clock.slept, 4.0)
+
+    def test_operation_ceiling(self):
+        """
+        🔢 Operations Are Metered Separately From Bytes
+        """
+        governor = self._governor(max_ops_per_second=100)
+        for _ in range(300):
+            governor.acquire(ops=1)
+
+        self.assertAlmostEqual(self.clock.slept, 2.0)
+
+    def test_schedule_switches_ceilings(self):
+        """
+        🕰️ Business Hours Are Gentle, Nights Are Unlimited
+        """
+        schedule = IOGovernor.parse_schedule("08:00-18:00=1/10, 18:00-08:00=-/-")
+        noon = IOGovernor(schedule=schedule, wall_clock=lambda: datetime(2024, 1, 1, 12, 0))
+        midnight = IOGovernor(schedule=schedule, wall_clock=lambda: datetime(2024, 1, 1, 0, 30))
+
+        self.assertEqual(noon.current_limits(), (1024 * 1024, 10))
+        self.assertEqual(midnight.current_limits(), (None, None))
+        with self.assertRaises(ValueError):
+            IOGovernor.parse_schedule("whenever")
+
+    def test_latency_backoff_and_recovery(self):
+        """
+        🐢 Slow Disks Lower the Ceilings, Quick Disks Raise Them Again
+        """
+        governor = self._governor(max_bytes_per_second=1000, latency_target=0.01)
+        for _ in range(5):
+            governor.observe_latency(0.1)
+        lowered = governor.current_limits()[0]
+        for _ in range(200):
+            governor.observe_latency(0.001)
+
+        self.assertLess(lowered, 500)
+        self.assertEqual(governor.current_limits()[0], 1000)
+
+    def test_scanner_and_engine_share_a_governor(self):
+        """
+        🤝 Fingerprint Reads and Moves Both Pass the Floodgates
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        with open(os.path.join(root, 'scroll.txt'), 'wb') as handle:
+            handle.write(b'x' * 1000)
+        governor = self._governor(max_ops_per_second=1)
+        governor._op_tokens = 0.0
+
+        records = list(FileScanner(root, governor=governor, fingerprint=True).scan())
+        engine = ActionEngine(governor=governor)
+        engine.plan_actions({'documents': {'txt': records}}, os.path.join(root, 'out'))
+        engine.execute_actions()
+
+        # Two reads (data, then end of file) and one move, one second each
+        self.assertAlmostEqual(self.clock.slept, 3.0)
+        self.assertTrue(os.path.exists(os.path.join(root, 'out', 'documents', 'txt', 'scroll.txt')))
+
+    def test_moves_across_devices_pay_chunk_by_chunk(self):
+        """
+        🌉 A Copy Across Devices Passes the Floodgates One Chunk at a Time, Each Timed on Its Own
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        source = os.path.join(root, 'tome.bin')
+        with open(source, 'wb') as handle:
+            handle.write(b'x' * (5 * 1024 * 1024 // 2))
+        governor = self._governor(max_bytes_per_second=1024 * 1024, latency_target=0.5)
+        charges = []
+        governed = governor.operation
+
+        def recorded_operation(nbytes=0, ops=1):
+            charges.append(nbytes)
+            return governed(nbytes, ops)
+
+        cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+        with patch.object(governor, 'operation', side_effect=recorded_operation), \
+                patch('core.action_engine.os.rename', side_effect=cross_device):
+            ActionEngine(governor=governor)._move_file(source, os.path.join(root, 'out', 'tome.bin'),
+                                                       hashlib.md5(b'x' * (5 * 1024 * 1024 // 2)).hexdigest())
+
+        # The rename attempt, then two full chunks, the last half chunk and the end of the file
+        self.assertEqual(charges, [0] + [1024 * 1024] * 4)
+        self.assertEqual(governor.backoff_factor, 1.0)
+        self.assertFalse(os.path.exists(source))
+
+
+if __name__ == '__main__':
+    unittest.main()
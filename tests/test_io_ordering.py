@@ -0,0 +1,74 @@
+"""
+💿 The Magical Trials of the I/O Orderer 🌀
+
+Here we check that the platter whisperer sorts files into on-disk order,
+never holds more than one window of files, and loses nobody on the way.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.file_scanner import FileScanner
+from core.io_ordering import IOOrderer
+
+
+class TestIOOrderer(unittest.TestCase):
+    """
+    🏰 The Spinning Tower of I/O Ordering Tests
+    """
+
+    def test_inode_order_within_windows(self):
+        """
+        🔢 Files Are Sorted by Inode, One Window at a Time
+        """
+        records = [{'path': f'/realm/{inode}', 'inode': inode, 'device': 1} for inode in (5, 3, 9, 1, 7, 2)]
+
+        ordered = list(IOOrderer(mode='inode', window=3).order(records))
+
+        self.assertEqual([record['inode'] for record in ordered], [3, 5, 9, 1, 2, 7])
+
+    def test_invalid_configuration(self):
+        """
+        🚧 Unknown Orderings and Empty Windows Are Refused
+        """
+        with self.assertRaises(ValueError):
+            IOOrderer(mode='alphabetical')
+        with self.assertRaises(ValueError):
+            IOOrderer(window=0)
+
+    def test_extent_order_falls_back_to_inode(self):
+        """
+        🗺️ Files Without Known Extents Queue Up Behind the Mapped Ones
+        """
+        orderer = IOOrderer(mode='extent')
+        orderer._first_extent = lambda path: {'/realm/a': 400, '/realm/b': 100}.get(path)
+        records = [{'path': path, 'inode': inode, 'device': 1}
+                   for path, inode in (('/realm/c', 1), ('/realm/a', 2), ('/realm/b', 3))]
+
+        ordered = [record['path'] for record in orderer.order(records)]
+
+        self.assertEqual(ordered, ['/realm/b', '/realm/a', '/realm/c'])
+
+    def test_scanner_fingerprints_in_physical_order(self):
+        """
+        🔍 The FileScanner Still Fingerprints Every File When Ordering Is On
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        for index in range(5):
+            with open(os.path.join(root, f'scroll{index}.txt'), 'wb') as handle:
+                handle.write(b'x' * (index + 1))
+
+        scanner = FileScanner(root, io_orderer=IOOrderer(mode='extent', window=2))
+        records = list(scanner.scan())
+
+        self.assertEqual(len(records), 5)
+        for record in records:
+            self.assertEqual(record['fingerprint'], hashlib.md5(b'x' * record['size']).hexdigest())
+
+
+if __name__ == '__main__':
+    unittest.main()
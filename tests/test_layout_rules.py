@@ -0,0 +1,101 @@
+"""
+🧙‍♂️ The Magical Trials of the Layout Rules 📐
+
+Here we check that compiled rules send every file where the scroll says,
+first match first, and that nothing captured from a path can climb out of
+the promised land.
+"""
+
+import os
+import time
+import unittest
+
+from core.action_engine import ActionEngine
+from core.layout_rules import LayoutRules
+
+NOW = 1700000000.0
+
+
+def record(path, size=100, modified=NOW - 10 * 86400):
+    return {'path': path, 'size': size, 'modified': modified}
+
+
+class TestLayoutRules(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Layout Rule Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring a Scroll of Rules
+        """
+        self.layout = LayoutRules("""
+            # Giants first
+            size > 1G                               => bulk
+            category == images                      => photos/{year}/{month}
+            path ~ /projects/(?P<project>[^/]+)/    => projects/{project}/{type}
+            type in doc,docx and age > 365d         => archive/{year}
+            type == mp3                             => music/{parent}
+            type in flac,wav                        => music/lossless
+            type == flac                            => never
+        """, now=NOW)
+
+    def test_first_matching_rule_wins(self):
+        """
+        🥇 Each File Follows the First Rule That Fits It
+        """
+        moment = time.localtime(NOW - 10 * 86400)
+        self.assertEqual(self.layout(record('/a/huge.png', size=2 * 1024 ** 3), 'images'), 'bulk')
+        self.assertEqual(self.layout(record('/a/cat.png'), 'images'),
+                         f"photos/{moment.tm_year:04d}/{moment.tm_mon:02d}")
+        self.assertEqual(self.layout(record('/x/projects/apollo/plan.TXT'), 'documents'), 'projects/apollo/txt')
+        self.assertEqual(self.layout(record('/a/old.doc', modified=NOW - 400 * 86400), 'documents'),
+                         f"archive/{time.localtime(NOW - 400 * 86400).tm_year:04d}")
+        self.assertEqual(self.layout(record('/a/band/song.mp3'), 'audio'), 'music/band')
+        self.assertEqual(self.layout(record('/a/song.flac'), 'audio'), 'music/lossless')
+
+    def test_unmatched_files_keep_the_default_layout(self):
+        """
+        🏠 Files No Rule Claims Go to <category>/<file type>
+        """
+        self.assertEqual(self.layout(record('/a/new.doc'), 'documents'), 'documents/doc')
+        self.assertEqual(self.layout(record('/a/README'), 'unknown'), 'unknown/unknown')
+
+    def test_equality_runs_become_a_table(self):
+        """
+        🗂️ Consecutive Type Tests Are Compiled Into One Lookup
+        """
+        self.assertIn('_TABLE', self.layout.source)
+        self.assertNotIn("'never'", self.layout.source)
+
+    def test_captured_segments_cannot_escape(self):
+        """
+        🛡️ A Captured '..' Stays Inside the Promised Land
+        """
+        self.assertEqual(self.layout(record('/x/projects/../plan.txt'), 'documents'), 'projects/_/txt')
+
+    def test_unreadable_rules_are_refused(self):
+        """
+        🚫 Rules the Scroll Cannot Understand Are Refused at Compile Time
+        """
+        for text in ("size > 1G bulk", "colour == red => red", "size > huge => bulk",
+                     "type == txt => {nonsense}", "category ~ (?P<year>x) => {year}", "name > a => z"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                LayoutRules(text, now=NOW)
+
+    def test_action_engine_follows_the_layout(self):
+        """
+        🧚 The Action Engine Sends Files Where the Rules Say
+        """
+        plan = {'audio': {'mp3': [record('/a/band/song.mp3')]}, 'unknown': {'unknown': [record('/a/README')]}}
+        engine = ActionEngine()
+
+        engine.plan_actions(plan, '/kingdom', layout=self.layout)
+
+        self.assertEqual([action[2] for action in engine.get_planned_actions()],
+                         [os.path.join('/kingdom', 'music', 'band', 'song.mp3'),
+                          os.path.join('/kingdom', 'unknown', 'unknown', 'README')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+🧙‍♂️ The Magical Trials of the Merkle Tree 🌳
+
+Here we seal realms into trees of directory digests, compare them while
+visiting only what changed, and rescan without relisting directories that
+stood still.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+from core.file_scanner import FileScanner
+from core.merkle_tree import MerkleTree
+
+
+class TestMerkleTree(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Merkle Tree Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring a Realm With a Few Quiet Corners
+        """
+        self.workspace = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workspace)
+        self.root = os.path.join(self.workspace, 'realm')
+        for relative in ('north/keep/scroll.txt', 'north/map.png', 'south/song.mp3', 'gate.txt'):
+            path = os.path.join(self.root, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as handle:
+                handle.write(relative)
+        os.makedirs(os.path.join(self.root, 'empty'))
+
+    def seal(self, root, **options):
+        scanner = FileScanner(root, merkle=True, **options)
+        with redirect_stdout(StringIO()):
+            records = list(scanner.scan())
+        return scanner, records, scanner.merkle_tree()
+
+    def test_copies_seal_alike_and_changes_are_pinpointed(self):
+        """
+        ⚖️ Identical Realms Match; a Changed One Is Compared Only Along Changed Paths
+        """
+        copy = os.path.join(self.workspace, 'copy')
+        shutil.copytree(self.root, copy)
+        before = self.seal(self.root)[2]
+        self.assertEqual(before.digest, self.seal(copy)[2].digest)
+
+        with open(os.path.join(copy, 'north', 'keep', 'scroll.txt'), 'a') as handle:
+            handle.write('!')
+        os.remove(os.path.join(copy, 'gate.txt'))
+        os.makedirs(os.path.join(copy, 'west'))
+        comparison = before.compare(self.seal(copy)[2])
+
+        self.assertFalse(comparison['identical'])
+        self.assertEqual(comparison['changed'], [os.path.join('north', 'keep', 'scroll.txt')])
+        self.assertEqual(comparison['removed'], ['gate.txt'])
+        self.assertEqual(comparison['added'], ['west' + os.sep])
+        # The root, north and north/keep; south and empty are never opened
+        self.assertEqual(comparison['directories_visited'], 3)
+
+    def test_manifest_survives_the_journey_to_disk(self):
+        """
+        💾 A Saved and Reloaded Manifest Compares Identical to Its Tree
+        """
+        tree = self.seal(self.root)[2]
+        manifest = os.path.join(self.workspace, 'manifest.json.gz')
+        tree.save(manifest)
+
+        loaded = MerkleTree.load(manifest)
+
+        self.assertEqual(loaded.root, os.path.abspath(self.root))
+        self.assertTrue(loaded.compare(tree)['identical'])
+
+    def test_incremental_rescan_skips_unchanged_directories(self):
+        """
+        🕰️ Directories Whose Modification Time Stood Still Are Not Listed Again
+        """
+        _, records, previous = self.seal(self.root)
+        with open(os.path.join(self.root, 'south', 'chant.mp3'), 'w') as handle:
+            handle.write('new')
+
+        with patch('core.file_scanner.os.scandir', wraps=os.scandir) as scandir:
+            scanner, rescanned, tree = self.seal(self.root, previous_tree=previous)
+
+        self.assertEqual([call.args[0] for call in scandir.call_args_list], [os.path.join(self.root, 'south')])
+        self.assertEqual(scanner.reused_directories, 4)
+        expected = [record['path'] for record in records] + [os.path.join(self.root, 'south', 'chant.mp3')]
+        self.assertEqual(sorted(record['path'] for record in rescanned), sorted(expected))
+        self.assertEqual(previous.compare(tree)['added'], [os.path.join('south', 'chant.mp3')])
+
+    def test_manifest_of_another_realm_is_refused(self):
+        """
+        🚫 A Manifest Only Helps Rescan the Realm It Describes
+        """
+        previous = self.seal(self.root)[2]
+        with self.assertRaises(ValueError):
+            FileScanner(self.workspace, previous_tree=previous)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+🧙‍♂️ The Magical Trials of the Resident Wizard 🗼
+
+Here we knock on the tower's door and check that the wizard answers, keeps
+its memories warm between requests, and never forgets a file it moved.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+from core.action_engine import ActionEngine
+from core.file_scanner import FileScanner
+from core.organizer_service import OrganizerService
+
+
+class TestOrganizerService(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Resident Wizard Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring a Drop Folder and a Wizard
+        """
+        self.workspace = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workspace)
+        self.root = os.path.realpath(os.path.join(self.workspace, 'drop'))
+        os.makedirs(self.root)
+        for name in ('notes.txt', 'cat.png', 'song.mp3'):
+            with open(os.path.join(self.root, name), 'w') as handle:
+                handle.write(name)
+        self.service = OrganizerService(os.path.join(self.workspace, 'tower.sock'))
+
+    def ask(self, **request):
+        with redirect_stdout(StringIO()):
+            return self.service.handle(request)
+
+    def test_plan_lists_journeys_without_moving(self):
+        """
+        🗺️ Planning Names Every Journey and Moves Nothing
+        """
+        answer = self.ask(op='plan', root=self.root)
+
+        self.assertTrue(answer['ok'])
+        self.assertIn({'src': os.path.join(self.root, 'notes.txt'),
+                       'dst': os.path.join(self.root, 'documents', 'txt', 'notes.txt')}, answer['actions'])
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'notes.txt')))
+
+    def test_fingerprints_stay_warm_across_requests(self):
+        """
+        🖐️ Unchanged and Self-Moved Files Are Never Read Twice
+        """
+        self.service.fingerprint = True
+        with patch.object(FileScanner, '_generate_file_fingerprint', wraps=FileScanner._generate_file_fingerprint) \
+                as fingerprint:
+            self.ask(op='scan', root=self.root)
+            self.assertEqual(fingerprint.call_count, 3)
+
+            applied = self.ask(op='apply', root=self.root)
+            rescanned = self.ask(op='scan', root=self.root)
+
+        self.assertEqual(applied['moved'], 3)
+        self.assertEqual(rescanned['files'], 3)
+        self.assertEqual(fingerprint.call_count, 3)
+        self.assertEqual(self.ask(op='plan', root=self.root)['already_in_place'], 3)
+
+    def test_plain_organizing_reads_no_contents(self):
+        """
+        🙈 Without Fingerprints Asked For, Organizing Opens No File
+        """
+        with patch.object(FileScanner, '_generate_file_fingerprint') as fingerprint:
+            applied = self.ask(op='apply', root=self.root)
+
+        self.assertEqual(applied['moved'], 3)
+        fingerprint.assert_not_called()
+
+    def test_only_recent_realms_are_remembered(self):
+        """
+        🧠 The Wizard Forgets the Realms Asked About Longest Ago
+        """
+        self.service = OrganizerService(os.path.join(self.workspace, 'tower.sock'), max_realms=2)
+        realms = [self.root]
+        for number in range(2):
+            realm = os.path.join(self.workspace, f'drop{number}')
+            os.makedirs(realm)
+            realms.append(realm)
+        for realm in realms + [self.root]:
+            self.assertTrue(self.ask(op='plan', root=realm)['ok'])
+
+        self.assertEqual(list(self.service.engines), [realms[2], self.root])
+        self.assertEqual(list(self.service.fingerprints), [realms[2], self.root])
+        self.assertEqual(self.service._locks, {})
+
+    def test_plan_files_wait_for_their_realm(self):
+        """
+        🔐 Applying a Plan File Takes Its Realm's Lock
+        """
+        plan = os.path.join(self.workspace, 'plan.jsonl')
+        engine = ActionEngine()
+        with redirect_stdout(StringIO()):
+            engine.plan_actions({'documents': {'txt': [{'path': os.path.join(self.root, 'notes.txt'),
+                                                        'size': 9, 'modified': 0.0}]}}, self.root)
+        engine.export_plan(plan)
+        held = threading.Event()
+        release = threading.Event()
+        answers = []
+
+        def hold_realm():
+            with self.service._lock_for(self.root):
+                held.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold_realm)
+        holder.start()
+        held.wait(5)
+        applier = threading.Thread(target=lambda: answers.append(self.ask(op='apply', root=self.root, plan=plan)))
+        applier.start()
+        applier.join(0.2)
+        self.assertEqual(answers, [])
+        release.set()
+        holder.join(5)
+        applier.join(5)
+
+        self.assertTrue(answers[0]['ok'])
+        self.assertFalse(self.ask(op='apply', plan=plan)['ok'])
+
+    def test_failures_are_answered_not_raised(self):
+        """
+        🚫 Unknown Operations and Missing Realms Get a Polite Refusal
+        """
+        self.assertFalse(self.ask(op='dance')['ok'])
+        self.assertFalse(self.ask(op='scan')['ok'])
+        self.assertFalse(self.ask(op='scan', root=os.path.join(self.workspace, 'nowhere'))['ok'])
+
+    def test_requests_through_the_socket(self):
+        """
+        📨 The Tower Answers Through Its Door and Closes When Asked
+        """
+        tower = threading.Thread(target=self.service.serve_forever, daemon=True)
+        with redirect_stdout(StringIO()):
+            tower.start()
+            for _ in range(200):
+                if os.path.exists(self.service.socket_path):
+                    break
+                threading.Event().wait(0.01)
+
+            self.assertTrue(OrganizerService.request(self.service.socket_path, {'op': 'ping'}, timeout=5)['ok'])
+            scanned = OrganizerService.request(self.service.socket_path, {'op': 'scan', 'root': self.root}, timeout=5)
+            OrganizerService.request(self.service.socket_path, {'op': 'shutdown'}, timeout=5)
+            tower.join(timeout=5)
+
+        self.assertEqual(scanned['files'], 3)
+        self.assertFalse(tower.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
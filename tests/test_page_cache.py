@@ -0,0 +1,74 @@
+"""
+🧺 The Magical Trials of the Page Cache Policy 🍵
+
+Here we make sure the polite guest whispers the right hints to the kernel,
+at the right moments, and that fingerprints stay the same when it does.
+"""
+
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from core.file_scanner import FileScanner
+from core.page_cache import PageCachePolicy
+
+
+class TestPageCachePolicy(unittest.TestCase):
+    """
+    🏰 The Pantry of Page Cache Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Preparing a Scroll Spanning Several Readahead Windows
+        """
+        handle = tempfile.NamedTemporaryFile(delete=False)
+        handle.write(os.urandom(10000))
+        handle.close()
+        self.path = handle.name
+        self.addCleanup(os.remove, self.path)
+
+    def _hints(self, mode):
+        policy = PageCachePolicy(mode=mode, readahead=4096)
+        policy.supported = True
+        with patch('core.page_cache.os.posix_fadvise', create=True) as fadvise:
+            fingerprint = FileScanner._generate_file_fingerprint(self.path, chunk_size=1024, cache_policy=policy)
+        return fingerprint, [call.args[1:] for call in fadvise.call_args_list]
+
+    def test_drop_behind_hints(self):
+        """
+        🧹 Drop-Behind Announces, Reads Ahead, and Sweeps Up Afterwards
+        """
+        fingerprint, hints = self._hints('drop-behind')
+
+        with open(self.path, 'rb') as handle:
+            self.assertEqual(fingerprint, hashlib.md5(handle.read()).hexdigest())
+        self.assertEqual(hints[0], (0, 0, os.POSIX_FADV_SEQUENTIAL))
+        self.assertEqual(hints[1], (0, 4096, os.POSIX_FADV_WILLNEED))
+        self.assertIn((4096, 4096, os.POSIX_FADV_WILLNEED), hints)
+        self.assertIn((0, 4096, os.POSIX_FADV_DONTNEED), hints)
+        self.assertEqual(hints[-1], (0, 0, os.POSIX_FADV_DONTNEED))
+
+    def test_sequential_keeps_the_cache(self):
+        """
+        📣 The Sequential Policy Never Evicts Anything
+        """
+        _, hints = self._hints('sequential')
+
+        self.assertNotIn(os.POSIX_FADV_DONTNEED, [advice for _, _, advice in hints])
+        self.assertIn((0, 0, os.POSIX_FADV_SEQUENTIAL), hints)
+
+    def test_invalid_policy(self):
+        """
+        🚧 Unknown Manners Are Refused
+        """
+        with self.assertRaises(ValueError):
+            PageCachePolicy(mode='hoard')
+        with self.assertRaises(ValueError):
+            PageCachePolicy(readahead=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+🧬 The Magical Trials of the Relationship Analyzer 🔮
+
+Here we test that the content chunker cuts along the same seams no matter how
+a file is read, and that the diviner recognizes near-copies for what they are.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from core.relationship_analyzer import ContentChunker, RelationshipAnalyzer
+
+
+class TestRelationshipAnalyzer(unittest.TestCase):
+    """
+    🏰 The Genealogy Hall of Relationship Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring an Original Scroll, Its Near-Copies, and a Stranger
+        """
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        generator = random.Random(42)
+        self.original = bytes(generator.getrandbits(8) for _ in range(200000))
+        self.stranger = bytes(generator.getrandbits(8) for _ in range(100000))
+
+    def _write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as handle:
+            handle.write(content)
+        return path
+
+    def test_streaming_matches_in_memory_chunking(self):
+        """
+        🔪 Block Boundaries Never Change Where the Seams Fall
+        """
+        chunker = ContentChunker(min_size=256, average_size=1024, max_size=4096, block_size=5000)
+        path = self._write('scroll.bin', self.original)
+
+        streamed = list(chunker.chunk_file(path))
+
+        self.assertEqual(streamed, chunker.chunk_bytes(self.original))
+        self.assertEqual(sum(length for _, length in streamed), len(self.original))
+        self.assertTrue(all(length <= 4096 for _, length in streamed))
+
+    def test_insertion_only_disturbs_nearby_chunks(self):
+        """
+        ✏️ An Edit in the Middle Leaves Most Chunks Untouched
+        """
+        chunker = ContentChunker(min_size=256, average_size=1024, max_size=4096)
+        edited = self.original[:100000] + b'a small insertion' + self.original[100000:]
+
+        before = {fingerprint for fingerprint, _ in chunker.chunk_bytes(self.original)}
+        after = {fingerprint for fingerprint, _ in chunker.chunk_bytes(edited)}
+
+        self.assertGreater(len(before & after), 0.9 * len(before))
+
+    def test_near_copies_are_related(self):
+        """
+        👫 Appended Logs Are Family, Strangers Are Not
+        """
+        original = self._write('app.log', self.original)
+        appended = self._write('app.log.1', self.original + b'new line\n' * 1000)
+        stranger = self._write('other.bin', self.stranger)
+
+        analyzer = RelationshipAnalyzer(ContentChunker(min_size=256, average_size=1024, max_size=4096))
+        analyzer.add_files([{'path': original}, {'path': appended}, {'path': stranger}])
+        analysis = analyzer.analyze(min_shared_fraction=0.8)
+
+        self.assertEqual(len(analysis["pairs"]), 1)
+        self.assertEqual({analysis["pairs"][0]["a"], analysis["pairs"][0]["b"]}, {original, appended})
+        self.assertGreater(analysis["dedup_savings_bytes"], 0.9 * len(self.original))
+        self.assertEqual(analysis["clusters"], [sorted([original, appended])])
+
+    def test_invalid_chunk_sizes(self):
+        """
+        🚧 Nonsensical Chunk Sizes Are Refused
+        """
+        with self.assertRaises(ValueError):
+            ContentChunker(average_size=1000)
+        with self.assertRaises(ValueError):
+            ContentChunker(min_size=16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+🧙‍♂️ The Magical Trials of the Hourglass ⏳
+
+Here we give expeditions too little time on purpose and check that they stop
+between directories, explore the most promising lands first, and leave an
+exact list of what remains for the next run.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from core.file_scanner import FileScanner
+from core.scan_budget import ScanBudget
+from core.scan_checkpoint import ScanCheckpoint
+from core.scan_frontier import ScanFrontier
+
+
+class TestScanBudget(unittest.TestCase):
+    """
+    ⏳ The Chamber of Hourglass Tests
+    """
+
+    def test_whichever_limit_comes_first(self):
+        """
+        🪙 The Sand Runs Out on Operations or on Seconds
+        """
+        now = [100.0]
+        budget = ScanBudget(seconds=10, operations=5, clock=lambda: now[0])
+        budget.start()
+        budget.charge(4)
+        self.assertFalse(budget.exhausted)
+        budget.charge()
+        self.assertTrue(budget.exhausted)
+
+        budget = ScanBudget(seconds=10, clock=lambda: now[0])
+        budget.charge(1000)
+        now[0] += 9.5
+        self.assertFalse(budget.exhausted)
+        now[0] += 0.5
+        self.assertTrue(budget.exhausted)
+        self.assertEqual(budget.summary()["operations_spent"], 1000)
+
+    def test_limits_must_be_positive(self):
+        """
+        🚫 Zero or Negative Budgets Are Refused, as Are Unknown Priorities
+        """
+        for limits in ({'seconds': 0}, {'operations': -1}):
+            with self.subTest(**limits), self.assertRaises(ValueError):
+                ScanBudget(**limits)
+        with self.assertRaises(ValueError):
+            ScanFrontier("alphabetical")
+
+
+class TestBudgetedScan(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Budgeted Expedition Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring Six Lands of Three Scrolls, Changed at Different Times
+        """
+        self.workspace = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workspace)
+        self.root = os.path.join(self.workspace, 'realm')
+        self.expected = set()
+        for land in range(6):
+            directory = os.path.join(self.root, f'land{land}')
+            os.makedirs(directory)
+            for scroll in range(3):
+                path = os.path.join(directory, f'scroll{scroll}.txt')
+                with open(path, 'w') as handle:
+                    handle.write(f'{land}-{scroll}')
+                self.expected.add(path)
+        for land, age in enumerate([50, 40, 10, 30, 20, 60]):
+            when = 1_700_000_000 - age * 86400
+            os.utime(os.path.join(self.root, f'land{land}'), (when, when))
+
+    def scan(self, **options):
+        scanner = FileScanner(self.root, **options)
+        with redirect_stdout(StringIO()):
+            paths = [record['path'] for record in scanner.scan()]
+        return scanner, paths
+
+    def land(self, number):
+        return os.path.join(self.root, f'land{number}')
+
+    def test_recent_lands_first_and_the_rest_left_pending(self):
+        """
+        🕰️ The Most Recently Changed Lands Are Explored First, Each Whole
+        """
+        # The root costs 1 + 0 files, each land 1 + 3 files
+        scanner, paths = self.scan(budget=ScanBudget(operations=9), priority="recent")
+
+        self.assertEqual(sorted(paths), sorted(os.path.join(self.land(land), f'scroll{scroll}.txt')
+                                              for land in (2, 4) for scroll in range(3)))
+        self.assertEqual(scanner.pending_directories, [self.land(land) for land in (3, 1, 0, 5)])
+
+    def test_without_budget_every_priority_finds_everything(self):
+        """
+        🗺️ Priorities Only Change the Order, Never What Is Found
+        """
+        for priority in ScanFrontier.PRIORITIES:
+            with self.subTest(priority=priority):
+                scanner, paths = self.scan(priority=priority)
+                self.assertEqual(sorted(paths), sorted(self.expected))
+                self.assertEqual(scanner.pending_directories, [])
+
+    def test_pending_lands_are_picked_up_by_a_resumed_scan(self):
+        """
+        🔁 The Next Run Resumes Exactly the Subtrees Left Pending
+        """
+        bookmark = os.path.join(self.workspace, 'bookmark')
+        _, first = self.scan(budget=ScanBudget(operations=5), priority="recent",
+                             checkpoint=ScanCheckpoint(bookmark, interval=0))
+        scanner, everything = self.scan(priority="recent", checkpoint=ScanCheckpoint(bookmark, interval=0),
+                                        resume=True)
+
+        self.assertEqual(len(first), 3)
+        self.assertEqual(sorted(everything), sorted(self.expected))
+        self.assertEqual(scanner.pending_directories, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+🗃️ The Magical Trials of the Scan Catalog 📊
+
+Here we test that the columnar ledger tallies the kingdom correctly and that
+its vectorized sums stay swift even when the kingdom holds millions of files.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from core.scan_catalog import ScanCatalog
+from reporting.report_generator import ReportGenerator
+
+DAY = 86400.0
+NOW = 1_700_000_000.0
+
+
+class TestScanCatalog(unittest.TestCase):
+    """
+    🏰 The Counting House of Scan Catalog Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Drawing Up a Small Blueprint of the Kingdom
+        """
+        self.plan = {
+            'documents': {
+                'txt': [{'path': '/realm/a.txt', 'size': 100, 'modified': NOW - 10 * DAY},
+                        {'path': '/realm/b.txt', 'size': 5000, 'modified': NOW - 400 * DAY}],
+                'pdf': [{'path': '/realm/c.pdf', 'size': 2 * 1024 ** 2, 'modified': NOW - 1000 * DAY}],
+            },
+            'images': {
+                'jpg': [{'path': '/realm/d.jpg', 'size': 70000, 'modified': NOW - 60 * DAY}],
+            },
+        }
+        self.catalog = ScanCatalog.from_organization_plan(self.plan)
+
+    def test_group_by_category_and_extension(self):
+        """
+        🗺️ Every Land Is Counted, With Its Bytes and Its Peoples
+        """
+        categories = self.catalog.by_category()
+
+        self.assertEqual(categories['documents'], {"total_files": 3, "total_size": 5100 + 2 * 1024 ** 2, "groups": 2})
+        self.assertEqual(categories['images'], {"total_files": 1, "total_size": 70000, "groups": 1})
+        self.assertEqual(list(self.catalog.by_extension()), ['pdf', 'jpg', 'txt'])
+        self.assertEqual(self.catalog.total_bytes, 75100 + 2 * 1024 ** 2)
+
+    def test_size_and_age_histograms(self):
+        """
+        📏⏳ Files Land in the Right Size and Age Buckets
+        """
+        sizes = self.catalog.size_histogram()
+        ages = self.catalog.age_histogram(now=NOW)
+
+        self.assertEqual(sizes["< 4 KB"]["total_files"], 1)
+        self.assertEqual(sizes["4 KB - 64 KB"]["total_files"], 1)
+        self.assertEqual(sizes["64 KB - 1 MB"]["total_files"], 1)
+        self.assertEqual(sizes["1 MB - 16 MB"]["total_files"], 1)
+        self.assertEqual(ages["< 30 days"]["total_files"], 1)
+        self.assertEqual(ages["30 - 90 days"]["total_files"], 1)
+        self.assertEqual(ages["1 - 2 years"]["total_files"], 1)
+        self.assertEqual(ages[">= 2 years"]["total_size"], 2 * 1024 ** 2)
+
+    def test_largest_files(self):
+        """
+        🐘 The Giants Are Named, Biggest First
+        """
+        largest = self.catalog.largest(2)
+
+        self.assertEqual([file["path"] for file in largest], ['/realm/c.pdf', '/realm/d.jpg'])
+        self.assertEqual(largest[0]["category"], 'documents')
+        self.assertEqual(self.catalog.largest(0), [])
+
+    def test_mismatched_columns(self):
+        """
+        🚧 Columns of Different Lengths Are Refused
+        """
+        with self.assertRaises(ValueError):
+            ScanCatalog(['/a'], [1, 2], [0.0], [0], ['x'], [0], ['y'])
+
+    def test_summaries_of_millions_are_swift(self):
+        """
+        ⚡ Two Million Rows Are Summarized in Well Under a Second
+        """
+        rows = 2_000_000
+        generator = np.random.default_rng(1)
+        catalog = ScanCatalog([''] * rows, generator.integers(0, 10 ** 9, rows), generator.uniform(0, NOW, rows),
+                              generator.integers(0, 8, rows), [f'c{i}' for i in range(8)],
+                              generator.integers(0, 300, rows), [f'e{i}' for i in range(300)])
+
+        start = time.perf_counter()
+        catalog.by_category()
+        catalog.by_extension()
+        catalog.size_histogram()
+        catalog.age_histogram(now=NOW)
+        catalog.largest(20)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_snapshot_is_mapped_not_read(self):
+        """
+        🗺️ A Snapshot Comes Back as Views Into the Mapped File, With Every Column Intact
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'catalog' + ScanCatalog.SNAPSHOT_SUFFIX)
+
+        self.catalog.save(path)
+        snapshot = ScanCatalog.load(path)
+        # Saving again replaces the file; the mapped snapshot keeps reading the old one
+        ScanCatalog.from_organization_plan({'video': {'mp4': [{'path': '/realm/e.mp4', 'size': 1}]}}).save(path)
+
+        self.assertEqual(list(snapshot.paths), list(self.catalog.paths))
+        self.assertEqual(snapshot.by_category(), self.catalog.by_category())
+        self.assertEqual(snapshot.size_histogram(), self.catalog.size_histogram())
+        self.assertEqual(snapshot.largest(1), self.catalog.largest(1))
+        self.assertEqual(sorted(snapshot.indexes), sorted(ScanCatalog.INDEXED_COLUMNS))
+        self.assertFalse(snapshot.sizes.flags.owndata or snapshot.sizes.flags.writeable)
+        self.assertEqual(ScanCatalog.load(path).category_names, ['video'])
+
+    def test_snapshot_records_can_be_planned_again(self):
+        """
+        📚 The Rows of a Snapshot Turn Back Into Records, by Category
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'catalog' + ScanCatalog.SNAPSHOT_SUFFIX)
+        self.catalog.save(path)
+
+        categorized = ScanCatalog.load(path).to_categorized()
+
+        self.assertEqual([file['path'] for file in categorized['documents']],
+                         ['/realm/a.txt', '/realm/b.txt', '/realm/c.pdf'])
+        self.assertEqual(categorized['images'][0]['size'], 70000)
+        self.assertEqual(categorized['images'][0]['extension'], '.jpg')
+
+    def test_foreign_files_are_not_snapshots(self):
+        """
+        🚫 A File That Is Not a Snapshot Is Refused
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'catalog' + ScanCatalog.SNAPSHOT_SUFFIX)
+        with open(path, 'wb') as handle:
+            handle.write(b'a scroll of quite ordinary words, no snapshot here')
+        with self.assertRaises(ValueError):
+            ScanCatalog.load(path)
+
+    def test_summary_report_uses_catalog(self):
+        """
+        📜 The Chronicle Carries the New Breakdowns
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        files = [file for types in self.plan.values() for group in types.values() for file in group]
+
+        report = ReportGenerator(directory).generate_summary_report(files, self.plan)
+
+        self.assertEqual(report["total_files"], 4)
+        self.assertEqual(report["categories"]["documents"]["total_files"], 3)
+        self.assertEqual(report["largest_files"][0]["path"], '/realm/c.pdf')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+🧙‍♂️ The Magical Trials of the Scan Bookmark 🔖
+
+Here we interrupt expeditions on purpose and check that a resumed walk finds
+every file exactly once, without exploring finished lands again.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+from core.file_scanner import FileScanner
+from core.scan_checkpoint import ScanCheckpoint
+
+
+class TestScanCheckpoint(unittest.TestCase):
+    """
+    🏰 The Grand Hall of Scan Bookmark Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring a Realm of Many Small Lands
+        """
+        self.workspace = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workspace)
+        self.root = os.path.join(self.workspace, 'realm')
+        self.expected = set()
+        for land in range(6):
+            for scroll in range(3):
+                path = os.path.join(self.root, f'land{land}', f'scroll{scroll}.txt')
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w') as handle:
+                    handle.write(f'{land}-{scroll}')
+                self.expected.add(path)
+        self.bookmark = os.path.join(self.workspace, 'bookmark')
+
+    def scan(self, limit=None, resume=False):
+        """
+        🚶 Walk the Realm With a Bookmark That Saves After Every Directory
+
+        Args:
+            limit (int, optional): Abandon the walk after this many files
+
+        Returns:
+            List[str]: The paths seen before the walk ended
+        """
+        scanner = FileScanner(self.root, checkpoint=ScanCheckpoint(self.bookmark, interval=0), resume=resume)
+        seen = []
+        with redirect_stdout(StringIO()):
+            walk = scanner.scan()
+            for record in walk:
+                seen.append(record['path'])
+                if limit is not None and len(seen) == limit:
+                    walk.close()
+                    break
+        return seen
+
+    def test_interrupted_scan_resumes_without_losses_or_repeats(self):
+        """
+        🔁 An Abandoned Walk Picks Up Where It Stopped
+        """
+        partial = self.scan(limit=7)
+        self.assertEqual(len(partial), 7)
+
+        with patch('core.file_scanner.os.scandir', wraps=os.scandir) as scandir:
+            resumed = self.scan(resume=True)
+
+        self.assertEqual(sorted(resumed), sorted(self.expected))
+        # Lands finished before the interruption were not listed again
+        self.assertLess(scandir.call_count, 7)
+
+    def test_unsaved_records_are_cut_off(self):
+        """
+        ✂️ Records Written After the Last Saved Frontier Are Discarded
+        """
+        self.scan(limit=4)
+        checkpoint = ScanCheckpoint(self.bookmark)
+        with open(checkpoint.records_path, 'ab') as records:
+            records.write(json.dumps({'path': 'ghost'}).encode() + b"\n")
+
+        resumed = self.scan(resume=True)
+
+        self.assertNotIn('ghost', resumed)
+        self.assertEqual(sorted(resumed), sorted(self.expected))
+
+    def test_finished_scan_leaves_nothing_to_resume(self):
+        """
+        🧹 A Walk That Explored Everything Tears Up Its Bookmark
+        """
+        self.assertEqual(sorted(self.scan()), sorted(self.expected))
+
+        checkpoint = ScanCheckpoint(self.bookmark)
+        self.assertIsNone(checkpoint.load(self.root))
+        self.assertFalse(checkpoint.records_path.exists())
+        self.assertEqual(sorted(self.scan(resume=True)), sorted(self.expected))
+
+    def test_fresh_scan_ignores_old_bookmark(self):
+        """
+        🧹 Without --resume-scan the Old Bookmark Is Started Over
+        """
+        self.scan(limit=4)
+        self.assertEqual(sorted(self.scan()), sorted(self.expected))
+
+    def test_bookmark_of_another_realm_is_refused(self):
+        """
+        🚫 A Bookmark Cannot Be Used for a Different Realm
+        """
+        self.scan(limit=4)
+        with self.assertRaises(ValueError):
+            ScanCheckpoint(self.bookmark).load(self.workspace)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+🔭 The Magical Trials of the Scan Estimator 🌌
+
+Here we test the far-seeing oracle that foretells the size of a realm without
+walking every path. On a perfectly symmetrical realm its prophecies must be
+exact; on any realm they must stay within reason.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from core.scan_estimator import ScanEstimator
+from reporting.report_generator import ReportGenerator
+
+
+class TestScanEstimator(unittest.TestCase):
+    """
+    🏰 The Observatory of Scan Estimator Tests
+    """
+
+    def setUp(self):
+        """
+        🧪 Conjuring a Symmetrical Realm
+
+        Three towers, each with two chambers, every room holding the same scrolls.
+        """
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        for tower in range(3):
+            for chamber in range(2):
+                directory = os.path.join(self.root, f"tower{tower}", f"chamber{chamber}")
+                os.makedirs(directory)
+                self._write(os.path.join(directory, "scroll.txt"), b"a" * 100)
+                self._write(os.path.join(directory, "portrait.jpg"), b"b" * 50)
+            self._write(os.path.join(self.root, f"tower{tower}", "map.txt"), b"c" * 100)
+
+    @staticmethod
+    def _write(path, content):
+        with open(path, 'wb') as handle:
+            handle.write(content)
+
+    def test_symmetrical_realm_is_estimated_exactly(self):
+        """
+        🎯 A Symmetrical Realm Holds No Secrets
+
+        Every probe sees the same shape, so the estimate has no spread at all.
+        """
+        estimate = ScanEstimator(self.root, seed=7).estimate(time_budget=0, min_probes=5)
+
+        self.assertEqual(estimate["probes"], 5)
+        self.assertAlmostEqual(estimate["files"]["estimate"], 15)
+        self.assertAlmostEqual(estimate["files"]["low"], 15)
+        self.assertAlmostEqual(estimate["bytes"]["estimate"], 6 * 150 + 3 * 100)
+        self.assertAlmostEqual(estimate["categories"]["documents"]["files"]["estimate"], 9)
+        self.assertAlmostEqual(estimate["categories"]["images"]["bytes"]["estimate"], 300)
+
+    def test_duplicates_are_found_in_sample(self):
+        """
+        👯 Identical Scrolls Are Recognized as Twins
+        """
+        estimate = ScanEstimator(self.root, files_per_directory=10, seed=1).estimate(time_budget=0, min_probes=20,
+                                                                                    min_fingerprints=200)
+
+        self.assertGreater(estimate["duplicates"]["fingerprinted_files"], 0)
+        self.assertGreater(estimate["duplicates"]["duplicate_files"], 0)
+
+    def test_unreadable_files_are_not_twins(self):
+        """
+        🚫 Files That Cannot Be Read Share a Word of Failure, Not a Fingerprint
+        """
+        estimator = ScanEstimator(self.root, seed=3)
+        sealed = [{'path': os.path.join(self.root, name), 'size': 42} for name in ("sealed1.bin", "sealed2.bin")]
+
+        with patch.object(estimator.scanner, '_generate_file_fingerprint', return_value="Permission denied"):
+            duplicates = estimator._estimate_duplicates(sealed)
+
+        self.assertEqual(duplicates["fingerprinted_files"], 2)
+        self.assertEqual(duplicates["duplicate_files"], 0)
+
+    def test_duplicate_hunt_keeps_to_the_budget(self):
+        """
+        ⏳ The Duplicate Hunt Reads Nothing Past the Deadline, and Never a Giant
+        """
+        estimator = ScanEstimator(self.root, seed=3, max_fingerprint_size=60)
+        sampled = [{'path': os.path.join(self.root, f"tower{tower}", "chamber0", name), 'size': size}
+                   for tower in range(3) for name, size in (("scroll.txt", 100), ("portrait.jpg", 50))]
+
+        late = estimator._estimate_duplicates(sampled, deadline=time.monotonic() - 1)
+        hurried = estimator._estimate_duplicates(sampled, deadline=time.monotonic() - 1, min_fingerprints=2)
+        unhurried = estimator._estimate_duplicates(sampled)
+
+        self.assertEqual((late["fingerprinted_files"], late["duplicate_files"]), (0, 0))
+        self.assertEqual((hurried["fingerprinted_files"], hurried["duplicate_files"]), (2, 1))
+        # The 100-byte scrolls are over the cap; only the three portraits are read
+        self.assertEqual((unhurried["fingerprinted_files"], unhurried["duplicate_files"]), (3, 2))
+
+    def test_confidence_interval_widens_with_spread(self):
+        """
+        📐 Disagreeing Probes Produce Wide Error Bars
+        """
+        interval = ScanEstimator._confidence_interval([10, 30, 10, 30])
+        self.assertAlmostEqual(interval["estimate"], 20)
+        self.assertLess(interval["low"], 20)
+        self.assertGreater(interval["high"], 20)
+
+    def test_estimate_report_is_written(self):
+        """
+        📜 The Prophecy Is Recorded for Posterity
+        """
+        estimate = ScanEstimator(self.root, seed=3).estimate(time_budget=0, min_probes=3)
+        report_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, report_directory)
+
+        report_path = ReportGenerator(report_directory).generate_estimate_report(estimate)
+
+        with open(report_path) as handle:
+            content = handle.read()
+        self.assertIn("Total Files,15,15,15", content)
+        self.assertIn("documents", content)
+
+
+if __name__ == '__main__':
+    unittest.main()
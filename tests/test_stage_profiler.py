@@ -0,0 +1,113 @@
+"""
+🔬 The Magical Trials of the Stage Profiler 🔥
+
+Here we keep the wizard deliberately busy inside a stage and check that the
+spyglass catches the very spell that was burning the time, in stacks a
+flamegraph can be drawn from.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from core.stage_profiler import StageProfiler
+from reporting.report_generator import ReportGenerator
+
+
+def brew_potion(seconds):
+    # 🧪 Stir without pause until the hourglass runs out
+    deadline = time.perf_counter() + seconds
+    stirs = 0
+    while time.perf_counter() < deadline:
+        stirs += sum(range(200))
+    return stirs
+
+
+def cast_spell(times):
+    total = 0
+    for _ in range(times):
+        total += sum(range(1000))
+    return total
+
+
+class TestStageProfiler(unittest.TestCase):
+    """
+    🏰 The Observatory of Stage Profiler Tests
+    """
+
+    def test_samples_find_the_busy_spell(self):
+        """
+        🎯 The Sampler Names the Function That Burned the Stage's Time, Within Its Full Stack
+        """
+        profiler = StageProfiler(mode="sample", interval=0.002)
+        with profiler.stage("brew"):
+            brew_potion(0.3)
+
+        stage = profiler.stages["brew"]
+        self.assertEqual(stage["unit"], "samples")
+        self.assertGreaterEqual(stage["seconds"], 0.3)
+        busiest = max(stage["stacks"], key=stage["stacks"].get)
+        self.assertIn("test_samples_find_the_busy_spell", busiest)
+        self.assertTrue(busiest.split(";")[-1].startswith("brew_potion (test_stage_profiler.py:"))
+        hottest = profiler.hot_functions("brew", 1)[0]
+        self.assertTrue(hottest["function"].startswith("brew_potion"))
+        self.assertIsNone(hottest["calls"])
+
+    def test_cprofile_counts_every_call(self):
+        """
+        📏 The Deterministic Mode Counts Calls Exactly, as Caller;Callee Stacks
+        """
+        profiler = StageProfiler(mode="cprofile")
+        with profiler.stage("cast"):
+            cast_spell(50)
+        with profiler.stage("cast"):
+            cast_spell(30)
+
+        functions = profiler.stages["cast"]["functions"]
+        self.assertEqual(functions["<built-in method builtins.sum>"]["calls"], 80)
+        stacks = profiler.stages["cast"]["stacks"]
+        self.assertTrue(any(stack.startswith("cast_spell (") and stack.endswith(";<built-in method builtins.sum>")
+                            for stack in stacks))
+        self.assertEqual(profiler.stages["cast"]["unit"], "microseconds")
+
+    def test_refuses_unknown_modes_and_nesting(self):
+        """
+        🚫 Unknown Modes, Idle Clocks and Stages Within Stages Are Refused
+        """
+        for options in ({'mode': 'astrology'}, {'interval': 0}):
+            with self.subTest(**options), self.assertRaises(ValueError):
+                StageProfiler(**options)
+        profiler = StageProfiler(mode="cprofile")
+        with profiler.stage("outer"):
+            with self.assertRaises(ValueError):
+                with profiler.stage("inner"):
+                    pass
+        # The stage that refused to nest left no trace, and the outer one was recorded
+        self.assertEqual(list(profiler.stages), ["outer"])
+
+    def test_profiles_are_written_as_folded_stacks(self):
+        """
+        📜 Every Stage Gets a Collapsed-Stack File, and the Hot Functions a Chronicle
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        profiler = StageProfiler(mode="sample", interval=0.002)
+        for stage in ("scan", "plan"):
+            with profiler.stage(stage):
+                brew_potion(0.05)
+
+        paths = ReportGenerator(directory).generate_profile_reports(profiler, top=5)
+
+        self.assertEqual([os.path.basename(str(path)).split("_")[1] for path in paths[:2]], ["scan", "plan"])
+        with open(paths[0], encoding='utf-8') as folded:
+            lines = [line.rstrip("\n").rsplit(" ", 1) for line in folded]
+        self.assertTrue(all(int(weight) > 0 for _, weight in lines))
+        self.assertTrue(any(stack.endswith(")") and "brew_potion" in stack for stack, _ in lines))
+        with open(paths[-1], encoding='utf-8') as chronicle:
+            self.assertIn("brew_potion", chronicle.read())
+
+
+if __name__ == '__main__':
+    unittest.main()